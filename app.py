@@ -1,14 +1,54 @@
 # app.py
-import streamlit as st, os, tempfile, pandas as pd
+import streamlit as st, os, pandas as pd
 import plotly.express as px
-from parser import parse_resume, extract_text_from_pdf, extract_text_from_docx
-from jd_parser import extract_keywords
-from matcher import aggregate_scores_for_jd, compute_dashboard_stats
-from exporter import results_to_dataframe
-# from db import init_db, insert_resume
+import numpy as np
+from parser import parse_resumes, extract_text_from_file
+from job_profile import JobProfile, CorpusIDF, DEFAULT_IDF_PATH
+from scoring import IncrementalScorer
+from candidate_store import CandidateStore
+from exporter import results_to_dataframe, export_bytes, iter_combined, EXPORT_FORMATS
+from cache import ParseCache, content_hash, skills_version
+from semantic import EmbeddingIndex
+from models import get_nlp, get_keybert, startup_report
+from recommender import recommend_jobs
+from dedup import Deduplicator, duplicate_groups
+from service_client import ServiceClient, ServiceError
+import instrumentation, json
+from db import init_db
 
 st.set_page_config(page_title="Automated Resume Scanner", layout="wide")
-# init_db()
+# With RESUME_SERVICE_URL set, parsing and scoring run in service.py and
+# this app only uploads files and renders results
+SERVICE_URL = os.environ.get("RESUME_SERVICE_URL")
+service = ServiceClient(SERVICE_URL) if SERVICE_URL else None
+
+# Opened on first save, so browsing without "Save to DB" never creates the file
+@st.cache_resource
+def get_resume_db():
+    return init_db()
+
+@st.cache_resource
+def get_parse_cache():
+    return ParseCache()
+
+parse_cache = get_parse_cache()
+
+@st.cache_resource
+def get_embedding_index():
+    return EmbeddingIndex()
+
+@st.cache_resource
+def load_corpus_idf(mtime):
+    return CorpusIDF.load()
+
+# Models load on first use and are shared by every session of this server
+@st.cache_resource(show_spinner="Loading spaCy model...")
+def get_shared_nlp():
+    return get_nlp()
+
+@st.cache_resource(show_spinner="Loading KeyBERT model...")
+def get_shared_keybert():
+    return get_keybert()
 
 st.title("Automated Resume Scanner — Major Project")
 st.caption("Candidate extraction, multi-JD matching, ATS scoring, ML skill extraction & dashboard stats.")
@@ -17,8 +57,20 @@ st.caption("Candidate extraction, multi-JD matching, ATS scoring, ML skill extra
 st.sidebar.header("Settings")
 use_keybert = st.sidebar.checkbox("Use KeyBERT (slower, more accurate)", value=False)
 top_n_keywords = st.sidebar.number_input("Top N JD keywords", min_value=5, max_value=50, value=12)
+use_corpus_idf = st.sidebar.checkbox("Weight keywords by corpus TF-IDF", value=False)
+use_semantic = st.sidebar.checkbox("Semantic match (local embeddings)", value=False)
 upload_multiple_jds = st.sidebar.checkbox("Upload multiple JDs", value=True)
-# save_to_db = st.sidebar.checkbox("Save parsed resumes to DB", value=False)
+collect_metrics = st.sidebar.checkbox("Collect performance metrics", value=False)
+# Metrics live in this run's context, so sessions never share or reset each other's
+if collect_metrics: instrumentation.enable(); instrumentation.reset()
+else: instrumentation.disable()
+if use_keybert: get_shared_keybert()
+parse_workers = st.sidebar.number_input("Parser workers", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1)
+collapse_duplicates = st.sidebar.checkbox("Collapse near-duplicate resumes", value=True, help="Re-sent, lightly edited copies are parsed and scored once and grouped in the candidate table.")
+skill_ner = st.sidebar.checkbox("Skill NER (slower, finds nothing the keyword scan misses)", value=False)
+parse_executor = st.sidebar.selectbox("Parser executor", ["process","thread"], help="Threads read uploads in place; processes use every core for spaCy.")
+save_to_db = st.sidebar.checkbox("Save parsed resumes to DB", value=False)
+export_format = st.sidebar.selectbox("Export format", EXPORT_FORMATS, help="Parquet needs pyarrow, Excel needs openpyxl.")
 
 # 1️⃣ Upload JDs
 st.header("Step 1: Upload Job Description(s)")
@@ -27,13 +79,11 @@ jd_text_manual = st.text_area("Or paste JD manually", height=150)
 job_descriptions = {}
 
 def _read_uploaded_file(file):
-    ext = os.path.splitext(file.name)[1].lower()
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
-    tmp.write(file.getbuffer()); tmp.flush(); tmp.close()
-    if ext==".pdf": txt=extract_text_from_pdf(tmp.name)
-    elif ext in [".docx",".doc"]: txt=extract_text_from_docx(tmp.name)
-    else: txt=open(tmp.name,"r",encoding="utf-8",errors="ignore").read()
-    os.unlink(tmp.name)
+    digest = content_hash(file.getbuffer())
+    cached = parse_cache.get_text(digest)
+    if cached is not None: return cached
+    txt = extract_text_from_file(file.getbuffer(), file.name)
+    parse_cache.put_text(digest, txt)
     return txt
 
 if jd_files:
@@ -61,55 +111,273 @@ if skills_csv:
 
 # 3️⃣ Parse Resumes
 st.header("Step 3: Parsing Resumes")
+if parse_workers<=1 and service is None: get_shared_nlp()
 parsed_profiles=[]
 progress = st.progress(0)
-for i,resume_file in enumerate(uploaded_resumes):
-    ext=os.path.splitext(resume_file.name)[1].lower()
-    tmp=tempfile.NamedTemporaryFile(delete=False,suffix=ext)
-    tmp.write(resume_file.getbuffer()); tmp.flush(); tmp.close()
-    try:
-        profile=parse_resume(tmp.name,skills_list=skills_list)
-        profile["orig_filename"]=resume_file.name
-        parsed_profiles.append(profile)
-        # if save_to_db: insert_resume(profile)
-    except Exception as e: st.error(f"Failed to parse {resume_file.name}: {e}")
-    finally: os.unlink(tmp.name)
-    progress.progress(int((i+1)/len(uploaded_resumes)*100))
-st.success(f"Parsed {len(parsed_profiles)} resumes.")
-
-# Show parsed table
 st.subheader("Candidate Profiles")
-df_parsed=pd.DataFrame([
-    {"File":p.get("orig_filename"),
+profile_table = st.empty()
+
+def _profile_row(p):
+    return {"File":p.get("orig_filename"),
      "Name":os.path.splitext(p.get("orig_filename", "Unknown"))[0],
      "Email":p.get("email"),
      "Phone":p.get("phone"),
      "Education":"; ".join(p.get("education") or []),
      "Experience (Years)":p.get("experience_years"),
-     "Skills":", ".join(p.get("skills") or [])} for p in parsed_profiles])
-st.dataframe(df_parsed,use_container_width=True)
+     "Skills":", ".join(p.get("skills") or []),
+     "Duplicate of":f"{p['duplicate_of']} ({p['similarity']:.0%})" if p.get("duplicate_of") else None}
+
+if service is not None:
+    # Thin client: the service parses (its cache, its models, its pool)
+    # and streams each profile back as it finishes
+    upload_key=tuple(content_hash(f.getbuffer()) for f in uploaded_resumes)+(skills_version(skills_list),collapse_duplicates)
+    if st.session_state.get("service_pool_key")!=upload_key:
+        try:
+            st.session_state["service_pool"]=service.submit_parse([(f.name,f.getbuffer()) for f in uploaded_resumes],skills_list,collapse_duplicates)
+        except ServiceError as e:
+            st.error(f"Scoring service unavailable: {e}"); st.stop()
+        st.session_state["service_pool_key"]=upload_key
+    rows=[]
+    try:
+        for event in service.stream(st.session_state["service_pool"]):
+            if event["type"]=="profile":
+                rows.append(_profile_row(event["profile"]))
+                profile_table.dataframe(pd.DataFrame(rows),use_container_width=True)
+                progress.progress(int(len(rows)/len(uploaded_resumes)*100))
+            elif event["type"]=="error": st.error(f"Failed to parse {event['filename']}: {event['error']}")
+        pool_job=service.job(st.session_state["service_pool"])
+        if pool_job["status"]!="done":
+            # failed jobs carry an error and no result; the next run submits again
+            st.session_state.pop("service_pool_key",None)
+            st.error(f"Scoring service could not parse this upload batch: {pool_job.get('error') or pool_job['status']}"); st.stop()
+        parsed_profiles=pool_job["result"]["profiles"]
+    except ServiceError as e:
+        # the service restarted or dropped this pool: parse again
+        st.session_state.pop("service_pool_key",None)
+        st.warning(f"Scoring service lost this upload batch ({e}); resubmitting.")
+        st.experimental_rerun()
+else:
+    # Keyed by upload index and name, so two uploads called "resume.pdf" stay apart
+    to_parse={}
+    by_index={}
+    keys=[f"{i}/{f.name}" for i,f in enumerate(uploaded_resumes)]
+    names={key:f.name for key,f in zip(keys,uploaded_resumes)}
+    digests=[]
+    for i,resume_file in enumerate(uploaded_resumes):
+        digest=content_hash(resume_file.getbuffer())
+        digests.append(digest)
+        cached=parse_cache.get_profile(digest,skills_list)
+        if cached is not None and not cached.get("duplicate_of"):
+            cached["orig_filename"]=resume_file.name
+            cached["content_hash"]=digest
+            by_index[i]=cached
+            continue
+        # Parse straight from the upload buffer: zero-copy for threads,
+        # one pickled copy for worker processes, no temp files either way
+        data=resume_file.getbuffer() if parse_executor=="thread" else resume_file.getvalue()
+        to_parse[keys[i]]=(data,digest,i,resume_file.name)
+
+    # One grouping rule: cache hits first, then new uploads, each in upload
+    # order (parse_resumes matches in item order). A copy gets its
+    # original's fields, so it is never cached. The Deduplicator lives in
+    # the session, so reruns only re-check the uploads that are not cached.
+    dedup=None
+    if collapse_duplicates:
+        dup_key=tuple(digests)+(skills_version(skills_list),)
+        if st.session_state.get("dup_key")!=dup_key:
+            dedup=Deduplicator()
+            found=dedup.check_profiles((keys[i],by_index[i]) for i in sorted(by_index))
+            st.session_state["dup_marks"]={i:found[keys[i]] for i in sorted(by_index) if keys[i] in found}
+            st.session_state["dedup"]=dedup
+            st.session_state["dup_key"]=dup_key
+        dedup=st.session_state["dedup"]
+        for i,(orig_key,sim) in st.session_state["dup_marks"].items():
+            if i in by_index: by_index[i].update(duplicate_of=names[orig_key],similarity=round(sim,3))
+        # dropped from the parse cache since: parse it again as a new upload
+        for key in to_parse: dedup.discard(key)
+
+    rows=[_profile_row(p) for p in by_index.values()]
+    if rows: profile_table.dataframe(pd.DataFrame(rows),use_container_width=True)
+    # A list, so batches are sized to keep every worker busy
+    items=[(key,data) for key,(data,*_) in to_parse.items()]
+    for n,(key,profile,error) in enumerate(parse_resumes(items,skills_list=skills_list,workers=parse_workers,executor=parse_executor,skill_ner=skill_ner,dedup=dedup)):
+        _,digest,i,name=to_parse[key]
+        if error: st.error(f"Failed to parse {name}: {error}")
+        else:
+            profile["file_path"]=name
+            if profile.get("duplicate_of"): profile["duplicate_of"]=names[profile["duplicate_of"]]
+            else: parse_cache.put_profile(digest,profile,skills_list)
+            profile["orig_filename"]=name
+            profile["content_hash"]=digest
+            by_index[i]=profile
+            # Show each candidate as soon as its worker finishes
+            rows.append(_profile_row(profile))
+            profile_table.dataframe(pd.DataFrame(rows),use_container_width=True)
+        progress.progress(int((n+1)/len(to_parse)*100))
+    # Keep upload order regardless of cache hits or which worker finished first
+    parsed_profiles=[by_index[i] for i in sorted(by_index)]
+progress.progress(100)
+
+# One batched transaction per 500 profiles; known files are updated in place
+saved_key=tuple(p["content_hash"] for p in parsed_profiles)
+if save_to_db and st.session_state.get("db_saved_key")!=saved_key:
+    get_resume_db().insert_resumes(parsed_profiles)
+    st.session_state["db_saved_key"]=saved_key
+cache_stats=parse_cache.stats()
+st.sidebar.caption(f"Parse cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['entries']} entries)")
+# Copies are shown under their original and left out of scoring
+scored_profiles=[p for p in parsed_profiles if not p.get("duplicate_of")]
+n_duplicates=len(parsed_profiles)-len(scored_profiles)
+st.success(f"Parsed {len(parsed_profiles)} resumes"+(f" ({n_duplicates} near-duplicates collapsed)." if n_duplicates else "."))
+profile_table.dataframe(pd.DataFrame([_profile_row(p) for g in duplicate_groups(parsed_profiles) for p in g]),use_container_width=True)
+
+# Keep per-resume keyword hits across reruns: a keyword edit only scans
+# resumes for the added terms and drops the removed ones. The session
+# holds a columnar store (raw text compressed on disk), not the profiles.
+pool_key=tuple(p["content_hash"] for p in scored_profiles)+(skills_version(skills_list),)
+store=None
+if service is None:
+    if st.session_state.get("scorer_key")!=pool_key:
+        if "candidate_store" in st.session_state: st.session_state["candidate_store"].close()
+        store=CandidateStore.from_profiles(scored_profiles)
+        st.session_state["candidate_store"]=store
+        st.session_state["scorer"]=IncrementalScorer(store,texts=store.iter_texts)
+        st.session_state["scorer_key"]=pool_key
+    store=st.session_state["candidate_store"]
+    # From here on resume text is read back from the store only
+    for p in parsed_profiles: p.pop("raw_text",None)
 
 # 4️⃣ Matching & Dashboard
 st.header("Step 4: Matching & ATS Scoring")
 jd_tabs=st.tabs(list(job_descriptions.keys()))
 all_results={}
+jd_keyword_lists=[]
+jd_profiles=[]
+
+# IDF is fitted once over a corpus and reused; refit on demand
+corpus_idf=None
+if service is not None and (use_corpus_idf or use_semantic):
+    # the service keeps raw resume text to itself
+    st.sidebar.caption("Corpus IDF and semantic match run only without RESUME_SERVICE_URL.")
+    use_corpus_idf=use_semantic=False
+if use_corpus_idf:
+    if st.sidebar.button("Refit corpus IDF on current uploads") or not os.path.exists(DEFAULT_IDF_PATH):
+        CorpusIDF.fit(list(job_descriptions.values())+list(store.iter_texts())).save()
+    corpus_idf=load_corpus_idf(os.path.getmtime(DEFAULT_IDF_PATH))
 
+# First pass: collect each JD's (possibly edited) keywords
 for idx,(jd_title,jd_text) in enumerate(job_descriptions.items()):
     with jd_tabs[idx]:
         st.subheader(f"JD: {jd_title}")
         st.write(jd_text[:1000]+"..." if len(jd_text)>1000 else jd_text)
         with st.spinner("Extracting JD keywords..."):
-            jd_keywords=extract_keywords(jd_text,method="keybert" if use_keybert else "tfidf",top_n=top_n_keywords)
+            if service is not None:
+                kws,weights=service.keywords(jd_text,"keybert" if use_keybert else "tfidf",top_n_keywords)
+                jd_profile=JobProfile(jd_text,kws,weights)
+            else:
+                jd_profile=JobProfile.from_text(jd_text,method="keybert" if use_keybert else "tfidf",top_n=top_n_keywords,idf=corpus_idf,cache=parse_cache)
+        jd_keywords=jd_profile.keywords
         st.write("Extracted Keywords:",jd_keywords)
         edited_keywords=st.text_area("Edit Keywords (comma-separated)",value=", ".join(jd_keywords),key=f"kw_{idx}")
-        final_keywords=[k.strip() for k in edited_keywords.split(",") if k.strip()]
-        results=aggregate_scores_for_jd(parsed_profiles,final_keywords)
+        jd_profile=jd_profile.with_keywords([k.strip() for k in edited_keywords.split(",") if k.strip()])
+        jd_profiles.append(jd_profile)
+        jd_keyword_lists.append(jd_profile.keywords)
+
+service_result=None
+if service is not None:
+    # The service keeps its own incremental scorer per pool; reruns with
+    # unchanged keywords reuse the last answer
+    score_key=(st.session_state["service_pool"],tuple(map(tuple,jd_keyword_lists)))
+    if st.session_state.get("service_score_key")!=score_key:
+        jds={t:{"text":text,"keywords":kws} for (t,text),kws in zip(job_descriptions.items(),jd_keyword_lists)}
+        try:
+            with st.spinner("Scoring candidates..."):
+                job_id=service.submit_score(st.session_state["service_pool"],jds)
+                st.session_state["service_result"]=service.wait(job_id)["result"]
+            st.session_state["service_score_key"]=score_key
+        except ServiceError as e:
+            st.error(f"Scoring service failed: {e}")
+            st.session_state.pop("service_pool_key",None)
+            st.stop()
+    service_result=st.session_state["service_result"]
+else:
+    scorer=st.session_state["scorer"]
+    with st.spinner("Scoring candidates..."):
+        scorer.sync(jd_keyword_lists)
+
+# Embed each resume once; later JDs only cost one matrix-vector product
+embedding_index=None
+if use_semantic:
+    try:
+        embedding_index=get_embedding_index()
+        new_items=[(p["content_hash"],store.text(i),p.get("sections"))
+                   for i,p in enumerate(scored_profiles) if p["content_hash"] not in embedding_index]
+        if new_items:
+            with st.spinner(f"Embedding {len(new_items)} new resumes..."):
+                embedding_index.add_many(new_items)
+    except Exception as e:
+        st.warning(f"Semantic matching unavailable: {e}")
+        embedding_index=None
+
+def result_signature(results):
+    return tuple((r.get("content_hash"),r["score"]) for r in results)
+
+def lazy_download(label,file_stem,rows_fn,signature,key):
+    """
+    Builds the export only after "Prepare" is clicked and keeps it in the
+    session until the results change, so reruns never serialize tables
+    nobody downloads.
+    """
+    signature=(export_format,signature)
+    prepared=st.session_state.get(key)
+    if prepared is not None and prepared[0]!=signature: prepared=None
+    if prepared is None and st.button(f"Prepare {label} ({export_format})",key=f"{key}_prepare"):
+        try:
+            with st.spinner("Writing export..."):
+                prepared=(signature,export_bytes(rows_fn(),export_format))
+            st.session_state[key]=prepared
+        except RuntimeError as e:
+            st.error(str(e))
+    if prepared is not None:
+        st.download_button(f"Download {label}",data=prepared[1],file_name=f"{file_stem}.{export_format}",key=f"{key}_download")
+
+# Second pass: render each JD's results
+for idx,(jd_title,jd_text) in enumerate(job_descriptions.items()):
+    with jd_tabs[idx]:
+        if service_result is not None:
+            results=service_result["results"][jd_title]
+        else:
+            results=scorer.results(jd_keyword_lists[idx],jd_profiles[idx].weights if use_corpus_idf else None)
+        if embedding_index is not None:
+            semantic_scores=embedding_index.scores(jd_text)
+            for r in results:
+                r["semantic_score"]=semantic_scores.get(r["content_hash"],0.0)
+        # One matrix product for the whole table
+        for r,recs in zip(results,recommend_jobs([r.get("skills") or [] for r in results],k=1)):
+            r["recommended_role"]=f"{recs[0][0]} ({recs[0][1]}%)" if recs else None
         all_results[jd_title]=results
+        if save_to_db:
+            resume_db=get_resume_db()
+            # Write once per JD/keywords, scoring options and pool, not on every widget rerun
+            scores_key=(jd_profiles[idx].content_hash,tuple(jd_profiles[idx].keywords),use_corpus_idf,embedding_index is not None,pool_key)
+            saved_scores=st.session_state.get(f"db_scores_{idx}")
+            if saved_scores is None or saved_scores[0]!=scores_key:
+                jd_id=resume_db.save_job_profile(jd_title,jd_profiles[idx])
+                resume_db.save_scores(jd_id,results)
+                st.session_state[f"db_scores_{idx}"]=(scores_key,jd_id)
+            jd_id=st.session_state[f"db_scores_{idx}"][1]
+            with st.expander("Saved candidates (database)"):
+                min_exp=st.number_input("Minimum experience (years)",min_value=0,max_value=50,value=0,key=f"db_min_exp_{idx}")
+                saved=resume_db.top_candidates(jd_id,n=50,min_experience=min_exp)
+                st.dataframe(results_to_dataframe(saved),use_container_width=True)
 
         # Dashboard Stats & Charts
         st.markdown("---")
         st.subheader("Dashboard Analytics")
-        stats = compute_dashboard_stats(results)
+        if service_result is not None:
+            stats = service_result["stats"][jd_title]
+        else:
+            stats = scorer.dashboard_stats(np.array([r["score"] for r in results]))
         
         # Display key metrics in columns
         col1, col2 = st.columns(2)
@@ -143,8 +411,23 @@ for idx,(jd_title,jd_text) in enumerate(job_descriptions.items()):
         
         st.markdown("---")
         st.subheader("Ranked Candidates")
-        res_df=results_to_dataframe(results)
-        st.dataframe(res_df,use_container_width=True)
-        st.download_button(f"Download {jd_title} results",data=res_df.to_csv(index=False).encode("utf-8"),file_name=f"{jd_title}_results.csv")
+        st.dataframe(results_to_dataframe(results),use_container_width=True)
+        lazy_download(f"{jd_title} results",f"{jd_title}_results",lambda: results,result_signature(results),key=f"export_{idx}")
+
+st.markdown("---")
+st.subheader("Export all JDs")
+lazy_download("all results","all_results",lambda: iter_combined(all_results),
+              tuple((t,result_signature(r)) for t,r in all_results.items()),key="export_all")
+
+if collect_metrics:
+    with st.expander("Performance"):
+        perf=instrumentation.report()
+        st.dataframe(pd.DataFrame.from_dict(perf["stages"],orient="index"),use_container_width=True)
+        st.write("Counters:",perf["counters"])
+        if perf["files"]: st.dataframe(pd.DataFrame(perf["files"]),use_container_width=True)
+        st.download_button("Download performance report",data=json.dumps(perf,indent=2).encode("utf-8"),file_name="performance_report.json")
+
+with st.sidebar.expander("Startup time"):
+    st.json(startup_report())
 
-st.success("Analysis complete. Review results or download CSVs.")
\ No newline at end of file
+st.success("Analysis complete. Review results or download exports.")
\ No newline at end of file
@@ -1,12 +1,14 @@
 # ats_score.py
+from term_matcher import compile_terms
+
 def calculate_ats_score(resume_text, jd_keywords):
     """
     ATS Score = (Matched Keywords / Total JD Keywords) * 100
     """
-    resume_text_lower = resume_text.lower()
-    matched = [kw for kw in jd_keywords if kw.lower() in resume_text_lower]
     if not jd_keywords:
         return 0
+    found = compile_terms(tuple(jd_keywords)).find(resume_text)
+    matched = [kw for kw in jd_keywords if kw in found]
     return round((len(matched) / len(jd_keywords)) * 100, 2)
 
 if __name__ == "__main__":
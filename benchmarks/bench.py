@@ -0,0 +1,258 @@
+# benchmarks/bench.py
+"""
+Throughput benchmark for the resume pipeline.
+
+    python benchmarks/bench.py --sizes 10 100 1000 --formats txt docx pdf \
+        --min-words 400 --max-words 1200 --skill-density 0.15 \
+        --save benchmarks/baselines/my-branch.json \
+        --compare benchmarks/baselines/main.json
+
+Each stage reports p50/p95 latency per item, items/s and peak RSS. The
+score_matrix stage (--matrix, 10k resumes x 200 JDs by default) reports
+its total time and fails the run when it exceeds --matrix-target.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synth_corpus import generate_corpus, jd_text, load_vocab, resume_text, skill_taxonomy  # noqa: E402
+from parser import extract_text_from_file, extract_name, extract_skills  # noqa: E402
+from field_extractor import EDU_KEYWORDS, extract_fields  # noqa: E402
+from jd_parser import extract_keywords  # noqa: E402
+from matcher import aggregate_scores_for_jd  # noqa: E402
+from exporter import results_to_dataframe  # noqa: E402
+from scoring import score_matrix  # noqa: E402
+import term_matcher  # noqa: E402
+from term_matcher import compile_terms  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def legacy_fields(text: str):
+    """The four per-field passes parser.py made before field_extractor."""
+    email = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
+    phone = re.search(r"(\+?\d{1,3}[-.\s]?)?\d{10}", text)
+    education = [line.strip() for line in text.split("\n") if any(k in line.lower() for k in EDU_KEYWORDS)]
+    years = max(map(int, re.findall(r"(\d{1,2})\+?\s*year", text.lower())), default=0)
+    return email, phone, education, years
+
+
+def legacy_skills(text: str, skills):
+    """extract_skills before term_matcher: one substring test per skill."""
+    text_lower = text.lower()
+    return {skill for skill in skills if skill.lower() in text_lower}
+
+
+def automaton_skills(text: str, skills):
+    """TermMatcher's Aho-Corasick pass, which find() used above FEW_TERMS."""
+    matcher = compile_terms(tuple(skills))
+    return {t for _, _, key in matcher.iter_matches(text) for t in matcher.originals[key]}
+
+
+def time_stage(fn, items):
+    """Runs fn over items, returns (outputs, stats)."""
+    latencies, outputs = [], []
+    start = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        outputs.append(fn(item))
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    lat = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return outputs, {
+        "items": len(latencies),
+        "total_s": round(total, 4),
+        "p50_ms": round(float(np.percentile(lat, 50)), 3),
+        "p95_ms": round(float(np.percentile(lat, 95)), 3),
+        "throughput_per_s": round(len(latencies) / total, 2) if total else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_size(n: int, formats, n_jds: int, skills, profiles, corpus_dir: str, seed: int,
+             long_factor: int = 10, corpus_args: dict = None, taxonomy: int = 5000):
+    """
+    corpus_args: generate_corpus length/density knobs (min_words, max_words, skill_density).
+    taxonomy: size of the skill list for the *_taxonomy stages (skills.txt in real use).
+    """
+    rng = random.Random(seed)
+    paths = generate_corpus(corpus_dir, n, formats, seed=seed, **(corpus_args or {}))
+    jds = [jd_text(rng, profiles) for _ in range(n_jds)]
+    stages = {}
+
+    texts, stages["text_extraction"] = time_stage(extract_text_from_file, paths)
+    _, stages["extract_name"] = time_stage(extract_name, texts)
+    # uncached call: the lru_cache would turn every repeat into a lookup
+    _, stages["regex_fields"] = time_stage(extract_fields.__wrapped__, texts)
+    _, stages["regex_fields_legacy"] = time_stage(legacy_fields, texts)
+    long_texts = ["\n".join([t] * long_factor) for t in texts[:50]]
+    _, stages["regex_fields_long"] = time_stage(extract_fields.__wrapped__, long_texts)
+    _, stages["regex_fields_long_legacy"] = time_stage(legacy_fields, long_texts)
+    skill_lists, stages["extract_skills"] = time_stage(lambda t: extract_skills(t, skills), texts)
+    big_skills = skill_taxonomy(taxonomy, seed)
+    compile_terms(tuple(big_skills))
+    _, stages["extract_skills_taxonomy"] = time_stage(lambda t: extract_skills(t, big_skills), texts)
+    _, stages["extract_skills_taxonomy_automaton"] = time_stage(lambda t: automaton_skills(t, big_skills), texts)
+    _, stages["extract_skills_taxonomy_legacy"] = time_stage(lambda t: legacy_skills(t, big_skills), texts)
+    keyword_lists, stages["extract_keywords"] = time_stage(extract_keywords, jds)
+
+    resumes = [
+        {"orig_filename": os.path.basename(p), "raw_text": t, "skills": s, "experience_years": 0}
+        for p, t, s in zip(paths, texts, skill_lists)
+    ]
+    results, stages["aggregate_scores_for_jd"] = time_stage(
+        lambda kws: aggregate_scores_for_jd(resumes, kws), keyword_lists
+    )
+    _, stages["export"] = time_stage(
+        lambda res: results_to_dataframe(res).to_csv(index=False), results
+    )
+    return stages
+
+
+def run_matrix(n: int, n_jds: int, seed: int, taxonomy: int = 5000, keywords: int = 25,
+               corpus_args: dict = None):
+    """
+    score_matrix over n in-memory resumes x n_jds JDs, each JD naming
+    `keywords` terms from the taxonomy (200 JDs -> ~2.5k distinct terms).
+    Also times the same term matrix through the Aho-Corasick automaton.
+    """
+    args = {"min_words": 250, "max_words": 700, "skill_density": 0.08, **(corpus_args or {})}
+    rng = random.Random(seed)
+    big_skills = skill_taxonomy(taxonomy, seed)
+    texts = [resume_text(rng, big_skills, rng.randint(args["min_words"], args["max_words"]), args["skill_density"])
+             for _ in range(n)]
+    jd_lists = [rng.sample(big_skills, keywords) for _ in range(n_jds)]
+    stages = {}
+    _, stages["score_matrix"] = time_stage(lambda kws: score_matrix(texts, kws), [jd_lists])
+    few = term_matcher.FEW_BOUNDED_TERMS
+    term_matcher.FEW_BOUNDED_TERMS = float("inf")
+    try:
+        compile_terms.cache_clear()
+        _, stages["score_matrix_automaton"] = time_stage(lambda kws: score_matrix(texts, kws), [jd_lists])
+    finally:
+        term_matcher.FEW_BOUNDED_TERMS = few
+        compile_terms.cache_clear()
+    return stages
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Prints per-stage p50 ratios; returns the list of regressions."""
+    regressions = []
+    for size, stages in current["results"].items():
+        base_stages = baseline["results"].get(size, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if not base or not base["p50_ms"]:
+                continue
+            ratio = stats["p50_ms"] / base["p50_ms"]
+            flag = "REGRESSION" if ratio > 1 + threshold else ""
+            print(f"{size:>6} {stage:<34} p50 {base['p50_ms']:>9.3f} -> {stats['p50_ms']:>9.3f} ms  x{ratio:.2f} {flag}")
+            if flag:
+                regressions.append((size, stage, ratio))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the resume pipeline")
+    ap.add_argument("--sizes", nargs="+", type=int, default=[10, 100])
+    ap.add_argument("--formats", nargs="+", default=["txt"], choices=["txt", "docx", "pdf"])
+    ap.add_argument("--jds", type=int, default=5, help="synthetic JDs per size")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--min-words", type=int, default=250, help="shortest synthetic resume, in words")
+    ap.add_argument("--max-words", type=int, default=700, help="longest synthetic resume, in words")
+    ap.add_argument("--skill-density", type=float, default=0.08, help="fraction of resume words that are skills")
+    ap.add_argument("--long-factor", type=int, default=10,
+                    help="long-resume regex stages repeat each text this many times")
+    ap.add_argument("--taxonomy", type=int, default=5000, help="skill list size for the taxonomy stages")
+    ap.add_argument("--matrix", nargs=2, type=int, metavar=("RESUMES", "JDS"), default=[10000, 200],
+                    help="score_matrix stage size; 0 0 skips it")
+    ap.add_argument("--matrix-target", type=float, default=5.0,
+                    help="seconds score_matrix may take at --matrix size before the run fails")
+    ap.add_argument("--corpus-dir", help="keep generated files here instead of a temp dir")
+    ap.add_argument("--save", help="write results JSON (baseline) to this path")
+    ap.add_argument("--compare", help="baseline JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before flagging")
+    args = ap.parse_args()
+
+    skills, profiles = load_vocab()
+    corpus_args = {"min_words": args.min_words, "max_words": args.max_words, "skill_density": args.skill_density}
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "formats": args.formats,
+            "corpus": corpus_args,
+            "created_at": datetime.now().isoformat(),
+        },
+        "results": {},
+    }
+
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus_dir = os.path.join(args.corpus_dir, str(n)) if args.corpus_dir else tmp
+            stages = run_size(n, tuple(args.formats), args.jds, skills, profiles, corpus_dir, args.seed,
+                              args.long_factor, corpus_args, args.taxonomy)
+        report["results"][str(n)] = stages
+        for stage, stats in stages.items():
+            print(f"{n:>6} {stage:<34} p50 {stats['p50_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms  "
+                  f"{stats['throughput_per_s']}/s  rss {stats['peak_rss_mb']} MB")
+
+    over_target = False
+    n_resumes, n_jds = args.matrix
+    if n_resumes and n_jds:
+        size = f"{n_resumes}x{n_jds}"
+        stages = run_matrix(n_resumes, n_jds, args.seed, args.taxonomy, corpus_args=corpus_args)
+        report["results"][size] = stages
+        for stage, stats in stages.items():
+            print(f"{size:>6} {stage:<34} {stats['total_s']:>9.3f} s  rss {stats['peak_rss_mb']} MB")
+        over_target = stages["score_matrix"]["total_s"] > args.matrix_target
+        if over_target:
+            print(f"score_matrix at {size} took over the {args.matrix_target} s target")
+
+    if args.save:
+        if os.path.dirname(args.save):
+            os.makedirs(os.path.dirname(args.save), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+    if over_target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
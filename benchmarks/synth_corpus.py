@@ -0,0 +1,138 @@
+# benchmarks/synth_corpus.py
+"""
+Synthetic resume corpus generator.
+
+    python benchmarks/synth_corpus.py out/ --n 100 --formats txt docx pdf
+"""
+import argparse
+import json
+import os
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Jane", "Wei", "Maria", "Omar", "Sara", "Liam", "Ananya"]
+LAST_NAMES = ["Sharma", "Smith", "Doe", "Chen", "Garcia", "Khan", "Nguyen", "Patel", "Brown", "Iyer"]
+DEGREES = ["Bachelor of Technology in Computer Science", "Master of Science in Data Science",
+           "B.Tech in Information Technology", "MBA in Operations", "Diploma in Web Design", "PhD in Physics"]
+FILLER = ("designed built maintained improved delivered collaborated with cross functional teams "
+          "on scalable reliable systems for customers and stakeholders reduced latency increased "
+          "revenue automated reporting mentored engineers owned roadmap shipped features").split()
+
+
+def load_vocab(root: str = ROOT):
+    """Skills from skills.txt plus every skill named in job_profiles.json."""
+    with open(os.path.join(root, "skills.txt"), "r", encoding="utf-8") as f:
+        skills = [line.strip() for line in f if line.strip()]
+    with open(os.path.join(root, "job_profiles.json"), "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    for required in profiles.values():
+        skills.extend(required)
+    return sorted(set(s.lower() for s in skills)), profiles
+
+
+def skill_taxonomy(n: int, seed: int = 0):
+    """The real vocab padded to n terms with made-up words, phrases and "x.js"/"x++"/"x#" names."""
+    rng = random.Random(seed)
+    terms, _ = load_vocab()
+    terms = list(terms)
+    seen = set(terms)
+    syllables = ["ka", "lo", "tri", "zen", "mar", "qu", "dex", "vo", "ster", "py", "on", "ix", "ra", "bel"]
+    while len(terms) < n:
+        word = "".join(rng.choices(syllables, k=rng.randint(2, 4)))
+        term = rng.choice([word, word, f"{word} {rng.choice(FILLER)}", f"{word}.js", f"{word}++", f"{word}#"])
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+def resume_text(rng: random.Random, skills, words: int, skill_density: float) -> str:
+    """One resume of roughly `words` words, skill_density of which are skills."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    header = [
+        name,
+        f"{handle}{rng.randint(1, 999)}@example.com | +91 {rng.randint(10**9, 10**10 - 1)}",
+        f"{rng.randint(0, 15)}+ years of experience",
+        "Education",
+        rng.choice(DEGREES),
+        "Experience",
+    ]
+    body = []
+    for _ in range(words):
+        body.append(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER))
+    lines = [" ".join(body[i:i + 14]) for i in range(0, len(body), 14)]
+    return "\n".join(header + lines)
+
+
+def jd_text(rng: random.Random, profiles, words: int = 200) -> str:
+    title, required = rng.choice(list(profiles.items()))
+    body = [rng.choice(required) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(words)]
+    return f"{title}\nWe are hiring a {title}. " + " ".join(body)
+
+
+def _write_docx(path: str, text: str):
+    import docx
+    doc = docx.Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def _write_pdf(path: str, text: str):
+    import fitz
+    doc = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, len(lines), 45):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(lines[start:start + 45]), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def write_resume(path: str, text: str):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".txt":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    elif ext == ".docx":
+        _write_docx(path, text)
+    elif ext == ".pdf":
+        _write_pdf(path, text)
+    else:
+        raise ValueError(f"Unsupported file format: {ext}")
+
+
+def generate_corpus(out_dir: str, n: int, formats=("txt",), min_words: int = 250,
+                    max_words: int = 700, skill_density: float = 0.08, seed: int = 0):
+    """Writes n resumes into out_dir, cycling through formats. Returns paths."""
+    rng = random.Random(seed)
+    skills, _ = load_vocab()
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(n):
+        ext = formats[i % len(formats)]
+        path = os.path.join(out_dir, f"resume_{i:05d}.{ext}")
+        write_resume(path, resume_text(rng, skills, rng.randint(min_words, max_words), skill_density))
+        paths.append(path)
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate synthetic resumes")
+    ap.add_argument("out_dir")
+    ap.add_argument("--n", type=int, default=100)
+    ap.add_argument("--formats", nargs="+", default=["txt"], choices=["txt", "docx", "pdf"])
+    ap.add_argument("--min-words", type=int, default=250)
+    ap.add_argument("--max-words", type=int, default=700)
+    ap.add_argument("--skill-density", type=float, default=0.08)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    paths = generate_corpus(args.out_dir, args.n, tuple(args.formats), args.min_words,
+                            args.max_words, args.skill_density, args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Bump whenever parser.py / jd_parser.py change what they produce,
+# so stale entries are never served.
+PARSER_VERSION = "3"
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "parse_cache.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def content_hash(data) -> str:
+    return hashlib.sha256(bytes(data)).hexdigest()
+
+
+def skills_version(skills_list=None) -> str:
+    """Stable fingerprint of the skills list a profile was parsed with."""
+    if not skills_list:
+        return "default"
+    joined = "\n".join(sorted(s.lower() for s in skills_list))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    Persistent content-addressed cache for parsed resumes and extracted text.
+
+    - Keys are sha256(file bytes) + PARSER_VERSION (+ skills list version
+      for profiles), so renamed/re-uploaded files still hit.
+    - Entries live in a single SQLite file and are evicted least-recently
+      used once the stored payload exceeds max_bytes.
+    - hits / misses count lookups since this object was created.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)"
+        )
+        self._conn.commit()
+
+    # ---------- keys ----------
+    @staticmethod
+    def profile_key(digest: str, skills_list=None) -> str:
+        return f"profile:{PARSER_VERSION}:{skills_version(skills_list)}:{digest}"
+
+    @staticmethod
+    def text_key(digest: str) -> str:
+        return f"text:{PARSER_VERSION}:{digest}"
+
+    # ---------- low level ----------
+    def _get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def _put(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    # ---------- public API ----------
+    def get_profile(self, digest: str, skills_list=None):
+        value = self._get(self.profile_key(digest, skills_list))
+        return json.loads(value) if value is not None else None
+
+    def put_profile(self, digest: str, profile: dict, skills_list=None):
+        # duplicate marks belong to one upload batch, not to the file
+        profile = {k: v for k, v in profile.items() if k not in ("duplicate_of", "similarity")}
+        self._put(self.profile_key(digest, skills_list), json.dumps(profile))
+
+    def get_text(self, digest: str):
+        return self._get(self.text_key(digest))
+
+    def put_text(self, digest: str, text: str):
+        self._put(self.text_key(digest), text)
+
+    def get_json(self, key: str):
+        """Generic JSON entry; key should include anything that versions it."""
+        value = self._get(f"json:{PARSER_VERSION}:{key}")
+        return json.loads(value) if value is not None else None
+
+    def put_json(self, key: str, value):
+        self._put(f"json:{PARSER_VERSION}:{key}", json.dumps(value))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
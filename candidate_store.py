@@ -0,0 +1,243 @@
+# candidate_store.py
+"""
+Columnar store for a large candidate pool.
+
+    store = CandidateStore.from_profiles(profiles)          # temp dir
+    store = CandidateStore.from_profiles(profiles, "pool/")
+    store.save(); store = CandidateStore.load("pool/")
+    scorer = IncrementalScorer(store, texts=store.iter_texts)
+
+A profile dict costs a full raw_text, a list of education strings, an
+ISO timestamp and a list of skill strings. Here skills are interned int
+ids in CSR arrays, numbers sit in fixed-width arrays, and raw text is
+zlib-compressed in texts.bin and only read back on demand.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+import zlib
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+TEXTS_FILE = "texts.bin"
+META_FILE = "store.json"
+ARRAYS_FILE = "columns.npz"
+STRING_COLUMNS = ("name", "email", "phone", "file_path", "orig_filename", "content_hash")
+
+
+class CandidateView(Mapping):
+    """
+    Read-only profile-shaped view of one row. Behaves like the parse_resume
+    dict (get, [], keys) but holds only (store, row); raw_text is read
+    from disk when asked for.
+    """
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "CandidateStore", row: int):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        return self.store.field(self.row, key)
+
+    def __iter__(self):
+        return iter(self.store.fields)
+
+    def __len__(self):
+        return len(self.store.fields)
+
+    def __repr__(self):
+        return f"CandidateView({self.row}, {self.get('orig_filename')!r})"
+
+
+class CandidateStore:
+    """
+    - Skills: vocabulary of unique names -> ids; each row's ids live in
+      one flat array('I') sliced by array('Q') offsets.
+    - experience_years: array('h'); parsed_at: epoch seconds array('q');
+      education lines are joined into one string per row.
+    - Raw text: one zlib block per row appended to texts.bin, located by
+      offsets; text(i) and iter_texts() decompress one row at a time.
+    - Rows are addressed by position; results hold row numbers and
+      CandidateView, never copies of the profile.
+    - A new store in a directory replaces the store saved there; only
+      load() reopens one.
+    """
+
+    fields = STRING_COLUMNS + ("education", "experience_years", "skills", "parsed_at", "raw_text")
+
+    def __init__(self, path: Optional[str] = None, load: bool = False):
+        self._temporary = path is None
+        self.path = path or tempfile.mkdtemp(prefix="candidates_")
+        os.makedirs(self.path, exist_ok=True)
+        self.skill_names: List[str] = []
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_off = array("Q", [0])
+        self._skill_idx = array("I")
+        self._experience = array("h")
+        self._parsed_at = array("q")
+        self._education: List[str] = []
+        self._strings: Dict[str, List[Optional[str]]] = {c: [] for c in STRING_COLUMNS}
+        self._text_off = array("Q", [0])
+        if not load:
+            # offsets start at 0: drop an older store's texts and columns
+            for name in (META_FILE, ARRAYS_FILE):
+                if os.path.exists(os.path.join(self.path, name)):
+                    os.remove(os.path.join(self.path, name))
+        self._texts = open(os.path.join(self.path, TEXTS_FILE), "a+b" if load else "w+b")
+        self._lock = threading.Lock()
+        # a temp store holds resume text: remove it when the store is
+        # collected or the process exits, not only on close()
+        self._finalizer = weakref.finalize(self, _release, self._texts, self.path if self._temporary else None)
+
+    def __len__(self):
+        return len(self._experience)
+
+    def __getitem__(self, i: int) -> CandidateView:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return CandidateView(self, i)
+
+    def __iter__(self):
+        return (CandidateView(self, i) for i in range(len(self)))
+
+    # ---------- building ----------
+    def append(self, profile: dict) -> int:
+        """Adds one parse_resume profile; returns its row number."""
+        for col in STRING_COLUMNS:
+            self._strings[col].append(profile.get(col))
+        self._education.append("\n".join(profile.get("education") or []))
+        self._experience.append(int(profile.get("experience_years") or 0))
+        parsed_at = profile.get("parsed_at")
+        self._parsed_at.append(int(datetime.fromisoformat(parsed_at).timestamp()) if parsed_at else 0)
+        for skill in profile.get("skills") or []:
+            sid = self._skill_ids.get(skill)
+            if sid is None:
+                sid = self._skill_ids[skill] = len(self.skill_names)
+                self.skill_names.append(skill)
+            self._skill_idx.append(sid)
+        self._skill_off.append(len(self._skill_idx))
+
+        blob = zlib.compress((profile.get("raw_text") or "").encode("utf-8"), 6)
+        with self._lock:
+            self._texts.seek(0, os.SEEK_END)
+            self._texts.write(blob)
+        self._text_off.append(self._text_off[-1] + len(blob))
+        return len(self) - 1
+
+    def extend(self, profiles: Iterable[dict]):
+        for profile in profiles:
+            self.append(profile)
+        self._texts.flush()
+
+    @classmethod
+    def from_profiles(cls, profiles: Iterable[dict], path: Optional[str] = None) -> "CandidateStore":
+        store = cls(path)
+        store.extend(profiles)
+        return store
+
+    # ---------- reads ----------
+    def skill_ids(self, i: int) -> np.ndarray:
+        return np.frombuffer(self._skill_idx, dtype=np.uint32)[self._skill_off[i]:self._skill_off[i + 1]]
+
+    def text(self, i: int) -> str:
+        start, end = self._text_off[i], self._text_off[i + 1]
+        with self._lock:
+            self._texts.flush()
+            self._texts.seek(start)
+            blob = self._texts.read(end - start)
+        return zlib.decompress(blob).decode("utf-8")
+
+    def iter_texts(self):
+        """Texts in row order, one decompressed row in memory at a time."""
+        for i in range(len(self)):
+            yield self.text(i)
+
+    def field(self, i: int, key: str):
+        if key in self._strings:
+            return self._strings[key][i]
+        if key == "skills":
+            return [self.skill_names[s] for s in self.skill_ids(i)]
+        if key == "experience_years":
+            return int(self._experience[i])
+        if key == "education":
+            return self._education[i].split("\n") if self._education[i] else []
+        if key == "parsed_at":
+            ts = self._parsed_at[i]
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+        if key == "raw_text":
+            return self.text(i)
+        raise KeyError(key)
+
+    @property
+    def experience(self) -> np.ndarray:
+        return np.frombuffer(self._experience, dtype=np.int16)
+
+    def skill_matrix(self):
+        """Rows x skills 0/1 scipy CSR matrix over the interned skill ids."""
+        from scipy import sparse
+        idx = np.frombuffer(self._skill_idx, dtype=np.uint32)
+        indptr = np.frombuffer(self._skill_off, dtype=np.uint64).astype(np.int64)
+        data = np.ones(len(idx), dtype=np.uint8)
+        return sparse.csr_matrix((data, idx, indptr), shape=(len(self), len(self.skill_names)))
+
+    def common_skills(self, n: int = 10):
+        """(skill, count) pairs like Counter.most_common, from an id bincount."""
+        counts = np.bincount(np.frombuffer(self._skill_idx, dtype=np.uint32), minlength=len(self.skill_names))
+        top = np.argsort(-counts, kind="stable")[:n]
+        return [(self.skill_names[s], int(counts[s])) for s in top if counts[s]]
+
+    def avg_experience(self) -> float:
+        return round(float(self.experience.mean()), 2) if len(self) else 0
+
+    # ---------- persistence ----------
+    def save(self):
+        """Writes the columns next to texts.bin so load(path) reopens the pool."""
+        self._texts.flush()
+        with open(os.path.join(self.path, ARRAYS_FILE), "wb") as f:
+            np.savez(
+                f,
+                skill_off=np.frombuffer(self._skill_off, dtype=np.uint64),
+                skill_idx=np.frombuffer(self._skill_idx, dtype=np.uint32),
+                experience=self.experience,
+                parsed_at=np.frombuffer(self._parsed_at, dtype=np.int64),
+                text_off=np.frombuffer(self._text_off, dtype=np.uint64),
+            )
+        with open(os.path.join(self.path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"skill_names": self.skill_names, "education": self._education,
+                       "strings": self._strings}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "CandidateStore":
+        store = cls(path, load=True)
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        store.skill_names = meta["skill_names"]
+        store._skill_ids = {s: i for i, s in enumerate(store.skill_names)}
+        store._education = meta["education"]
+        store._strings = meta["strings"]
+        data = np.load(os.path.join(path, ARRAYS_FILE))
+        store._skill_off = array("Q", data["skill_off"].tobytes())
+        store._skill_idx = array("I", data["skill_idx"].tobytes())
+        store._experience = array("h", data["experience"].tobytes())
+        store._parsed_at = array("q", data["parsed_at"].tobytes())
+        store._text_off = array("Q", data["text_off"].tobytes())
+        return store
+
+    def close(self):
+        """Closes texts.bin; a store created without a path is deleted."""
+        self._finalizer()
+
+
+def _release(texts, temp_dir: Optional[str]):
+    texts.close()
+    if temp_dir:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,322 @@
+# db.py
+"""
+Local SQLite store for parsed candidates, JD profiles and score results.
+
+    python db.py stats
+    python db.py top --jd job_description.txt --n 50 --min-exp 3
+    python db.py top --jd job_description.txt --skill python --skill docker
+
+Profiles and scores saved here are queried back without reparsing.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+DEFAULT_DB_PATH = os.path.join(".cache", "resumes.sqlite")
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT UNIQUE,
+    email TEXT,
+    name TEXT,
+    phone TEXT,
+    orig_filename TEXT,
+    file_path TEXT,
+    education TEXT,
+    experience_years INTEGER,
+    skills TEXT,
+    raw_text TEXT,
+    parsed_at TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates(experience_years);
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, skill)
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills(skill);
+CREATE TABLE IF NOT EXISTS job_profiles (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    keywords_hash TEXT NOT NULL,
+    title TEXT,
+    text TEXT,
+    keywords TEXT NOT NULL,
+    weights TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (content_hash, keywords_hash)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    jd_id INTEGER NOT NULL REFERENCES job_profiles(id) ON DELETE CASCADE,
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    score REAL NOT NULL,
+    matched_keywords TEXT,
+    semantic_score REAL,
+    PRIMARY KEY (jd_id, candidate_id)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_rank ON scores(jd_id, score DESC);
+"""
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _norm_email(email: Optional[str]) -> Optional[str]:
+    return email.strip().lower() if email else None
+
+
+class ResumeDB:
+    """
+    - WAL journal, so the app can read while a batch is being written.
+    - insert_resumes() writes in transactions of batch_size rows.
+    - A candidate row is one file: a re-saved file (same content hash)
+      updates its row in place. Two different files never share a row,
+      even with the same email, so each keeps its own scores.
+    - Profiles flagged duplicate_of (near-copies carrying their
+      original's fields) are not saved.
+    - A JD profile is keyed by its text hash and keyword list, so edited
+      keywords get their own score set.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # ---------- candidates ----------
+    def _find_candidate(self, content_hash: Optional[str]) -> Optional[int]:
+        if not content_hash:
+            return None
+        row = self._conn.execute(
+            "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _upsert_candidate(self, profile: dict) -> int:
+        email = _norm_email(profile.get("email"))
+        values = (
+            profile.get("content_hash"), email, profile.get("name"), profile.get("phone"),
+            profile.get("orig_filename"), profile.get("file_path"),
+            json.dumps(profile.get("education") or []), profile.get("experience_years") or 0,
+            json.dumps(profile.get("skills") or []), profile.get("raw_text"),
+            profile.get("parsed_at"), time.time(),
+        )
+        cid = self._find_candidate(profile.get("content_hash"))
+        if cid is None:
+            cid = self._conn.execute(
+                "INSERT INTO candidates (content_hash, email, name, phone, orig_filename, file_path,"
+                " education, experience_years, skills, raw_text, parsed_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            ).lastrowid
+        else:
+            self._conn.execute(
+                "UPDATE candidates SET content_hash = ?, email = ?, name = ?, phone = ?,"
+                " orig_filename = ?, file_path = ?, education = ?, experience_years = ?,"
+                " skills = ?, raw_text = ?, parsed_at = ?, updated_at = ? WHERE id = ?",
+                values + (cid,),
+            )
+            self._conn.execute("DELETE FROM candidate_skills WHERE candidate_id = ?", (cid,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO candidate_skills (candidate_id, skill) VALUES (?, ?)",
+            [(cid, skill.lower()) for skill in profile.get("skills") or []],
+        )
+        return cid
+
+    def insert_resumes(self, profiles: Iterable[dict]) -> List[Optional[int]]:
+        """
+        Saves parse_resume profiles; returns their candidate ids in order
+        (None for skipped duplicate_of profiles).
+        """
+        ids = []
+        batch = []
+
+        def _flush():
+            with self._lock, self._conn:
+                ids.extend(None if p.get("duplicate_of") else self._upsert_candidate(p) for p in batch)
+            batch.clear()
+
+        for profile in profiles:
+            batch.append(profile)
+            if len(batch) >= self.batch_size:
+                _flush()
+        if batch:
+            _flush()
+        return ids
+
+    def insert_resume(self, profile: dict) -> Optional[int]:
+        return self.insert_resumes([profile])[0]
+
+    def get_profile(self, content_hash: str) -> Optional[dict]:
+        """The stored profile for a file, in parse_resume's shape."""
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM candidates WHERE content_hash = ?", (content_hash,))
+            row = cur.fetchone()
+            cols = [d[0] for d in cur.description]
+        return self._profile(dict(zip(cols, row))) if row else None
+
+    @staticmethod
+    def _profile(row: dict) -> dict:
+        row.pop("updated_at", None)
+        row["education"] = json.loads(row["education"] or "[]")
+        row["skills"] = json.loads(row["skills"] or "[]")
+        return row
+
+    # ---------- JDs and scores ----------
+    def save_job_profile(self, title: str, job_profile) -> int:
+        """Stores a job_profile.JobProfile; returns its id (existing if unchanged)."""
+        keywords = json.dumps(job_profile.keywords)
+        keywords_hash = hashlib.sha1(keywords.encode("utf-8")).hexdigest()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO job_profiles"
+                " (content_hash, keywords_hash, title, text, keywords, weights, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_profile.content_hash, keywords_hash, title, job_profile.text, keywords,
+                 json.dumps(job_profile.weights), time.time()),
+            )
+            return self._conn.execute(
+                "SELECT id FROM job_profiles WHERE content_hash = ? AND keywords_hash = ?",
+                (job_profile.content_hash, keywords_hash),
+            ).fetchone()[0]
+
+    def save_scores(self, jd_id: int, results: Iterable[dict]):
+        """
+        Stores result rows (matcher.result_entry shape). Candidates are
+        resolved by content_hash, so save them with insert_resumes first.
+        """
+        results = [r for r in results if r.get("content_hash")]
+        hashes = list({r["content_hash"] for r in results})
+        with self._lock, self._conn:
+            ids = {}
+            for start in range(0, len(hashes), self.batch_size):
+                chunk = hashes[start:start + self.batch_size]
+                ids.update(self._conn.execute(
+                    f"SELECT content_hash, id FROM candidates WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+            rows = [
+                (jd_id, ids[r["content_hash"]], r["score"], json.dumps(r.get("matched_keywords") or []),
+                 r.get("semantic_score"))
+                for r in results if r["content_hash"] in ids
+            ]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores"
+                " (jd_id, candidate_id, score, matched_keywords, semantic_score) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def latest_job_profile(self, jd_text: str) -> Optional[int]:
+        """Most recently saved profile id for a JD text, whatever its keywords."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM job_profiles WHERE content_hash = ? ORDER BY created_at DESC LIMIT 1",
+                (_text_hash(jd_text),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def top_candidates(self, jd_id: int, n: int = 50, min_experience: Optional[int] = None,
+                       skills: Optional[List[str]] = None) -> List[dict]:
+        """
+        Best saved scores for a JD, as result rows. Optional filters: at
+        least min_experience years, and every skill in skills.
+        """
+        sql = (
+            "SELECT c.orig_filename, c.email, c.phone, c.education, c.experience_years, c.skills,"
+            " s.score, s.matched_keywords, c.file_path, c.content_hash, s.semantic_score"
+            " FROM scores s JOIN candidates c ON c.id = s.candidate_id WHERE s.jd_id = ?"
+        )
+        params = [jd_id]
+        if min_experience is not None:
+            sql += " AND c.experience_years >= ?"
+            params.append(min_experience)
+        for skill in skills or []:
+            sql += " AND EXISTS (SELECT 1 FROM candidate_skills k WHERE k.candidate_id = c.id AND k.skill = ?)"
+            params.append(skill.lower())
+        sql += " ORDER BY s.score DESC, c.id LIMIT ?"
+        params.append(n)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"name": os.path.splitext(fname or "Unknown File")[0], "email": email, "phone": phone,
+             "education": json.loads(edu or "[]"), "experience_years": exp, "skills": json.loads(sk or "[]"),
+             "score": score, "matched_keywords": json.loads(matched or "[]"), "file_path": fpath,
+             "content_hash": chash, "semantic_score": sem}
+            for fname, email, phone, edu, exp, sk, score, matched, fpath, chash, sem in rows
+        ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("candidates", "job_profiles", "scores")
+            }
+
+    def close(self):
+        self._conn.close()
+
+
+_default: Optional[ResumeDB] = None
+
+
+def init_db(path: str = DEFAULT_DB_PATH) -> ResumeDB:
+    """Opens (creating if needed) the default database; safe to call on every rerun."""
+    global _default
+    if _default is None or _default.path != path:
+        _default = ResumeDB(path)
+    return _default
+
+
+def insert_resume(profile: dict) -> Optional[int]:
+    return init_db().insert_resume(profile)
+
+
+def insert_resumes(profiles: Iterable[dict]) -> List[Optional[int]]:
+    return init_db().insert_resumes(profiles)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query the saved candidate database")
+    ap.add_argument("--db", default=DEFAULT_DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="row counts")
+    q = sub.add_parser("top", help="best saved candidates for a JD")
+    q.add_argument("--jd", required=True, help="JD text file (as scored in the app)")
+    q.add_argument("--n", type=int, default=50)
+    q.add_argument("--min-exp", type=int, help="minimum years of experience")
+    q.add_argument("--skill", action="append", help="required skill (repeatable)")
+    args = ap.parse_args()
+
+    db = ResumeDB(args.db)
+    if args.cmd == "stats":
+        print(json.dumps(db.stats(), indent=2))
+        return
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_id = db.latest_job_profile(f.read())
+    if jd_id is None:
+        raise SystemExit(f"[db] No saved scores for {args.jd}")
+    for row in db.top_candidates(jd_id, args.n, args.min_exp, args.skill):
+        print(f"{row['score']:6.2f}  {row['experience_years']:>3}y  {row['name']}  {row['email'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# dedup.py
+"""
+Near-duplicate resume detection: MinHash signatures of word shingles,
+indexed with LSH banding.
+
+    python dedup.py resumes/ --threshold 0.8
+"""
+import argparse
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16
+THRESHOLD = 0.8
+
+_WORD_RE = re.compile(r"\w+")
+# per-position multipliers that fold a shingle's word hashes into one
+_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                 0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53,
+                 0x94D049BB133111EB, 0xBF58476D1CE4E5B9], dtype=np.uint64)
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct 64-bit hashes of the text's k-word shingles (lowercased)."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    k = min(k, len(words), len(_MIX))
+    # crc32 is stable across processes, unlike hash()
+    hashes = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    n = len(words) - k + 1
+    out = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        out += hashes[j:j + n] * _MIX[j]  # wraps mod 2**64
+    return np.unique(out)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: share of equal signature slots."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class MinHasher:
+    """
+    num_perm hash functions h(x) = (a*x + b) >> 32 over 64-bit shingle
+    hashes; a signature keeps each function's minimum over a text's
+    shingles. Seeded, so signatures from different processes compare.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """uint32 signature, or None for a text without words."""
+        x = shingles(text, self.shingle_size)
+        if not len(x):
+            return None
+        sig = np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        # in slices, so a long resume never builds a huge perm x shingle matrix
+        for i in range(0, len(x), 4096):
+            h = (self._a[:, None] * x[None, i:i + 4096] + self._b[:, None]) >> np.uint64(32)
+            np.minimum(sig, h.min(axis=1).astype(np.uint32), out=sig)
+        return sig
+
+
+class LSHIndex:
+    """
+    Signatures cut into bands of rows; keys whose signatures agree on any
+    whole band share a bucket. A query only compares against its buckets,
+    so lookups do not grow with the pool. Pairs at Jaccard s collide with
+    probability 1 - (1 - s**rows)**bands (about 0.95 at s=0.8 with the
+    defaults, under 0.001 at s=0.3).
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, key):
+        return key in self.signatures
+
+    def _band_keys(self, sig: np.ndarray):
+        raw = sig.tobytes()
+        width = self.rows * sig.itemsize
+        return [raw[i * width:(i + 1) * width] for i in range(self.bands)]
+
+    def add(self, key: str, sig: np.ndarray):
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = sig
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            buckets.setdefault(band, []).append(key)
+
+    def remove(self, key: str):
+        sig = self.signatures.pop(key, None)
+        if sig is None:
+            return
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            keys = buckets[band]
+            keys.remove(key)
+            if not keys:
+                del buckets[band]
+
+    def candidates(self, sig: np.ndarray) -> List[str]:
+        """Keys sharing at least one band with sig, in insertion order."""
+        found = {}
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            for key in buckets.get(band, ()):
+                found[key] = None
+        return list(found)
+
+
+class Deduplicator:
+    """
+    Streaming near-duplicate check. The first resume of a group is
+    indexed; later ones are matched against it and never indexed, so
+    every duplicate points at its group's original.
+
+    - match() verifies LSH candidates on the full signatures and returns
+      the most similar original at or above threshold.
+    - remember() keeps an original's parsed profile (without raw text)
+      so parse_resumes can copy it for duplicates instead of parsing them.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, shingle_size: int = SHINGLE_SIZE):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.index = LSHIndex(num_perm, bands)
+        self.profiles: Dict[str, dict] = {}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        return self.hasher.signature(text)
+
+    def match(self, sig: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
+        if sig is None:
+            return None
+        best = None
+        for key in self.index.candidates(sig):
+            sim = similarity(sig, self.index.signatures[key])
+            if sim >= self.threshold and (best is None or sim > best[1]):
+                best = (key, sim)
+        return best
+
+    def add(self, key: str, sig: Optional[np.ndarray]):
+        if sig is not None:
+            self.index.add(key, sig)
+
+    def discard(self, key: str):
+        """Drops an original (e.g. it failed to parse) so copies parse on their own."""
+        self.index.remove(key)
+        self.profiles.pop(key, None)
+
+    def check(self, key: str, text: str) -> Optional[Tuple[str, float]]:
+        """(original key, similarity) if text repeats an indexed resume; else indexes it."""
+        sig = self.signature(text)
+        found = self.match(sig)
+        if found is None:
+            self.add(key, sig)
+        return found
+
+    def remember(self, key: str, profile: dict):
+        if key in self.index:
+            self.profiles[key] = {k: v for k, v in profile.items() if k != "raw_text"}
+
+    def check_profiles(self, items: Iterable[Tuple[str, dict]]) -> Dict[str, Tuple[str, float]]:
+        """
+        Feeds already-parsed (key, profile) pairs (e.g. cache hits), in
+        order, before parse_resumes runs with this Deduplicator: originals
+        are indexed and remembered, so new files copy them. Returns key ->
+        (original key, similarity) for the profiles that repeat one.
+        """
+        found = {}
+        for key, profile in items:
+            match = self.check(key, profile.get("raw_text") or "")
+            if match is None:
+                self.remember(key, profile)
+            else:
+                found[key] = match
+        return found
+
+
+def find_duplicates(items: Iterable[Tuple[str, str]], threshold: float = THRESHOLD) -> Dict[str, Tuple[str, float]]:
+    """key -> (original key, similarity) for every (key, text) repeating an earlier one."""
+    dedup = Deduplicator(threshold)
+    found = {}
+    for key, text in items:
+        match = dedup.check(key, text)
+        if match is not None:
+            found[key] = match
+    return found
+
+
+def mark_duplicates(profiles: List[dict], key: str = "orig_filename", threshold: float = THRESHOLD) -> int:
+    """
+    Sets "duplicate_of" (the original's key) and "similarity" on each
+    profile that repeats an earlier one in the list, and clears them on
+    the rest. Profiles without raw_text keep what they have. Returns the
+    number of duplicates.
+    """
+    with_text = [p for p in profiles if p.get("raw_text")]
+    found = find_duplicates(((p[key], p["raw_text"]) for p in with_text), threshold)
+    for p in with_text:
+        original, sim = found.get(p[key], (None, None))
+        p["duplicate_of"] = original
+        p["similarity"] = round(sim, 3) if sim is not None else None
+    return sum(1 for p in profiles if p.get("duplicate_of"))
+
+
+def duplicate_groups(profiles: List[dict], key: str = "orig_filename") -> List[List[dict]]:
+    """Profiles grouped original-first, groups in list order of their first member."""
+    groups: Dict[str, List[dict]] = {}
+    for p in profiles:
+        groups.setdefault(p.get("duplicate_of") or p[key], []).append(p)
+    # a cached original can come after its copies in the list
+    return [sorted(g, key=lambda p: bool(p.get("duplicate_of"))) for g in groups.values()]
+
+
+def main(argv=None):
+    from main import iter_resume_paths
+    from parser import extract_text_from_file
+    ap = argparse.ArgumentParser(description="List groups of near-duplicate resumes")
+    ap.add_argument("inputs", nargs="*", default=["resumes/"])
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = ap.parse_args(argv)
+
+    dedup = Deduplicator(args.threshold)
+    groups: Dict[str, List[Tuple[str, float]]] = {}
+    for path in iter_resume_paths(args.inputs):
+        try:
+            text = extract_text_from_file(path)
+        except Exception as e:
+            print(f"Failed: {path}: {e}")
+            continue
+        match = dedup.check(path, text)
+        if match is not None:
+            groups.setdefault(match[0], []).append((path, match[1]))
+    for original, copies in groups.items():
+        print(original)
+        for path, sim in copies:
+            print(f"  {sim:.2f}  {path}")
+    print(f"\n{sum(map(len, groups.values()))} near-duplicates in {len(groups)} groups "
+          f"({len(dedup.index)} distinct resumes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,183 @@
+import csv
+import io
+import os
+from itertools import chain, islice
 import pandas as pd
+import instrumentation
 
+# Column order for a more readable display in Streamlit and in exports
+COLUMN_ORDER = [
+    "name",
+    "score",
+    "semantic_score",
+    "experience_years",
+    "matched_keywords",
+    "skills",
+    "recommended_role",
+    "email",
+    "phone",
+    "education"
+]
+CHUNK_SIZE = 5000
+EXPORT_FORMATS = ("csv", "parquet", "xlsx")
+
+
+@instrumentation.timed()
 def results_to_dataframe(results):
     """Converts the list of result dictionaries into a pandas DataFrame."""
     df = pd.DataFrame(results)
-    
-    # Reorder columns for a more readable display in Streamlit
-    column_order = [
-        "name", 
-        "score", 
-        "experience_years",
-        "matched_keywords", 
-        "skills", 
-        "email", 
-        "phone",
-        "education"
-    ]
-    
+
     # Filter for columns that actually exist to avoid errors
-    existing_columns = [col for col in column_order if col in df.columns]
-    
+    existing_columns = [col for col in COLUMN_ORDER if col in df.columns]
+
     return df[existing_columns]
 
 
+# ---------------- STREAMING EXPORT ----------------
+def export_columns(first_row):
+    """
+    COLUMN_ORDER filtered to what the rows carry (rows of one result set
+    share keys), led by "jd" for combined exports.
+    """
+    if first_row is None:
+        return []
+    columns = [col for col in COLUMN_ORDER if col in first_row]
+    return ["jd"] + columns if "jd" in first_row else columns
+
+
+def iter_chunks(rows, chunk_size=CHUNK_SIZE):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_combined(all_results):
+    """Rows of every JD in one stream, each tagged with its JD in a "jd" column."""
+    for jd_title, results in all_results.items():
+        for row in results:
+            yield {"jd": jd_title, **row}
+
+
+def _peek(rows):
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None, iter(())
+    return first, chain([first], rows)
+
+
+def _cell(value):
+    """Lists as "a, b" so spreadsheet cells stay readable."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(map(str, value))
+    return value
+
+
+@instrumentation.timed()
+def write_csv(rows, out, columns=None, chunk_size=CHUNK_SIZE):
+    """
+    Writes result rows to a path or text file object chunk by chunk;
+    same cells as results_to_dataframe(rows).to_csv(index=False), except
+    that a column mixing ints with floats or None keeps its ints ("3",
+    where pandas upcasts the column and writes "3.0").
+    """
+    first, rows = _peek(rows)
+    columns = columns or export_columns(first)
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            return write_csv(rows, f, columns, chunk_size)
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(columns)
+    for chunk in iter_chunks(rows, chunk_size):
+        writer.writerows([[row.get(col) for col in columns] for row in chunk])
+
+
+def _parquet_schema(pa, columns):
+    lists = {"matched_keywords", "skills", "education"}
+    floats = {"score", "semantic_score"}
+    return pa.schema([
+        (col, pa.list_(pa.string()) if col in lists
+         else pa.float64() if col in floats
+         else pa.int64() if col == "experience_years"
+         else pa.string())
+        for col in columns
+    ])
+
+
+@instrumentation.timed()
+def write_parquet(rows, out, columns=None, chunk_size=CHUNK_SIZE, compression="zstd"):
+    """One compressed row group per chunk; list fields stay list<string>. Needs pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    first, rows = _peek(rows)
+    columns = columns or export_columns(first)
+    schema = _parquet_schema(pa, columns)
+    with pq.ParquetWriter(out, schema, compression=compression) as writer:
+        for chunk in iter_chunks(rows, chunk_size):
+            writer.write_table(pa.Table.from_pylist([{c: row.get(c) for c in columns} for row in chunk], schema))
+
+
+@instrumentation.timed()
+def write_excel(rows, out, columns=None, sheet_title="Results"):
+    """openpyxl write-only workbook: rows go straight to the file. Needs openpyxl."""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Excel export needs openpyxl (pip install openpyxl)")
+    first, rows = _peek(rows)
+    columns = columns or export_columns(first)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title[:31])
+    ws.append(columns)
+    for row in rows:
+        ws.append([_cell(row.get(col)) for col in columns])
+    wb.save(out)
+
+
+_WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_excel}
+_REQUIRES = {"parquet": "pyarrow", "xlsx": "openpyxl"}
+
+
+def check_format(fmt):
+    """Raises before any work is done if fmt's optional package is missing."""
+    import importlib.util
+    module = _REQUIRES.get(fmt)
+    if module and importlib.util.find_spec(module) is None:
+        raise RuntimeError(f"{fmt} export needs {module} (pip install {module})")
+
+
+def export_results(rows, out, fmt=None):
+    """Writes rows to a path; the format comes from fmt or the file extension."""
+    fmt = fmt or os.path.splitext(str(out))[1].lstrip(".").lower()
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt!r} (use one of {', '.join(EXPORT_FORMATS)})")
+    _WRITERS[fmt](rows, out)
+
+
+def export_bytes(rows, fmt="csv") -> bytes:
+    """Download payload for st.download_button; build it only when asked for."""
+    buf = io.BytesIO()
+    if fmt == "csv":
+        text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+        write_csv(rows, text)
+        text.flush()
+        text.detach()
+    elif fmt in _WRITERS:
+        _WRITERS[fmt](rows, buf)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+    return buf.getvalue()
+
+
 class CSVExporter:
+    @instrumentation.timed("CSVExporter.export_to_csv")
     def export_to_csv(self, results, filename):
-        df = pd.DataFrame(results)
-        df = df.sort_values(by='Score', ascending=False)
-        df.to_csv(filename, index=False)
\ No newline at end of file
+        # sort the row list (not a DataFrame copy), then stream it out
+        rows = sorted(results, key=lambda r: r.get("Score", r.get("score", 0)), reverse=True)
+        write_csv(rows, filename, list(rows[0]) if rows else [])
@@ -0,0 +1,121 @@
+# field_extractor.py
+import re
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(\+?\d{1,3}[-.\s]?)?\d{10}")
+YEARS_RE = re.compile(r"(\d{1,2})\+?\s*year")
+
+EDU_KEYWORDS = (
+    "bachelor", "master", "phd",
+    "b.tech", "m.tech", "bsc", "msc",
+    "mba", "degree", "diploma"
+)
+
+# Anchored pieces of the patterns above, applied only around a trigger
+_EMAIL_LOCAL = re.compile(r"[A-Za-z0-9._%+-]+\Z")
+_YEARS_BEFORE = re.compile(r"(\d{1,2})\+?\s*\Z")
+# Longest run of characters that can precede a PHONE_RE's 10 digits: "+123-"
+_PHONE_PREFIX = 5
+_DIGIT_MASK = bytes(48 if 48 <= b <= 57 else 46 for b in range(256))  # digit -> "0", else "."
+_TEN_DIGITS = b"0" * 10
+
+
+class Fields(NamedTuple):
+    """Every match, in text order; parser.extract_* return the first/max."""
+    emails: Tuple[str, ...]
+    phones: Tuple[str, ...]
+    years: Tuple[int, ...]
+    education: Tuple[str, ...]
+
+
+def _emails(text: str):
+    found, end = [], 0
+    at = text.find("@")
+    while at != -1:
+        if at >= end:
+            local = _EMAIL_LOCAL.search(text, max(end, at - 256), at)
+            if local and local.start() == at - 256 > end:
+                local = _EMAIL_LOCAL.search(text, end, at)  # local part longer than the window
+            if local:
+                m = EMAIL_RE.match(text, local.start())
+                if m:
+                    found.append(m.group(0))
+                    end = m.end()
+        at = text.find("@", at + 1)
+    return found
+
+
+def _phones(text: str):
+    if not text.isascii():
+        # \d also matches non-ASCII digits, which the byte mask cannot see
+        return [m.group(0) for m in PHONE_RE.finditer(text)]
+    # A phone needs ten digits in a row; find those in a one-byte-per-char
+    # digit mask (C-speed bytes.find) and run PHONE_RE only next to them.
+    mask = text.encode("ascii").translate(_DIGIT_MASK)
+    found, pos = [], 0
+    run = mask.find(_TEN_DIGITS)
+    while run != -1:
+        m = PHONE_RE.search(text, max(pos, run - _PHONE_PREFIX))
+        if m is None:
+            break
+        found.append(m.group(0))
+        pos = m.end()
+        run = mask.find(_TEN_DIGITS, pos)
+    return found
+
+
+def _years(lower: str):
+    found, end = [], 0
+    at = lower.find("year")
+    while at != -1:
+        m = _YEARS_BEFORE.search(lower, max(end, at - 64), at)
+        if m is None and at - 64 > end and lower[at - 64:at].isspace():
+            m = _YEARS_BEFORE.search(lower, end, at)  # whitespace gap longer than the window
+        elif m and m.start() == at - 64 > end:
+            m = _YEARS_BEFORE.search(lower, end, at)  # the window may have cut a number in two
+        if m:
+            found.append(int(m.group(1)))
+            end = at + 4
+        at = lower.find("year", at + 4)
+    return found
+
+
+def _education(text: str, lower: str):
+    if len(lower) != len(text):
+        # a few characters lowercase to two; offsets would not line up
+        return [line.strip() for line in text.split("\n")
+                if any(k in line.lower() for k in EDU_KEYWORDS)]
+    spans = set()
+    for kw in EDU_KEYWORDS:
+        at = lower.find(kw)
+        while at != -1:
+            start = lower.rfind("\n", 0, at) + 1
+            end = lower.find("\n", at)
+            end = len(lower) if end == -1 else end
+            spans.add((start, end))
+            at = lower.find(kw, end)
+    return [text[s:e].strip() for s, e in sorted(spans)]
+
+
+@lru_cache(maxsize=8)
+def extract_fields(text: str) -> Fields:
+    """
+    All emails, phones, "N years" values and education lines of a resume.
+
+    - Same matches as running EMAIL_RE / PHONE_RE / YEARS_RE with
+      finditer and the per-line education keyword test, but each field
+      is located from a literal trigger ("@", ten digits, "year", an
+      education keyword) with str.find, and its pattern is only run
+      there, instead of trying every pattern at every character.
+    - The text is lowercased once. Cached on the text, so
+      parser.extract_email/phone/... on the same resume share one run.
+    """
+    lower = text.lower()
+    return Fields(
+        emails=tuple(_emails(text)),
+        phones=tuple(_phones(text)),
+        years=tuple(_years(lower)),
+        education=tuple(_education(text, lower)),
+    )
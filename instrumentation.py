@@ -0,0 +1,298 @@
+# instrumentation.py
+"""
+Lightweight per-stage timing and counters for the pipeline.
+
+Off by default (or set RESUME_METRICS=1). When off, @timed functions pay
+one context-variable lookup per call. When on, every timed call adds to
+the current context's Collector: per-stage totals and, inside
+file_context(), that file's record.
+
+CLI:
+    python instrumentation.py resumes/*.pdf --json report.json
+    python instrumentation.py --profile slow.pdf --profile-out slow.prof
+    py-spy record -o slow.svg -- python instrumentation.py --profile slow.pdf --repeat 50
+"""
+import argparse
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_current_file = contextvars.ContextVar("current_file", default=None)
+
+
+class Collector:
+    """
+    One run's metrics: per-stage totals, counters and per-file records.
+    Updates take a lock, so thread-pool workers can share one collector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}    # stage -> {"count", "total_s", "max_s"}
+        self.counters = {}  # counter -> int
+        self.files = {}     # file -> {"stages": {stage: s}, "bytes_read", "chars", "errors"}
+
+    def _file_record(self, path):
+        rec = self.files.get(path)
+        if rec is None:
+            rec = self.files[path] = {"stages": {}, "bytes_read": 0, "chars": 0, "errors": 0}
+        return rec
+
+    def record(self, stage: str, elapsed: float, path=None):
+        with self._lock:
+            agg = self.stages.get(stage)
+            if agg is None:
+                agg = self.stages[stage] = {"count": 0, "total_s": 0.0, "max_s": 0.0}
+            agg["count"] += 1
+            agg["total_s"] += elapsed
+            agg["max_s"] = max(agg["max_s"], elapsed)
+            if path is not None:
+                per_file = self._file_record(path)["stages"]
+                per_file[stage] = per_file.get(stage, 0.0) + elapsed
+
+    def count(self, name: str, n: int = 1, path=None):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            if path is not None and name in ("bytes_read", "chars", "errors"):
+                self._file_record(path)[name] += n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "counters": dict(self.counters),
+                "files": {k: {**v, "stages": dict(v["stages"])} for k, v in self.files.items()},
+            }
+
+    def merge(self, snap: dict):
+        with self._lock:
+            for name, other in snap["stages"].items():
+                agg = self.stages.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+                agg["count"] += other["count"]
+                agg["total_s"] += other["total_s"]
+                agg["max_s"] = max(agg["max_s"], other["max_s"])
+            for name, n in snap["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for path, other in snap["files"].items():
+                rec = self._file_record(path)
+                for key in ("bytes_read", "chars", "errors"):
+                    rec[key] += other[key]
+                for name, s in other["stages"].items():
+                    rec["stages"][name] = rec["stages"].get(name, 0.0) + s
+
+    def report(self) -> dict:
+        snap = self.snapshot()
+        stages = {
+            name: {
+                "count": agg["count"],
+                "total_s": round(agg["total_s"], 6),
+                "mean_ms": round(agg["total_s"] / agg["count"] * 1000, 3) if agg["count"] else 0.0,
+                "max_ms": round(agg["max_s"] * 1000, 3),
+            }
+            for name, agg in sorted(snap["stages"].items(), key=lambda kv: -kv[1]["total_s"])
+        }
+        files = [
+            {"file": path, "bytes_read": rec["bytes_read"], "chars": rec["chars"], "errors": rec["errors"],
+             "total_s": round(sum(rec["stages"].values()), 6),
+             **{f"{name}_ms": round(s * 1000, 3) for name, s in rec["stages"].items()}}
+            for path, rec in snap["files"].items()
+        ]
+        files.sort(key=lambda r: -r["total_s"])
+        return {"stages": stages, "counters": snap["counters"], "files": files}
+
+
+# The collector of the current context: each thread (e.g. each Streamlit
+# session's script run) starts with the RESUME_METRICS one or none, so
+# one run's enable/reset/disable never touches another's metrics.
+_collector = contextvars.ContextVar(
+    "collector", default=Collector() if os.environ.get("RESUME_METRICS", "") not in ("", "0") else None
+)
+
+
+def enable() -> Collector:
+    """Turns collection on for the current context; returns its collector."""
+    collector = _collector.get()
+    if collector is None:
+        collector = Collector()
+        _collector.set(collector)
+    return collector
+
+
+def disable():
+    _collector.set(None)
+
+
+def is_enabled() -> bool:
+    return _collector.get() is not None
+
+
+def current():
+    """The current context's Collector, or None when collection is off."""
+    return _collector.get()
+
+
+def reset():
+    """Starts a fresh collector for the current context, if collecting."""
+    if _collector.get() is not None:
+        _collector.set(Collector())
+
+
+def bind(fn):
+    """
+    Wraps fn to record into the current collector from any thread; pool
+    threads do not inherit the submitting thread's context.
+    """
+    collector = _collector.get()
+    if collector is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _collector.set(collector)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _collector.reset(token)
+    return run
+
+
+@contextmanager
+def stage(name: str):
+    """Times the enclosed block as one call of stage `name`."""
+    collector = _collector.get()
+    if collector is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector.record(name, time.perf_counter() - start, _current_file.get())
+
+
+def timed(name: str = None):
+    """Decorator form of stage(); defaults to the function name."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            collector = _collector.get()
+            if collector is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                collector.record(label, time.perf_counter() - start, _current_file.get())
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def file_context(path: str):
+    """Attributes stages and counters inside the block to `path`."""
+    if _collector.get() is None:
+        yield
+        return
+    token = _current_file.set(path)
+    try:
+        yield
+    finally:
+        _current_file.reset(token)
+
+
+def count(name: str, n: int = 1):
+    """
+    Adds n to a counter. "bytes_read", "chars" and "errors" also land on
+    the current file's record.
+    """
+    collector = _collector.get()
+    if collector is not None:
+        collector.count(name, n, _current_file.get())
+
+
+def snapshot() -> dict:
+    """Raw state, e.g. to ship from a worker process back to the parent."""
+    collector = _collector.get() or Collector()
+    return collector.snapshot()
+
+
+def merge(snap: dict):
+    """Folds a snapshot() from another process into the current collector."""
+    collector = _collector.get()
+    if collector is not None:
+        collector.merge(snap)
+
+
+def report() -> dict:
+    """Machine-readable summary: per-stage totals, counters, per-file rows."""
+    return (_collector.get() or Collector()).report()
+
+
+def profile_call(fn, *args, out_path: str = None, **kwargs):
+    """
+    Runs fn under cProfile. Writes a .prof file (snakeviz/pstats) if
+    out_path is given. Returns (result, profiler).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    if out_path:
+        profiler.dump_stats(out_path)
+    return result, profiler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-stage timings for parse_resume")
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--skills", help="skills list file (one per line)")
+    ap.add_argument("--json", help="write the report here instead of stdout")
+    ap.add_argument("--profile", help="cProfile a single file")
+    ap.add_argument("--profile-out", help="where to dump the .prof file")
+    ap.add_argument("--repeat", type=int, default=1, help="parse the profiled file N times (for py-spy)")
+    args = ap.parse_args()
+
+    # parser records into the importable module, which is not __main__
+    import instrumentation
+    from parser import parse_resume
+
+    skills_list = None
+    if args.skills:
+        with open(args.skills, "r", encoding="utf-8") as f:
+            skills_list = [line.strip() for line in f if line.strip()]
+
+    if args.profile:
+        import pstats
+
+        def _run():
+            for _ in range(args.repeat):
+                parse_resume(args.profile, skills_list)
+
+        _, profiler = profile_call(_run, out_path=args.profile_out)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        if not args.files:
+            return
+
+    instrumentation.enable()
+    for path in args.files:
+        try:
+            parse_resume(path, skills_list)
+        except Exception as e:
+            print(f"[instrumentation] {path}: {e}", file=sys.stderr)
+
+    out = json.dumps(instrumentation.report(), indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
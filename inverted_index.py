@@ -0,0 +1,265 @@
+# inverted_index.py
+"""
+Inverted index over a standing candidate pool.
+
+    python inverted_index.py build pool.npz resumes/
+    python main.py inbox/ --jd backend.txt --index pool.npz
+    python inverted_index.py query pool.npz --jd job_description.txt --top 50
+"""
+import argparse
+import os
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from matcher import normalize_term
+from scoring import top_k_indices
+from term_matcher import compile_terms
+
+# Word runs as TermMatcher sees them: its boundaries sit between word
+# and non-word characters, so every word run of a matched keyword is a
+# whole word run of the text.
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct lowercase word runs of text."""
+    return list(dict.fromkeys(_WORD.findall(text.lower())))
+
+
+def _contains(posting: np.ndarray, num: int) -> bool:
+    i = np.searchsorted(posting, num)
+    return i < len(posting) and posting[i] == num
+
+
+class InvertedIndex:
+    """
+    word -> sorted array of internal doc numbers, plus each document's
+    zlib-compressed text.
+
+    - A JD keyword's candidates are the intersection of its words'
+      postings, a superset of the resumes TermMatcher would match, so a
+      query never rescans the resumes that cannot match.
+    - Single-word keywords are answered from the postings alone; phrases
+      and keywords with symbols ("machine learning", "c++") are confirmed
+      with TermMatcher on the candidates' text only. Hits are therefore
+      exactly what compute_keyword_match_score counts.
+    - Only single words are keys, so the dictionary grows with the
+      vocabulary, not with every n-gram of every resume. Posting lists
+      are array('I') (4 bytes per entry) and stay sorted because new
+      documents always get the next doc number.
+    - remove() tombstones a document; compact() rewrites postings
+      without tombstones. add() of an existing id replaces it.
+    """
+
+    def __init__(self):
+        self.doc_ids: List[str] = []
+        self.alive = bytearray()
+        self._doc_num: Dict[str, int] = {}
+        self.postings: Dict[str, array] = {}
+        self._texts: List[bytes] = []
+
+    def __len__(self):
+        return len(self._doc_num)
+
+    def __contains__(self, doc_id: str):
+        return doc_id in self._doc_num
+
+    # ---------- updates ----------
+    def add(self, doc_id: str, text: str):
+        if doc_id in self._doc_num:
+            self.remove(doc_id)
+        text = text or ""
+        num = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.alive.append(1)
+        self._doc_num[doc_id] = num
+        self._texts.append(zlib.compress(text.encode("utf-8"), 6))
+        for word in tokenize(text):
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = array("I")
+            posting.append(num)
+
+    def add_profiles(self, profiles: Iterable[dict], id_key: str = "content_hash"):
+        for prof in profiles:
+            self.add(prof[id_key], prof.get("raw_text", ""))
+
+    def remove(self, doc_id: str):
+        num = self._doc_num.pop(doc_id, None)
+        if num is not None:
+            self.alive[num] = 0
+            self._texts[num] = b""
+
+    def compact(self):
+        """Drops tombstoned documents and renumbers the rest."""
+        keep = np.frombuffer(bytes(self.alive), dtype=np.uint8).astype(bool)
+        remap = np.cumsum(keep) - 1
+        postings = {}
+        for word, posting in self.postings.items():
+            nums = np.frombuffer(posting, dtype=np.uint32)
+            nums = remap[nums[keep[nums]]].astype(np.uint32)
+            if len(nums):
+                postings[word] = array("I", nums.tobytes())
+        self.postings = postings
+        self.doc_ids = [d for d, k in zip(self.doc_ids, keep) if k]
+        self._texts = [t for t, k in zip(self._texts, keep) if k]
+        self.alive = bytearray(b"\x01" * len(self.doc_ids))
+        self._doc_num = {d: i for i, d in enumerate(self.doc_ids)}
+
+    def text(self, doc_id: str) -> str:
+        return self._text(self._doc_num[doc_id])
+
+    def _text(self, num: int) -> str:
+        return zlib.decompress(self._texts[num]).decode("utf-8")
+
+    # ---------- queries ----------
+    def _live_docs(self) -> np.ndarray:
+        return np.flatnonzero(np.frombuffer(bytes(self.alive), dtype=np.uint8)).astype(np.uint32)
+
+    def _word_posting(self, word: str) -> np.ndarray:
+        posting = self.postings.get(word)
+        return np.frombuffer(posting, dtype=np.uint32) if posting else np.zeros(0, dtype=np.uint32)
+
+    def _matches(self, norm: str, texts: Dict[int, str]) -> np.ndarray:
+        """Sorted live doc numbers whose text contains the normalized keyword."""
+        words = _WORD.findall(norm)
+        if not words:
+            candidates = self._live_docs()
+        else:
+            candidates = None
+            for word in sorted(set(words), key=lambda w: len(self.postings.get(w, ()))):
+                posting = self._word_posting(word)
+                candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+                if not len(candidates):
+                    return candidates
+            candidates = candidates[np.frombuffer(bytes(self.alive), dtype=np.uint8)[candidates].astype(bool)]
+        if words == [norm]:
+            return candidates
+        matcher = compile_terms((norm,))
+        confirmed = []
+        for num in candidates.tolist():
+            text = texts.get(num)
+            if text is None:
+                text = texts[num] = self._text(num).lower()
+            if matcher.find(text, lowered=True):
+                confirmed.append(num)
+        return np.asarray(confirmed, dtype=np.uint32)
+
+    def query(self, jd_keywords: List[str], weights: Dict[str, float] = None,
+              top_k: Optional[int] = None) -> List[Tuple[str, float, List[str]]]:
+        """
+        Candidates matching at least one keyword as (doc_id, score, matched),
+        best first. score is the percentage compute_keyword_match_score
+        gives the same text, including its plain-% fallback when every
+        weight is zero.
+        """
+        if not jd_keywords or not self.doc_ids:
+            return []
+        n = len(self.doc_ids)
+        acc = np.zeros(n, dtype=np.float64)
+        hits = np.zeros(n, dtype=np.int64)
+        total = 0.0
+        lists, by_norm, texts = [], {}, {}
+        for kw in jd_keywords:
+            weight = 1.0 if not weights else float(weights.get(kw, 1.0))
+            total += weight
+            norm = normalize_term(kw)
+            if not norm:
+                lists.append((kw, np.zeros(0, dtype=np.uint32)))
+                continue
+            posting = by_norm.get(norm)
+            if posting is None:
+                posting = by_norm[norm] = self._matches(norm, texts)
+            lists.append((kw, posting))
+            acc[posting] += weight
+            hits[posting] += 1
+        docs = np.flatnonzero(hits)
+        if total:
+            scores = acc[docs] / total * 100
+        else:
+            scores = hits[docs] / len(jd_keywords) * 100
+        scores = np.round(scores, 2)
+        out = []
+        for i in top_k_indices(scores, top_k):
+            num = docs[i]
+            matched = [kw for kw, posting in lists if _contains(posting, num)]
+            out.append((self.doc_ids[num], float(scores[i]), matched))
+        return out
+
+    # ---------- persistence ----------
+    def save(self, path: str):
+        """Writes doc ids, tombstones, concatenated uint32 postings and texts (.npz)."""
+        words = list(self.postings)
+        lengths = np.fromiter((len(self.postings[w]) for w in words), dtype=np.int64, count=len(words))
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        flat = np.frombuffer(b"".join(self.postings[w].tobytes() for w in words), dtype=np.uint32)
+        text_lengths = np.fromiter((len(t) for t in self._texts), dtype=np.int64, count=len(self._texts))
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                doc_ids=np.array(self.doc_ids, dtype=str),
+                alive=np.frombuffer(bytes(self.alive), dtype=np.uint8),
+                terms=np.array(words, dtype=str),
+                offsets=offsets,
+                postings=flat,
+                text_offsets=np.concatenate([[0], np.cumsum(text_lengths)]).astype(np.int64),
+                texts=np.frombuffer(b"".join(self._texts), dtype=np.uint8),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        data = np.load(path)
+        index = cls()
+        index.doc_ids = data["doc_ids"].tolist()
+        index.alive = bytearray(data["alive"].tobytes())
+        index._doc_num = {d: i for i, d in enumerate(index.doc_ids) if index.alive[i]}
+        flat, offsets = data["postings"], data["offsets"]
+        for i, word in enumerate(data["terms"].tolist()):
+            index.postings[word] = array("I", flat[offsets[i]:offsets[i + 1]].tobytes())
+        blob, text_offsets = data["texts"].tobytes(), data["text_offsets"].tolist()
+        index._texts = [blob[a:b] for a, b in zip(text_offsets, text_offsets[1:])]
+        return index
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build or query a candidate inverted index")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="add a directory of resumes to an index")
+    b.add_argument("index")
+    b.add_argument("resumes_dir")
+    q = sub.add_parser("query", help="rank indexed candidates for a JD")
+    q.add_argument("index")
+    q.add_argument("--jd", required=True, help="JD text file")
+    q.add_argument("--top", type=int, default=50)
+    q.add_argument("--top-n-keywords", type=int, default=15)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        from parser import extract_text_from_file
+        index = InvertedIndex.load(args.index) if os.path.exists(args.index) else InvertedIndex()
+        for root, _, files in os.walk(args.resumes_dir):
+            for name in sorted(files):
+                if name.lower().endswith((".pdf", ".docx", ".doc", ".txt")):
+                    path = os.path.join(root, name)
+                    try:
+                        index.add(path, extract_text_from_file(path))
+                    except Exception as e:
+                        print(f"[inverted_index] {path}: {e}")
+        index.compact()
+        index.save(args.index)
+        print(f"Indexed {len(index)} resumes, {len(index.postings)} words -> {args.index}")
+    else:
+        from jd_parser import extract_keywords
+        with open(args.jd, "r", encoding="utf-8") as f:
+            keywords = extract_keywords(f.read(), top_n=args.top_n_keywords)
+        index = InvertedIndex.load(args.index)
+        for doc_id, score, matched in index.query(keywords, top_k=args.top):
+            print(f"{score:6.2f}  {doc_id}  {', '.join(matched)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,9 @@
 # jd_parser.py
 import re, string
-from sklearn.feature_extraction.text import TfidfVectorizer
-
-try:
-    from keybert import KeyBERT
-    keybert_model = KeyBERT()
-except:
-    keybert_model = None
+from collections import Counter
+from functools import lru_cache
+import instrumentation
+from models import get_keybert
 
 def clean_text(text):
     text = text.lower()
@@ -14,14 +11,41 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text)
     return text.strip()
 
-def extract_keywords(jd_text, method="tfidf", top_n=15):
+# Same tokens and stop words as sklearn's TfidfVectorizer(stop_words="english")
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+@lru_cache(maxsize=1)
+def _stop_words():
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS
+
+def tokenize(cleaned):
+    stop = _stop_words()
+    return [t for t in TOKEN_RE.findall(cleaned) if t not in stop]
+
+@instrumentation.timed()
+def extract_keywords(jd_text, method="tfidf", top_n=15, idf=None, with_scores=False):
+    """
+    - keybert: KeyBERT keyphrases
+    - tfidf: term frequency x corpus IDF (job_profile.CorpusIDF) if given.
+      Without a corpus, TF-IDF of a single document is plain term
+      frequency, so it is computed directly instead of fitting a
+      TfidfVectorizer per call (same ranking, ties alphabetical).
+    with_scores=True returns (keyword, score) pairs.
+    """
     cleaned = clean_text(jd_text)
-    if method=="keybert" and keybert_model:
-        keywords = keybert_model.extract_keywords(cleaned, keyphrase_ngram_range=(1,2), stop_words="english", top_n=top_n)
-        return [kw[0] for kw in keywords]
+    keybert_model = get_keybert() if method=="keybert" else None
+    if keybert_model:
+        scored = keybert_model.extract_keywords(cleaned, keyphrase_ngram_range=(1,2), stop_words="english", top_n=top_n)
     else:
-        vectorizer = TfidfVectorizer(stop_words="english")
-        tfidf_matrix = vectorizer.fit_transform([cleaned])
-        scores = zip(vectorizer.get_feature_names_out(), tfidf_matrix.toarray()[0])
-        sorted_keywords = sorted(scores, key=lambda x:x[1], reverse=True)
-        return [word for word, score in sorted_keywords[:top_n]]
+        counts = Counter(tokenize(cleaned))
+        if not counts:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        if idf is not None:
+            scored = [(t, c * idf[t]) for t, c in counts.items()]
+        else:
+            scored = list(counts.items())
+        scored = sorted(scored, key=lambda x: (-x[1], x[0]))[:top_n]
+    if with_scores:
+        return [(kw, float(score)) for kw, score in scored]
+    return [kw for kw, score in scored]
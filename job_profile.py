@@ -0,0 +1,130 @@
+# job_profile.py
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional
+import instrumentation
+from jd_parser import clean_text, extract_keywords, tokenize
+from matcher import compute_keyword_match_score, prepare_keywords
+
+DEFAULT_IDF_PATH = os.path.join(".cache", "corpus_idf.json")
+
+
+class CorpusIDF:
+    """
+    Inverse document frequencies fitted once over a corpus of JDs/resumes.
+
+    Uses sklearn's smooth IDF, idf(t) = ln((1 + n) / (1 + df(t))) + 1, so
+    keywords common to every document stop outranking distinctive ones.
+    Terms never seen in the corpus get the maximum IDF.
+    """
+
+    def __init__(self, idf: Dict[str, float], n_docs: int):
+        self.idf = idf
+        self.n_docs = n_docs
+        self.default = math.log((1 + n_docs) / 1) + 1
+        self.version = hashlib.sha1(
+            json.dumps([n_docs, sorted(idf.items())]).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def __getitem__(self, term: str) -> float:
+        return self.idf.get(term, self.default)
+
+    @classmethod
+    def fit(cls, texts: Iterable[str]) -> "CorpusIDF":
+        df = Counter()
+        n_docs = 0
+        for text in texts:
+            n_docs += 1
+            df.update(set(tokenize(clean_text(text))))
+        idf = {t: math.log((1 + n_docs) / (1 + d)) + 1 for t, d in df.items()}
+        return cls(idf, n_docs)
+
+    def save(self, path: str = DEFAULT_IDF_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "idf": self.idf}, f)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_IDF_PATH) -> Optional["CorpusIDF"]:
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["idf"], data["n_docs"])
+
+
+class JobProfile:
+    """
+    A JD parsed once: keywords, their weights, normalized forms and a
+    compiled matcher, ready to score any number of resumes.
+
+    - weights are the keyword scores scaled so the best keyword is 1.0;
+      keywords added by hand (with_keywords) weigh 1.0.
+    - Build through from_text() to reuse profiles by JD content hash.
+    """
+
+    def __init__(self, text: str, keywords: List[str], weights: Dict[str, float] = None):
+        self.text = text
+        self.content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.keywords = list(keywords)
+        self.weights = dict(weights or {})
+        self.prepared = prepare_keywords(self.keywords)
+
+    @property
+    def normalized_keywords(self) -> List[str]:
+        return self.prepared[0]
+
+    @classmethod
+    def from_text(cls, text: str, method: str = "tfidf", top_n: int = 15,
+                  idf: Optional[CorpusIDF] = None, cache=None) -> "JobProfile":
+        """
+        Cached by (content hash, method, top_n, IDF version) in memory and,
+        if a ParseCache is passed, on disk across runs.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = f"jobprofile:{digest}:{method}:{top_n}:{idf.version if idf else 'tf'}"
+        with _PROFILES_LOCK:
+            profile = _PROFILES.get(key)
+            if profile is not None:
+                _PROFILES.move_to_end(key)
+                return profile
+
+        stored = cache.get_json(key) if cache is not None else None
+        if stored is not None:
+            profile = cls(text, stored["keywords"], stored["weights"])
+        else:
+            scored = extract_keywords(text, method=method, top_n=top_n, idf=idf, with_scores=True)
+            top = max((s for _, s in scored), default=0.0) or 1.0
+            profile = cls(text, [kw for kw, _ in scored], {kw: s / top for kw, s in scored})
+            if cache is not None:
+                cache.put_json(key, {"keywords": profile.keywords, "weights": profile.weights})
+
+        # the service calls this from several runner threads
+        with _PROFILES_LOCK:
+            _PROFILES[key] = profile
+            if len(_PROFILES) > _MAX_PROFILES:
+                _PROFILES.popitem(last=False)
+        return profile
+
+    def with_keywords(self, keywords: List[str]) -> "JobProfile":
+        """Same JD with an edited keyword list; unchanged keywords keep their weight."""
+        if list(keywords) == self.keywords:
+            return self
+        return JobProfile(self.text, keywords, {k: self.weights.get(k, 1.0) for k in keywords})
+
+    @instrumentation.timed("JobProfile.score")
+    def score(self, resume_text: str, weighted: bool = True) -> dict:
+        """Same result dict as compute_keyword_match_score."""
+        return compute_keyword_match_score(
+            resume_text, self.keywords, self.weights if weighted else None, self.prepared
+        )
+
+
+_MAX_PROFILES = 256
+_PROFILES: "OrderedDict[str, JobProfile]" = OrderedDict()
+_PROFILES_LOCK = threading.Lock()
@@ -1,34 +1,272 @@
-from parser import ResumeParser
-from matcher import KeywordMatcher
-from exporter import CSVExporter
+# main.py
+"""
+Headless batch ranking.
+
+    python main.py resumes/ --jd job_description.txt
+    python main.py resumes/ --jd backend.txt --jd data.txt --workers 8 --top-k 100 --out results/
+    find inbox -name '*.pdf' | python main.py - --jd job_description.txt
+
+Resumes are streamed through parse -> score -> top-k heap; raw text is
+dropped as soon as a resume is scored. Progress is appended to a
+checkpoint file so an interrupted run picks up where it stopped; the
+checkpoint is removed once a run completes. With --dedup, near-duplicate
+resumes (MinHash/LSH over the text) skip NER and scoring and are listed
+with the file they repeat; the checkpoint keeps the originals' MinHash
+signatures, so a resumed run still catches their copies. With --index, every scored resume is also
+added to an inverted_index.py pool, so later JDs can be ranked with
+`inverted_index.py query` without parsing the files again.
+"""
+import argparse
+import hashlib
+import heapq
+import json
 import os
+import sys
+
+import numpy as np
+
+import instrumentation
+from dedup import Deduplicator
+from exporter import EXPORT_FORMATS, check_format, export_results, iter_combined
+from inverted_index import InvertedIndex
+from job_profile import JobProfile
+from matcher import result_entry
+from parser import extract_text_from_file, parse_resumes
+
+RESUME_EXTS = (".pdf", ".docx", ".doc", ".txt")
+CHECKPOINT_DIR = ".cache"
+
 
 def load_job_description(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return f.read()
 
-def main():
-    resumes_folder = "resumes/"
-    job_desc_file = "job_description.txt"
-    output_csv = "ranked_candidates.csv"
 
-    jd_text = load_job_description(job_desc_file)
-    matcher = KeywordMatcher(jd_text)
-    parser = ResumeParser()
-    results = []
+def iter_resume_paths(inputs):
+    """Yields resume paths lazily from directories, files, or '-' (stdin)."""
+    for src in inputs:
+        if src == "-":
+            for line in sys.stdin:
+                path = line.strip()
+                if path:
+                    yield path
+        elif os.path.isdir(src):
+            for root, dirs, files in os.walk(src):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(RESUME_EXTS):
+                        yield os.path.join(root, name)
+        else:
+            yield src
+
+
+class TopK:
+    """Keeps the k best rows with a min-heap; ties favour earlier files."""
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+
+    def push(self, row):
+        item = (row["score"], -self._seq, row)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def rows(self):
+        return [row for _, _, row in sorted(self._heap, key=lambda x: x[:2], reverse=True)]
+
+
+def score_profile(profile, jd_profiles):
+    """One compact row per JD; the profile's raw text is not kept."""
+    rows = {}
+    for jd_name, jd_profile in jd_profiles.items():
+        result = jd_profile.score(profile.get("raw_text", ""), weighted=False)
+        row = result_entry(profile, result["score"], result["matched"])
+        row.pop("content_hash", None)
+        rows[jd_name] = row
+    return rows
+
+
+def read_checkpoint(path, heaps, scored=None, dedup=None):
+    """
+    Replays a checkpoint into the heaps; returns the set of done paths.
+    scored: optional set that receives the done paths that were scored.
+    dedup: optional Deduplicator that gets back the signatures of the
+    originals scored before, so their later copies are still caught.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    valid = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # torn last line from a crash
+            if not line.endswith(b"\n"):
+                break
+            valid += len(line)
+            done.add(entry["file"])
+            if scored is not None and "rows" in entry:
+                scored.add(entry["file"])
+            if dedup is not None and entry.get("signature"):
+                dedup.add(entry["file"], np.frombuffer(bytes.fromhex(entry["signature"]), dtype=np.uint32))
+                # copies only need duplicate_of from parse_resumes, not the fields
+                dedup.remember(entry["file"], {"file_path": entry["file"]})
+            for jd_name, row in (entry.get("rows") or {}).items():
+                if jd_name in heaps:
+                    heaps[jd_name].push(row)
+    with open(path, "r+b") as f:
+        f.truncate(valid)
+    return done
 
-    for filename in os.listdir(resumes_folder):
-        if filename.lower().endswith(('.pdf', '.docx')):
-            filepath = os.path.join(resumes_folder, filename)
-            print(f"Parsing: {filename}")
-            text = parser.parse_resume(filepath)
-            score = matcher.match_score(text)
-            results.append({'FileName': filename, 'Score': score})
 
-    exporter = CSVExporter()
-    exporter.export_to_csv(results, output_csv)
-    print(f"\nRanking complete. Results saved to {output_csv}")
+def default_checkpoint(jd_keywords, skills_list, dedup=False, skill_ner=False):
+    """
+    One checkpoint per JD/skills/--dedup/--skill-ner setup, so runs never
+    replay rows produced under another setting.
+    """
+    key = json.dumps([jd_keywords, skills_list, bool(dedup), bool(skill_ner)], sort_keys=True).encode("utf-8")
+    return os.path.join(CHECKPOINT_DIR, f"main_checkpoint_{hashlib.sha1(key).hexdigest()[:12]}.jsonl")
+
+
+def output_path(out_dir, jd_name, n_jds, fmt="csv"):
+    if n_jds == 1:
+        return os.path.join(out_dir, f"ranked_candidates.{fmt}")
+    return os.path.join(out_dir, f"ranked_candidates_{jd_name}.{fmt}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rank resumes against one or more job descriptions")
+    ap.add_argument("inputs", nargs="*", default=["resumes/"],
+                    help="resume directories/files, or '-' to read paths from stdin")
+    ap.add_argument("--jd", action="append", help="job description text file (repeatable)")
+    ap.add_argument("--skills", help="skills list file (one per line)")
+    ap.add_argument("--top-n-keywords", type=int, default=15)
+    ap.add_argument("--top-k", type=int, default=50, help="candidates kept per JD")
+    ap.add_argument("--workers", type=int, default=None, help="parser processes (default: all cores)")
+    ap.add_argument("--batch-size", type=int, default=16, help="resumes per worker task / nlp.pipe call")
+    ap.add_argument("--skill-ner", action="store_true",
+                    help="also run ORG/PRODUCT NER for skills (slower; the token scan finds the same skills)")
+    ap.add_argument("--dedup", action="store_true",
+                    help="skip near-duplicate resumes (edited re-sends) instead of parsing and scoring them")
+    ap.add_argument("--out", default=".", help="output directory for result files")
+    ap.add_argument("--format", choices=EXPORT_FORMATS, default="csv",
+                    help="result file format (parquet needs pyarrow, xlsx needs openpyxl)")
+    ap.add_argument("--combined", action="store_true",
+                    help="write every JD into one ranked_candidates_all file with a jd column")
+    ap.add_argument("--checkpoint", help="progress file (default: derived from the JDs and skills)")
+    ap.add_argument("--fresh", action="store_true", help="ignore and overwrite an existing checkpoint")
+    ap.add_argument("--metrics", help="write a per-stage performance report (JSON) here")
+    ap.add_argument("--index", help="also add scored resumes to this inverted index (.npz), created if missing")
+    args = ap.parse_args(argv)
+
+    try:
+        check_format(args.format)
+    except RuntimeError as e:
+        sys.exit(f"[main] {e}")
+
+    jd_files = args.jd or ["job_description.txt"]
+    jd_profiles = {}
+    for path in jd_files:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            jd_profiles[name] = JobProfile.from_text(load_job_description(path), top_n=args.top_n_keywords)
+        except ValueError as e:
+            sys.exit(f"[main] No usable keywords in {path}: {e}")
+        print(f"{name}: {', '.join(jd_profiles[name].keywords)}")
+    jd_keywords = {name: p.keywords for name, p in jd_profiles.items()}
+
+    skills_list = None
+    if args.skills:
+        with open(args.skills, "r", encoding="utf-8") as f:
+            skills_list = [line.strip() for line in f if line.strip()]
+
+    if args.metrics:
+        instrumentation.enable()
+
+    heaps = {name: TopK(args.top_k) for name in jd_keywords}
+    args.checkpoint = args.checkpoint or default_checkpoint(jd_keywords, skills_list, args.dedup, args.skill_ner)
+    if args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    scored_before = set()
+    dedup = Deduplicator() if args.dedup else None
+    done = read_checkpoint(args.checkpoint, heaps, scored_before, dedup)
+    if done:
+        print(f"Resuming: {len(done)} files already processed")
+
+    if os.path.dirname(args.checkpoint):
+        os.makedirs(os.path.dirname(args.checkpoint), exist_ok=True)
+    todo = (p for p in iter_resume_paths(args.inputs) if p not in done)
+    parsed = failed = duplicates = 0
+    index = None
+    if args.index:
+        index = InvertedIndex.load(args.index) if os.path.exists(args.index) else InvertedIndex()
+    with open(args.checkpoint, "a", encoding="utf-8") as ckpt:
+        for path, profile, error in parse_resumes(todo, skills_list, workers=args.workers,
+                                                   batch_size=args.batch_size, skill_ner=args.skill_ner,
+                                                   dedup=dedup):
+            if error:
+                failed += 1
+                print(f"Failed: {path}: {error}")
+                entry = {"file": path, "error": error}
+            elif profile.get("duplicate_of"):
+                duplicates += 1
+                print(f"Duplicate: {path} ~ {profile['duplicate_of']} ({profile['similarity']:.0%})")
+                entry = {"file": path, "duplicate_of": profile["duplicate_of"]}
+            else:
+                parsed += 1
+                profile["orig_filename"] = os.path.basename(path)
+                rows = score_profile(profile, jd_profiles)
+                for jd_name, row in rows.items():
+                    heaps[jd_name].push(row)
+                if index is not None:
+                    index.add(path, profile.get("raw_text", ""))
+                entry = {"file": path, "rows": rows}
+                if dedup is not None and path in dedup.index:
+                    entry["signature"] = dedup.index.signatures[path].tobytes().hex()
+                print(f"Parsed: {path}")
+            ckpt.write(json.dumps(entry) + "\n")
+            ckpt.flush()
+
+    if index is not None:
+        # files scored before an interruption: the index was not saved then
+        for path in sorted(scored_before):
+            if path not in index:
+                try:
+                    index.add(path, extract_text_from_file(path))
+                except Exception as e:
+                    print(f"[main] not indexed: {path}: {e}")
+        if os.path.dirname(args.index):
+            os.makedirs(os.path.dirname(args.index), exist_ok=True)
+        index.save(args.index)
+        print(f"Index: {len(index)} resumes in {args.index}")
+
+    os.makedirs(args.out, exist_ok=True)
+    if args.combined:
+        out = os.path.join(args.out, f"ranked_candidates_all.{args.format}")
+        export_results(iter_combined({name: heap.rows() for name, heap in heaps.items()}), out, args.format)
+        print(f"{len(heaps)} JDs saved to {out}")
+    else:
+        for jd_name, heap in heaps.items():
+            out = output_path(args.out, jd_name, len(heaps), args.format)
+            export_results(heap.rows(), out, args.format)
+            print(f"{jd_name}: top {len(heap.rows())} saved to {out}")
+    # finished cleanly: the next run starts fresh
+    os.remove(args.checkpoint)
+    print(f"\nRanking complete. {parsed} parsed, {failed} failed, {duplicates} near-duplicates skipped, "
+          f"{len(done)} from checkpoint.")
+
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            json.dump(instrumentation.report(), f, indent=2)
+        print(f"Performance report saved to {args.metrics}")
+
 
 if __name__ == "__main__":
     main()
-
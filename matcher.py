@@ -4,55 +4,76 @@ import os
 from collections import Counter
 from typing import List, Dict
 import numpy as np
+import instrumentation
+from term_matcher import compile_terms
 
 def normalize_term(t: str):
     return re.sub(r"[^a-z0-9\s\+]", "", t.lower()).strip()
 
-def compute_keyword_match_score(resume_text: str, jd_keywords: List[str], weights: Dict[str, float] = None):
+def prepare_keywords(jd_keywords: List[str]):
+    """
+    Normalizes a JD keyword list once and compiles its matcher, so scoring
+    many resumes against the same list does not redo this per resume.
+    Returns (normalized keywords, TermMatcher).
+    """
+    kw_norms = [normalize_term(kw) for kw in jd_keywords]
+    return kw_norms, compile_terms(tuple(n for n in kw_norms if n))
+
+def compute_keyword_match_score(resume_text: str, jd_keywords: List[str], weights: Dict[str, float] = None, prepared=None):
     """
     Compute ATS score:
     - Weighted score if weights provided, else simple % match.
+    - prepared: optional prepare_keywords(jd_keywords) result to reuse.
     """
-    resume_text_low = resume_text.lower()
     total_keywords = len(jd_keywords)
     if total_keywords == 0:
         return {"score": 0.0, "matched": [], "total": 0}
 
+    kw_norms, kw_matcher = prepared or prepare_keywords(jd_keywords)
+    found = kw_matcher.find(resume_text)
+
     matched = []
     weighted_numer = 0.0
     total_weight = 0.0
 
-    for kw in jd_keywords:
-        kw_norm = normalize_term(kw)
+    for kw, kw_norm in zip(jd_keywords, kw_norms):
         weight = 1.0 if not weights else float(weights.get(kw, 1.0))
         total_weight += weight
-        if kw_norm and kw_norm in resume_text_low:
+        if kw_norm in found:
             matched.append(kw)
             weighted_numer += weight
 
     score = (weighted_numer / total_weight * 100) if total_weight else (len(matched)/total_keywords*100)
     return {"score": round(score,2), "matched": matched, "total": total_keywords}
 
+def result_entry(prof: dict, score: float, matched: List[str]):
+    """
+    One ranked-table row for a parsed profile.
+    """
+    return {
+        "name": os.path.splitext(prof.get("orig_filename", "Unknown File"))[0],
+        "email": prof.get("email"),
+        "phone": prof.get("phone"),
+        "education": prof.get("education"),
+        "experience_years": prof.get("experience_years"),
+        "skills": prof.get("skills"),
+        "score": score,
+        "matched_keywords": matched,
+        "file_path": prof.get("file_path"),
+        "content_hash": prof.get("content_hash")
+    }
+
+@instrumentation.timed()
 def aggregate_scores_for_jd(resumes: List[dict], jd_keywords: List[str], weights: Dict[str,float] = None):
     """
     Aggregate ATS scores for multiple resumes and sort.
     """
     results = []
+    prepared = prepare_keywords(jd_keywords)
     for prof in resumes:
         res_text = prof.get("raw_text", "")
-        result = compute_keyword_match_score(res_text, jd_keywords, weights)
-        entry = {
-            "name": os.path.splitext(prof.get("orig_filename", "Unknown File"))[0],
-            "email": prof.get("email"),
-            "phone": prof.get("phone"),
-            "education": prof.get("education"),
-            "experience_years": prof.get("experience_years"),
-            "skills": prof.get("skills"),
-            "score": result["score"],
-            "matched_keywords": result["matched"],
-            "file_path": prof.get("file_path")
-        }
-        results.append(entry)
+        result = compute_keyword_match_score(res_text, jd_keywords, weights, prepared)
+        results.append(result_entry(prof, result["score"], result["matched"]))
 
     results_sorted = sorted(results, key=lambda x: x["score"], reverse=True)
     return results_sorted
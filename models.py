@@ -0,0 +1,77 @@
+# models.py
+import os
+import time
+from functools import lru_cache
+
+# Small CPU-friendly model shared by KeyBERT and semantic matching. Point
+# RESUME_EMBED_MODEL at a local directory (e.g. a saved copy of the model)
+# to run fully offline.
+DEFAULT_EMBED_MODEL = os.environ.get("RESUME_EMBED_MODEL", "all-MiniLM-L6-v2")
+
+# Components en_core_web_sm ships with that name/skill NER never uses
+SPACY_DISABLED = ["parser", "lemmatizer"]
+
+# model name -> seconds spent loading it in this process
+LOAD_TIMES = {}
+_PROCESS_START = time.perf_counter()
+
+
+def _timed_load(name, loader):
+    start = time.perf_counter()
+    model = loader()
+    LOAD_TIMES[name] = round(time.perf_counter() - start, 3)
+    return model
+
+
+# ---------------- SAFE SPACY LOADER ----------------
+@lru_cache(maxsize=None)
+def get_nlp():
+    """
+    Loads spaCy model on first use, safely for:
+    - Local machine
+    - Streamlit Cloud
+    """
+    def _load():
+        import spacy
+        try:
+            return spacy.load("en_core_web_sm", disable=SPACY_DISABLED)
+        except OSError:
+            from spacy.cli import download
+            print("[models] spaCy model not found. Downloading...")
+            download("en_core_web_sm")
+            return spacy.load("en_core_web_sm", disable=SPACY_DISABLED)
+
+    return _timed_load("spacy:en_core_web_sm", _load)
+
+
+@lru_cache(maxsize=None)
+def get_sentence_model(model_name: str = DEFAULT_EMBED_MODEL):
+    def _load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device="cpu")
+
+    return _timed_load(f"sentence-transformers:{model_name}", _load)
+
+
+@lru_cache(maxsize=None)
+def get_keybert():
+    """KeyBERT over the shared sentence model, or None if unavailable."""
+    def _load():
+        from keybert import KeyBERT
+        return KeyBERT(model=get_sentence_model())
+
+    try:
+        return _timed_load("keybert", _load)
+    except Exception as e:
+        print(f"[models] KeyBERT unavailable: {e}")
+        return None
+# --------------------------------------------------
+
+
+def startup_report() -> dict:
+    """Seconds since this module was imported and per-model load times."""
+    return {
+        "uptime_s": round(time.perf_counter() - _PROCESS_START, 3),
+        "model_load_s": dict(LOAD_TIMES),
+        "total_model_load_s": round(sum(LOAD_TIMES.values()), 3),
+    }
@@ -1,108 +1,107 @@
 # parser.py
+import io
 import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
 import docx
-import spacy
-from spacy.cli import download
-from pdfminer.high_level import extract_text
 from datetime import datetime
+import instrumentation
+from models import get_nlp
+from pdf_extract import extract_pdf_text
+from field_extractor import extract_fields
+from term_matcher import compile_terms
 
+BytesLike = (bytes, bytearray, memoryview)
 
-# ---------------- SAFE SPACY LOADER ----------------
-def load_spacy_model():
-    """
-    Loads spaCy model safely for:
-    - Local machine
-    - Streamlit Cloud
-    """
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        print("[parser] spaCy model not found. Downloading...")
-        download("en_core_web_sm")
-        return spacy.load("en_core_web_sm")
-
+# NER input: the name is looked for in the first NAME_WINDOW characters;
+# skill NER (off unless SKILL_NER / skill_ner=True) reads up to NER_MAX_CHARS
+NAME_WINDOW = 500
+NER_MAX_CHARS = 20_000
+SKILL_NER = os.environ.get("RESUME_SKILL_NER", "") not in ("", "0")
+NER_BATCH_SIZE = 16
 
-nlp = load_spacy_model()
-# --------------------------------------------------
 
-
-def extract_text_from_pdf(filepath: str) -> str:
+@instrumentation.timed()
+def extract_text_from_pdf(source) -> str:
+    """
+    PyMuPDF with pdfminer fallback, bounded by the page/char/timeout limits
+    in pdf_extract. source: path, bytes/memoryview or binary file object.
+    """
     try:
-        return extract_text(filepath)
+        return extract_pdf_text(source)
     except Exception as e:
         print(f"[parser] PDF extraction failed: {e}")
+        instrumentation.count("errors")
         return ""
 
 
-def extract_text_from_docx(filepath: str) -> str:
+@instrumentation.timed()
+def extract_text_from_docx(source) -> str:
+    """source: path, bytes/memoryview or binary file object."""
     try:
-        doc = docx.Document(filepath)
+        if isinstance(source, BytesLike):
+            source = io.BytesIO(source)
+        doc = docx.Document(source)
         return "\n".join(p.text for p in doc.paragraphs)
     except Exception as e:
         print(f"[parser] DOCX extraction failed: {e}")
+        instrumentation.count("errors")
         return ""
 
 
+@instrumentation.timed()
 def extract_email(text: str):
-    match = re.search(
-        r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
-        text
-    )
-    return match.group(0) if match else None
+    emails = extract_fields(text).emails
+    return emails[0] if emails else None
 
 
+@instrumentation.timed()
 def extract_phone(text: str):
-    match = re.search(
-        r"(\+?\d{1,3}[-.\s]?)?\d{10}",
-        text
-    )
-    return match.group(0) if match else None
+    phones = extract_fields(text).phones
+    return phones[0] if phones else None
 
 
-def extract_name(text: str):
+@instrumentation.timed()
+def extract_name(text: str, doc=None):
     """
-    Uses spaCy NER to extract candidate name
+    Uses spaCy NER to extract candidate name. doc: a shared ner_doc() of
+    this text, so the name and skill steps run the model once.
     """
-    doc = nlp(text[:500])
+    if doc is None:
+        doc = get_nlp()(text[:NAME_WINDOW])
     for ent in doc.ents:
+        if ent.start_char >= NAME_WINDOW:
+            break
         if ent.label_ == "PERSON":
             return ent.text
     return None
 
 
+@instrumentation.timed()
 def extract_education(text: str):
-    edu_keywords = [
-        "bachelor", "master", "phd",
-        "b.tech", "m.tech", "bsc", "msc",
-        "mba", "degree", "diploma"
-    ]
-    lines = text.split("\n")
-    return [
-        line.strip()
-        for line in lines
-        if any(k in line.lower() for k in edu_keywords)
-    ]
+    return list(extract_fields(text).education)
 
 
+@instrumentation.timed()
 def extract_experience_years(text: str):
-    matches = re.findall(r"(\d{1,2})\+?\s*year", text.lower())
-    return max(map(int, matches), default=0)
+    return max(extract_fields(text).years, default=0)
 
 
-def extract_skills(text: str, skills_list=None):
+@instrumentation.timed()
+def extract_skills(text: str, skills_list=None, doc=None, skill_ner=None):
     """
     Hybrid Skill Extraction:
     - Keyword matching
-    - NLP enrichment
+    - NLP enrichment (only without a skills list, and only if skill_ner,
+      default SKILL_NER): ORG/PRODUCT entities are kept only when they
+      spell a common skill, which the token scan has already found.
     """
     skills_found = set()
     text_lower = text.lower()
 
     if skills_list:
-        for skill in skills_list:
-            if skill.lower() in text_lower:
-                skills_found.add(skill)
+        skills_found.update(compile_terms(tuple(skills_list)).find(text_lower, lowered=True))
     else:
         tokens = re.findall(r"[A-Za-z\+\#]{2,}", text_lower)
         common_skills = {
@@ -114,7 +113,10 @@ def extract_skills(text: str, skills_list=None):
         skills_found.update(t for t in tokens if t in common_skills)
 
         # NLP enrichment
-        doc = nlp(text)
+        if not (SKILL_NER if skill_ner is None else skill_ner):
+            return sorted(skills_found)
+        if doc is None:
+            doc = get_nlp()(text[:NER_MAX_CHARS])
         for ent in doc.ents:
             if ent.label_ in ["ORG", "PRODUCT"]:
                 if ent.text.lower() in common_skills:
@@ -123,30 +125,401 @@ def extract_skills(text: str, skills_list=None):
     return sorted(skills_found)
 
 
-def parse_resume(filepath: str, skills_list=None):
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"File not found: {filepath}")
+@instrumentation.timed()
+def extract_text_from_file(source, filename: str = None) -> str:
+    """
+    source: file path, or in-memory bytes/memoryview/file object together
+    with its original filename (used only for the extension). In-memory
+    sources never touch the disk.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        filename = filename or os.fspath(source)
+        instrumentation.count("bytes_read", os.path.getsize(source))
+    elif not filename:
+        raise ValueError("filename is required for in-memory resumes")
+    elif isinstance(source, BytesLike):
+        instrumentation.count("bytes_read", len(source))
 
-    ext = os.path.splitext(filepath)[1].lower()
+    ext = os.path.splitext(filename)[1].lower()
 
     if ext == ".pdf":
-        text = extract_text_from_pdf(filepath)
+        return extract_text_from_pdf(source)
     elif ext in [".docx", ".doc"]:
-        text = extract_text_from_docx(filepath)
+        return extract_text_from_docx(source)
     elif ext == ".txt":
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+        if isinstance(source, BytesLike):
+            return bytes(source).decode("utf-8", errors="ignore")
+        if hasattr(source, "read"):
+            return source.read().decode("utf-8", errors="ignore")
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
     else:
         raise ValueError(f"Unsupported file format: {ext}")
 
+
+def ner_window(text: str, skills_list=None, skill_ner=None) -> str:
+    """
+    The part of a resume NER has to see: the name window, or up to
+    NER_MAX_CHARS when skill NER will read the same doc.
+    """
+    if not skills_list and (SKILL_NER if skill_ner is None else skill_ner):
+        return text[:NER_MAX_CHARS]
+    return text[:NAME_WINDOW]
+
+
+@instrumentation.timed()
+def parse_resume(source, skills_list=None, filename: str = None, skill_ner=None):
+    """
+    source: file path, or bytes/memoryview/file object plus filename.
+    """
+    label = filename or source
+    with instrumentation.file_context(label):
+        try:
+            text = _extract(source, filename)
+            doc = get_nlp()(ner_window(text, skills_list, skill_ner))
+            return _build_profile(source, text, doc, skills_list, filename, skill_ner)
+        except Exception:
+            instrumentation.count("errors")
+            raise
+
+
+def _extract(source, filename: str = None) -> str:
+    text = extract_text_from_file(source, filename)
+    instrumentation.count("chars", len(text))
+    # one scan for every regex field; the extract_* calls below reuse it
+    with instrumentation.stage("extract_fields"):
+        extract_fields(text)
+    return text
+
+
+def _build_profile(source, text, doc, skills_list=None, filename: str = None, skill_ner=None):
     return {
-        "file_path": filepath,
-        "name": extract_name(text),
+        "file_path": filename or source,
+        "name": extract_name(text, doc),
         "email": extract_email(text),
         "phone": extract_phone(text),
         "education": extract_education(text),
         "experience_years": extract_experience_years(text),
-        "skills": extract_skills(text, skills_list),
+        "skills": extract_skills(text, skills_list, doc, skill_ner),
         "raw_text": text,
         "parsed_at": datetime.now().isoformat()
     }
+
+
+# ---------------- BATCH PARSING ----------------
+def _item_args(item):
+    """(key, source, filename) for a path or a (filename, data) pair."""
+    if isinstance(item, tuple):
+        return item[0], item[1], item[0]
+    return item, item, None
+
+
+def _ner_docs(texts, batch_size, n_process):
+    """nlp.pipe over a batch; falls back to one call per text if it fails."""
+    nlp = get_nlp()
+    with instrumentation.stage("ner_pipe"):
+        try:
+            return list(nlp.pipe(texts, batch_size=batch_size, n_process=n_process))
+        except Exception:
+            docs = []
+            for text in texts:
+                try:
+                    docs.append(nlp(text))
+                except Exception as e:
+                    docs.append(e)
+            return docs
+
+
+def _parse_batch(items, skills_list=None, metrics=False, batch_size=NER_BATCH_SIZE,
+                 n_process=1, skill_ner=None):
+    """
+    Worker entry point for a list of items: text and regex fields per
+    file, one nlp.pipe over the batch's NER windows, then the profiles.
+    Returns ([(key, profile, error)], metrics) so one bad file never
+    raises out of the pool; metrics is the batch's instrumentation
+    snapshot when collection is on in the parent.
+    """
+    if metrics:
+        instrumentation.enable()
+        instrumentation.reset()
+    results, staged = [], []
+    for key, label, filename, text, error in _extract_items(items):
+        if error:
+            results.append((key, None, error))
+        else:
+            staged.append((key, label, filename, text))
+            results.append(None)  # filled in item order below
+    parsed = iter(_profiles_from_texts(staged, skills_list, batch_size, n_process, skill_ner))
+    results = [r if r is not None else next(parsed) for r in results]
+    return results, instrumentation.snapshot() if metrics else None
+
+
+def _extract_items(items):
+    """(key, label, filename, text, error) per item; label is what file_path reports."""
+    for item in items:
+        key, source, filename = _item_args(item)
+        with instrumentation.file_context(filename or source):
+            try:
+                yield key, filename or source, filename, _extract(source, filename), None
+            except Exception as e:
+                instrumentation.count("errors")
+                yield key, filename or source, filename, None, f"{type(e).__name__}: {e}"
+
+
+def _profiles_from_texts(staged, skills_list, batch_size, n_process, skill_ner):
+    """NER and profiles for extracted (key, label, filename, text) tuples."""
+    results = []
+    docs = _ner_docs([ner_window(text, skills_list, skill_ner) for *_, text in staged], batch_size, n_process)
+    for (key, label, filename, text), doc in zip(staged, docs):
+        with instrumentation.file_context(label):
+            try:
+                if isinstance(doc, Exception):
+                    raise doc
+                profile = _build_profile(label, text, doc, skills_list, filename, skill_ner)
+                results.append((key, profile, None))
+            except Exception as e:
+                instrumentation.count("errors")
+                results.append((key, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _extract_batch(items, hasher, metrics=False):
+    """Dedup stage one: text and MinHash signature per item, no NER."""
+    if metrics:
+        instrumentation.enable()
+        instrumentation.reset()
+    results = []
+    for key, label, filename, text, error in _extract_items(items):
+        sig = None
+        if error is None:
+            with instrumentation.stage("minhash"):
+                sig = hasher.signature(text)
+        results.append((key, label, filename, text, sig, error))
+    return results, instrumentation.snapshot() if metrics else None
+
+
+def _profile_batch(staged, skills_list=None, metrics=False, batch_size=NER_BATCH_SIZE,
+                   n_process=1, skill_ner=None):
+    """Dedup stage two: NER and profiles for texts that are no one's copy."""
+    if metrics:
+        instrumentation.enable()
+        instrumentation.reset()
+    results = _profiles_from_texts(staged, skills_list, batch_size, n_process, skill_ner)
+    return results, instrumentation.snapshot() if metrics else None
+
+
+def _duplicate_profile(original, orig_key, label, text, similarity):
+    """
+    A duplicate's profile: the original's fields, its own file, text and
+    contact details. Email and phone are read from its own text (regex
+    only); the name is kept only if it appears where NER would look,
+    since finding another one would take the NER pass a copy skips.
+    """
+    name = original.get("name")
+    if name and name not in text[:NAME_WINDOW]:
+        name = None
+    profile = dict(original)
+    profile.update(file_path=label, name=name, email=extract_email(text), phone=extract_phone(text),
+                   raw_text=text, parsed_at=datetime.now().isoformat(),
+                   duplicate_of=orig_key, similarity=round(similarity, 3))
+    return profile
+
+
+def _collect(result):
+    """Merges a worker's metrics and returns its result tuples."""
+    if result[1] is not None:
+        instrumentation.merge(result[1])
+    return result[0]
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_resumes(items, skills_list=None, workers=None, max_pending=None, executor="process",
+                  batch_size=NER_BATCH_SIZE, n_process=1, skill_ner=None, pool=None, dedup=None):
+    """
+    Parses many resumes over a worker pool.
+
+    - items: file paths and/or in-memory (filename, data) pairs, where
+      data is bytes, a memoryview (e.g. UploadedFile.getbuffer()) or a
+      binary file object.
+    - Yields (key, profile, error) tuples in item order, batch by batch
+      as they finish, so callers can update progress while the run goes
+      on. key is the path, or the filename for in-memory items.
+    - Exactly one of profile/error is None for every file.
+    - executor="process" uses a process pool (in-memory data is pickled
+      to the workers, so pass bytes); "thread" shares memory with the
+      caller, so memoryviews are read without a copy.
+    - Each task is a batch of up to batch_size files whose NER windows go
+      through one nlp.pipe call (smaller if items is a list too short to
+      keep every worker busy). n_process is passed to nlp.pipe; use it
+      with workers <= 1, where batches run in the current process.
+    - skill_ner: run ORG/PRODUCT skill NER (default SKILL_NER); when off,
+      NER only sees the first NAME_WINDOW characters.
+    - spaCy is loaded lazily and cached, so once per worker process
+      rather than once per file.
+    - At most max_pending batches are in flight (default: 2 per worker),
+      so items can be a lazy iterable of any length.
+    - pool: an executor to reuse instead of starting one (a long-lived
+      process pool keeps its workers' models loaded between calls); it
+      is left running. workers should then match its size.
+    - dedup: a dedup.Deduplicator. Text is extracted and MinHashed
+      first; a near-duplicate of a resume already seen (in this call or
+      an earlier one with the same Deduplicator) skips NER and gets a
+      copy of that resume's profile with "duplicate_of" (the original's
+      key) and "similarity" set, but its own email, phone and name
+      (see _duplicate_profile). The original is the earliest item of
+      its group, however the workers finish.
+    """
+    workers = workers or os.cpu_count() or 1
+    if hasattr(items, "__len__"):
+        batch_size = max(1, min(batch_size, -(-len(items) // workers)))
+    options = dict(batch_size=batch_size, n_process=n_process, skill_ner=skill_ner)
+
+    if dedup is not None:
+        if pool is None and workers <= 1:
+            yield from _run_deduped(_InlineExecutor(), items, skills_list, options, dedup, 1, 1, False)
+        elif pool is not None:
+            yield from _run_deduped(pool, items, skills_list, options, dedup, workers, max_pending,
+                                    isinstance(pool, ProcessPoolExecutor))
+        else:
+            pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            with pool_cls(max_workers=workers) as pool:
+                yield from _run_deduped(pool, items, skills_list, options, dedup, workers, max_pending,
+                                        executor == "process")
+        return
+
+    if workers <= 1 and pool is None:
+        for batch in _batches(items, batch_size):
+            yield from _parse_batch(batch, skills_list, **options)[0]
+        return
+
+    if pool is not None:
+        yield from _run_batches(pool, items, skills_list, options, workers, max_pending,
+                                isinstance(pool, ProcessPoolExecutor))
+        return
+    pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        yield from _run_batches(pool, items, skills_list, options, workers, max_pending,
+                                executor == "process")
+
+
+def _run_batches(pool, items, skills_list, options, workers, max_pending, processes):
+    # threads record straight into this run's collector; processes ship snapshots back
+    metrics = instrumentation.is_enabled() and processes
+    parse_batch = _parse_batch if processes else instrumentation.bind(_parse_batch)
+    max_pending = max_pending or workers * 2
+    # batches are yielded in submission order; later ones keep running meanwhile
+    pending = deque()
+    for batch in _batches(items, options["batch_size"]):
+        pending.append(pool.submit(parse_batch, batch, skills_list, metrics, **options))
+        if len(pending) >= max_pending:
+            yield from _collect(pending.popleft().result())
+    while pending:
+        yield from _collect(pending.popleft().result())
+
+
+class _InlineExecutor:
+    """Runs each submitted call at once, for the dedup pipeline without workers."""
+
+    def submit(self, fn, *args, **kwargs):
+        fut = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+
+def _run_deduped(pool, items, skills_list, options, dedup, workers, max_pending, processes):
+    """
+    Two task kinds on one pool: extraction batches (text + signature)
+    come back here, where the LSH index decides which texts go on to NER
+    batches and which are copies. A copy waits for its original's
+    profile; if the original fails, the copies are parsed instead.
+    Extraction results are matched in item order, whichever batch
+    finishes first, so the original of a group is always its earliest
+    item.
+    """
+    metrics = instrumentation.is_enabled() and processes
+    extract_batch, profile_batch = _extract_batch, _profile_batch
+    if not processes:
+        extract_batch, profile_batch = instrumentation.bind(_extract_batch), instrumentation.bind(_profile_batch)
+    max_pending = max_pending or workers * 2
+    batch_size = options["batch_size"]
+    batches = _batches(items, batch_size)
+    pending = {}  # future -> extraction batch number, or None for NER batches
+    ready = {}  # finished extraction batches waiting for an earlier one
+    next_batch = submitted = 0
+    ner_queue, waiting = [], {}
+    exhausted = False
+
+    def finish_copies(orig_key, profile):
+        for key, label, filename, text, sim in waiting.pop(orig_key, ()):
+            if profile is None:
+                ner_queue.append((key, label, filename, text))
+            else:
+                yield key, _duplicate_profile(profile, orig_key, label, text, sim), None
+
+    while True:
+        # buffered batches count too, so one slow batch cannot let the buffer grow
+        while not exhausted and len(pending) + len(ready) < max_pending:
+            batch = next(batches, None)
+            if batch is None:
+                exhausted = True
+            else:
+                pending[pool.submit(extract_batch, batch, dedup.hasher, metrics)] = submitted
+                submitted += 1
+        while ner_queue and (exhausted or len(ner_queue) >= batch_size):
+            staged, ner_queue[:] = ner_queue[:batch_size], ner_queue[batch_size:]
+            pending[pool.submit(profile_batch, staged, skills_list, metrics, **options)] = None
+        if not pending:
+            if not waiting:
+                return
+            # originals from an earlier, abandoned call: parse their copies
+            for orig_key in list(waiting):
+                yield from finish_copies(orig_key, None)
+            continue
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        extracted = []
+        for fut in done:
+            batch_no = pending.pop(fut)
+            if batch_no is not None:
+                ready[batch_no] = _collect(fut.result())
+                continue
+            for key, profile, error in _collect(fut.result()):
+                yield key, profile, error
+                if profile is None:
+                    dedup.discard(key)
+                else:
+                    dedup.remember(key, profile)
+                yield from finish_copies(key, profile)
+        while next_batch in ready:
+            extracted.extend(ready.pop(next_batch))
+            next_batch += 1
+        for key, label, filename, text, sig, error in extracted:
+            if error:
+                yield key, None, error
+                continue
+            found = dedup.match(sig)
+            if found is None:
+                dedup.add(key, sig)
+                ner_queue.append((key, label, filename, text))
+                continue
+            orig_key, sim = found
+            instrumentation.count("duplicates")
+            if orig_key in dedup.profiles:
+                yield key, _duplicate_profile(dedup.profiles[orig_key], orig_key, label, text, sim), None
+            else:
+                waiting.setdefault(orig_key, []).append((key, label, filename, text, sim))
@@ -0,0 +1,157 @@
+# pdf_extract.py
+import io
+import queue
+import threading
+import time
+from typing import Iterator, Optional
+
+# Resumes are a few pages; anything far beyond that is a portfolio or a
+# scan and only costs time and memory.
+MAX_PAGES = 20
+MAX_CHARS = 100_000
+TIMEOUT_S = 15.0
+
+# Tried in order; the first one that imports and opens the file wins.
+DEFAULT_BACKENDS = ("pymupdf", "pdfminer")
+
+
+class PDFTimeout(Exception):
+    pass
+
+
+def _as_stream(source):
+    """pdfminer wants a path or binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _pages_pymupdf(source) -> Iterator[str]:
+    import fitz
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        doc = fitz.open(stream=bytes(source), filetype="pdf")
+    elif hasattr(source, "read"):
+        doc = fitz.open(stream=source.read(), filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def _pages_pdfminer(source) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for layout in extract_pages(_as_stream(source)):
+        yield "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+
+
+_BACKENDS = {
+    "pymupdf": _pages_pymupdf,
+    "pdfminer": _pages_pdfminer,
+}
+
+
+def _iter_backend_pages(source, backends, max_pages: Optional[int]) -> Iterator[str]:
+    last_error = None
+    for name in backends:
+        pages = _BACKENDS[name](source)
+        try:
+            first = next(pages, None)
+        except Exception as e:
+            last_error = e
+            if hasattr(source, "seek"):
+                source.seek(0)
+            continue
+        if first is None:
+            return
+        yield first
+        count = 1
+        for text in pages:
+            if max_pages and count >= max_pages:
+                break
+            yield text
+            count += 1
+        pages.close()
+        return
+    if last_error is not None:
+        raise last_error
+
+
+_DONE = object()
+
+
+def iter_pdf_pages(source, backends=DEFAULT_BACKENDS, max_pages: Optional[int] = MAX_PAGES,
+                   timeout: Optional[float] = TIMEOUT_S) -> Iterator[str]:
+    """
+    Yields the text of each page, one at a time.
+
+    - source: file path, bytes or binary file object
+    - Falls back to the next backend if one is missing or cannot open
+      the file (before any page has been yielded).
+    - Stops after max_pages pages; raises PDFTimeout once timeout seconds
+      have passed. With a timeout, pages are extracted on a helper thread
+      so a single slow page cannot hold the caller past the deadline;
+      pages finished before it are still yielded first. The abandoned
+      thread stops after the page it is on.
+    """
+    if not timeout:
+        yield from _iter_backend_pages(source, backends, max_pages)
+        return
+    pages: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for text in _iter_backend_pages(source, backends, max_pages):
+                if stop.is_set():
+                    return
+                pages.put((text, None))
+            pages.put((_DONE, None))
+        except Exception as e:
+            pages.put((None, e))
+
+    threading.Thread(target=produce, name="pdf-extract", daemon=True).start()
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                text, error = pages.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise PDFTimeout(f"PDF extraction exceeded {timeout}s") from None
+            if error is not None:
+                raise error
+            if text is _DONE:
+                return
+            yield text
+    finally:
+        stop.set()
+
+
+def extract_pdf_text(source, backends=DEFAULT_BACKENDS, max_pages: Optional[int] = MAX_PAGES,
+                     max_chars: Optional[int] = MAX_CHARS, timeout: Optional[float] = TIMEOUT_S) -> str:
+    """
+    Page-bounded text extraction. Stops early at max_chars, and returns
+    whatever was read so far if the timeout is hit or the backend fails
+    partway through the document; a failure before the first page raises.
+    """
+    parts, total = [], 0
+    pages = iter_pdf_pages(source, backends, max_pages, timeout)
+    try:
+        for text in pages:
+            parts.append(text)
+            total += len(text)
+            if max_chars and total >= max_chars:
+                break
+    except PDFTimeout as e:
+        print(f"[pdf_extract] {e}; keeping {len(parts)} page(s)")
+    except Exception as e:
+        if not parts:
+            raise
+        print(f"[pdf_extract] extraction failed after {len(parts)} page(s): {e}")
+    finally:
+        pages.close()
+    text = "\n".join(parts)
+    return text[:max_chars] if max_chars else text
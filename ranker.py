@@ -1,7 +1,7 @@
 # ranker.py
 import pandas as pd
-from ats_score import calculate_ats_score
-from jd_parser import extract_jd_keywords
+from jd_parser import extract_keywords
+from scoring import score_matrix
 
 def rank_resumes_against_jds(resume_profiles, jd_list):
     """
@@ -9,11 +9,12 @@ def rank_resumes_against_jds(resume_profiles, jd_list):
     jd_list: List of job description strings
     Returns: Pandas DataFrame with ranking per JD
     """
+    jd_keyword_lists = [extract_keywords(jd_text) for jd_text in jd_list]
+    sm = score_matrix([p["raw_text"] for p in resume_profiles], jd_keyword_lists)
     results = []
-    for jd_index, jd_text in enumerate(jd_list):
-        jd_keywords = extract_jd_keywords(jd_text)
-        for profile in resume_profiles:
-            ats = calculate_ats_score(profile["raw_text"], jd_keywords)
+    for jd_index in range(len(jd_list)):
+        for i, profile in enumerate(resume_profiles):
+            ats = float(sm.scores[i, jd_index])
             results.append({
                 "JD #": jd_index + 1,
                 "Candidate": profile.get("name", "Unknown"),
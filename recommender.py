@@ -1,7 +1,13 @@
 import json
-from typing import List, Dict
+import os
+import threading
+from typing import List, Dict, Sequence, Tuple
+import numpy as np
 
-def load_job_profiles(filepath: str = 'job_profiles.json') -> Dict:
+DEFAULT_PROFILES_PATH = 'job_profiles.json'
+
+
+def load_job_profiles(filepath: str = DEFAULT_PROFILES_PATH) -> Dict:
     """Loads the job profiles from a JSON file."""
     try:
         with open(filepath, 'r') as f:
@@ -9,33 +15,107 @@ def load_job_profiles(filepath: str = 'job_profiles.json') -> Dict:
     except FileNotFoundError:
         return {}
 
+
+class Recommender:
+    """
+    Job-title recommender over a job_profiles.json file.
+
+    - The file is parsed once and re-read only when its mtime changes.
+    - Each title's required skills are a 0/1 row over a lowercase skill
+      vocabulary; resumes are encoded the same way, so one matrix
+      product gives matched-skill counts for every (resume, title) pair.
+    - A title's score is the percentage of its required skills the
+      resume has, as in recommend_job. Ties go to the earlier title.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILES_PATH):
+        self.path = path
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.titles: List[str] = []
+        self.vocab: Dict[str, int] = {}
+        self._required = np.zeros((0, 0), dtype=np.float32)
+        self._sizes = np.zeros(0, dtype=np.float64)
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime == self._mtime and self._mtime is not None:
+                return
+            profiles = load_job_profiles(self.path) if mtime is not None else {}
+            vocab = {}
+            for skills in profiles.values():
+                for skill in skills:
+                    vocab.setdefault(skill.lower(), len(vocab))
+            required = np.zeros((len(profiles), len(vocab)), dtype=np.float32)
+            for t, skills in enumerate(profiles.values()):
+                required[t, [vocab[s.lower()] for s in skills]] = 1.0
+            self.titles = list(profiles)
+            self.vocab = vocab
+            self._required = required
+            self._sizes = required.sum(axis=1, dtype=np.float64)
+            self._mtime = mtime
+
+    def encode(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """Resumes x vocabulary 0/1 matrix; skills no title asks for are dropped."""
+        self._refresh()
+        vocab = self.vocab
+        out = np.zeros((len(skill_lists), len(vocab)), dtype=np.float32)
+        for i, skills in enumerate(skill_lists):
+            cols = [vocab[s] for s in {s.lower() for s in skills or []} if s in vocab]
+            out[i, cols] = 1.0
+        return out
+
+    def match_matrix(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """Resumes x titles match percentages (0-100)."""
+        resumes = self.encode(skill_lists)
+        counts = (resumes @ self._required.T).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(self._sizes > 0, counts / self._sizes * 100, 0.0)
+        return scores
+
+    def recommend_batch(self, skill_lists: Sequence[Sequence[str]], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Top-k (title, score) pairs per resume, best first."""
+        scores = self.match_matrix(skill_lists)
+        if not self.titles:
+            return [[] for _ in skill_lists]
+        k = min(k, len(self.titles))
+        # stable sort on -score keeps file order among tied titles
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return [
+            [(self.titles[t], round(float(scores[i, t]), 2)) for t in row]
+            for i, row in enumerate(order)
+        ]
+
+    def recommend(self, resume_skills: List[str]) -> Dict:
+        """Single-resume result in recommend_job's shape."""
+        best = self.recommend_batch([resume_skills], k=1)[0]
+        if not best:
+            return {"best_match": "No job profiles found.", "score": 0}
+        return {"best_match": best[0][0], "score": best[0][1]}
+
+
+_recommenders: Dict[str, Recommender] = {}
+
+
+def get_recommender(path: str = DEFAULT_PROFILES_PATH) -> Recommender:
+    """One shared Recommender per profiles file."""
+    rec = _recommenders.get(path)
+    if rec is None:
+        rec = _recommenders[path] = Recommender(path)
+    return rec
+
+
 def recommend_job(resume_skills: List[str]) -> Dict:
     """
     Recommends a job title based on the skills extracted from a resume.
     """
-    job_profiles = load_job_profiles()
-    if not job_profiles:
-        return {"best_match": "No job profiles found.", "score": 0}
-
-    best_match_job = None
-    highest_score = -1
-
-    resume_skills_set = set(s.lower() for s in resume_skills)
-
-    for job_title, required_skills in job_profiles.items():
-        required_skills_set = set(s.lower() for s in required_skills)
-        
-        # Calculate the number of matching skills
-        matching_skills = resume_skills_set.intersection(required_skills_set)
-        
-        # Calculate a match score (percentage of required skills met)
-        if required_skills_set:
-            score = (len(matching_skills) / len(required_skills_set)) * 100
-        else:
-            score = 0
-
-        if score > highest_score:
-            highest_score = score
-            best_match_job = job_title
-            
-    return {"best_match": best_match_job, "score": round(highest_score, 2)}
\ No newline at end of file
+    return get_recommender().recommend(resume_skills)
+
+
+def recommend_jobs(skill_lists: Sequence[Sequence[str]], k: int = 3) -> List[List[Tuple[str, float]]]:
+    """Top-k job titles with scores for a whole batch of resumes."""
+    return get_recommender().recommend_batch(skill_lists, k)
@@ -0,0 +1,261 @@
+# scoring.py
+from collections import Counter
+from typing import Dict, List, Sequence, Union
+import numpy as np
+from scipy import sparse
+import instrumentation
+from matcher import normalize_term, result_entry
+from term_matcher import compile_terms
+
+WeightsArg = Union[None, Dict[str, float], Sequence[Dict[str, float]]]
+
+
+def build_vocab(jd_keyword_lists: Sequence[List[str]]) -> Dict[str, int]:
+    """Maps every normalized JD keyword (across all JDs) to a column index."""
+    vocab = {}
+    for keywords in jd_keyword_lists:
+        for kw in keywords:
+            norm = normalize_term(kw)
+            if norm and norm not in vocab:
+                vocab[norm] = len(vocab)
+    return vocab
+
+
+def term_matrix(texts, vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """
+    Binary (texts x vocab) matrix: 1 where the term occurs in the text.
+    Every text is scanned once, whatever the vocabulary size.
+    """
+    matcher = compile_terms(tuple(vocab))
+    indptr, indices = [0], []
+    for text in texts:
+        indices.extend(sorted(vocab[t] for t in matcher.find(text or "")))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocab)),
+    )
+
+
+def _weights_for(weights: WeightsArg, j: int):
+    if weights is None or isinstance(weights, dict):
+        return weights
+    return weights[j]
+
+
+def weight_matrix(jd_keyword_lists: Sequence[List[str]], vocab: Dict[str, int], weights: WeightsArg = None):
+    """
+    Returns (W, totals): W is a (vocab x JDs) matrix of keyword weights and
+    totals the full weight of each JD, including keywords that normalize to
+    nothing, exactly as compute_keyword_match_score counts them.
+
+    weights may be one dict applied to every JD or one dict per JD.
+    """
+    rows, cols, vals = [], [], []
+    totals = np.zeros(len(jd_keyword_lists), dtype=np.float64)
+    for j, keywords in enumerate(jd_keyword_lists):
+        jd_weights = _weights_for(weights, j)
+        for kw in keywords:
+            weight = 1.0 if not jd_weights else float(jd_weights.get(kw, 1.0))
+            totals[j] += weight
+            norm = normalize_term(kw)
+            if norm:
+                rows.append(vocab[norm])
+                cols.append(j)
+                vals.append(weight)
+    # duplicate (row, col) entries are summed, matching repeated keywords
+    W = sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float64), (rows, cols)),
+        shape=(len(vocab), len(jd_keyword_lists)),
+    )
+    return W, totals
+
+
+def top_k_indices(scores: np.ndarray, k: int = None) -> List[int]:
+    """
+    Indices of the k highest scores, best first; ties keep input order.
+    Uses a partial partition, not a full sort.
+    """
+    n = len(scores)
+    if k is not None and k <= 0:
+        return []
+    if k is None or k >= n:
+        idx = np.arange(n)
+    else:
+        # widen the cut to include every row tied with the k-th score
+        kth = np.partition(scores, n - k)[n - k]
+        idx = np.flatnonzero(scores >= kth)
+    order = np.lexsort((idx, -scores[idx]))
+    return idx[order][:k].tolist()
+
+
+class ScoreMatrix:
+    """
+    Weighted keyword match scores for every (resume, JD) pair.
+
+    scores[i, j] is the percentage compute_keyword_match_score would return
+    for resume i against JD j.
+    """
+
+    def __init__(self, terms, vocab, jd_keyword_lists, scores):
+        self.terms = terms
+        self.vocab = vocab
+        self.jd_keyword_lists = jd_keyword_lists
+        self.scores = scores
+
+    @property
+    def shape(self):
+        return self.scores.shape
+
+    def top_k(self, j: int, k: int = None) -> List[int]:
+        """Row indices of the best k resumes for JD j, best first."""
+        return top_k_indices(self.scores[:, j], k)
+
+    def matched_keywords(self, i: int, j: int) -> List[str]:
+        row = self.terms.indices[self.terms.indptr[i]:self.terms.indptr[i + 1]]
+        hit = set(row.tolist())
+        return [
+            kw for kw in self.jd_keyword_lists[j]
+            if normalize_term(kw) and self.vocab[normalize_term(kw)] in hit
+        ]
+
+
+@instrumentation.timed()
+def score_matrix(texts, jd_keyword_lists: Sequence[List[str]], weights: WeightsArg = None) -> ScoreMatrix:
+    """
+    Scores every text against every JD keyword list with one sparse product:
+    (texts x vocab) @ (vocab x JDs) -> matched weight per pair.
+    """
+    jd_keyword_lists = [list(kws) for kws in jd_keyword_lists]
+    vocab = build_vocab(jd_keyword_lists)
+    T = term_matrix(texts, vocab)
+    W, totals = weight_matrix(jd_keyword_lists, vocab, weights)
+
+    matched = np.asarray((T @ W).todense(), dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(totals > 0, matched / totals * 100, 0.0)
+    if weights is not None and not totals.all():
+        # all-zero weights fall back to a plain % match, as in matcher.py
+        unit_W, counts = weight_matrix(jd_keyword_lists, vocab)
+        plain = np.asarray((T @ unit_W).todense(), dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(totals > 0, scores, np.where(counts > 0, plain / counts * 100, 0.0))
+    return ScoreMatrix(T, vocab, jd_keyword_lists, np.round(scores, 2))
+
+
+def results_from_matrix(resumes: List[dict], sm: ScoreMatrix, j: int, k: int = None) -> List[dict]:
+    """Same rows as aggregate_scores_for_jd, built from a precomputed matrix."""
+    return [
+        result_entry(resumes[i], float(sm.scores[i, j]), sm.matched_keywords(i, j))
+        for i in sm.top_k(j, k)
+    ]
+
+
+class IncrementalScorer:
+    """
+    Keeps per-resume, per-keyword hit state for a fixed pool of resumes.
+
+    - sync() only scans resumes for keywords it has not seen yet and
+      forgets keywords no JD uses any more, so editing one keyword costs
+      one pass for that keyword instead of a full rescore.
+    - Scoring a JD from the stored hits is a weighted sum of boolean
+      columns; stats that do not depend on keywords are computed once.
+    - State is n bools per keyword; the resume texts are only read while
+      new keywords are being scanned.
+    """
+
+    def __init__(self, resumes, texts=None):
+        """
+        resumes: profile dicts, or any sequence whose items result_entry
+        accepts. texts: optional callable returning the resume texts in
+        order, for pools that keep text out of memory (see
+        candidate_store.CandidateStore); defaults to each raw_text.
+        """
+        self.resumes = resumes
+        self._n = len(resumes)
+        if texts is None:
+            held = [p.get("raw_text") or "" for p in resumes]
+            texts = lambda: iter(held)
+        self._iter_texts = texts
+        self._hits: Dict[str, np.ndarray] = {}
+        self._pool_stats = None
+
+    @property
+    def terms(self):
+        return list(self._hits)
+
+    def sync(self, jd_keyword_lists: Sequence[List[str]]):
+        """Brings the hit state in line with the current JD keyword lists."""
+        wanted = {normalize_term(kw) for kws in jd_keyword_lists for kw in kws} - {""}
+        for term in set(self._hits) - wanted:
+            del self._hits[term]
+        self._add_terms(wanted)
+
+    def _add_terms(self, terms):
+        added = sorted(t for t in terms if t and t not in self._hits)
+        if not added:
+            return
+        cols = {t: np.zeros(self._n, dtype=bool) for t in added}
+        matcher = compile_terms(tuple(added))
+        for i, text in enumerate(self._iter_texts()):
+            for term in matcher.find(text):
+                cols[term][i] = True
+        self._hits.update(cols)
+
+    def scores(self, jd_keywords: List[str], weights: Dict[str, float] = None) -> np.ndarray:
+        """Same percentages as compute_keyword_match_score, for every resume."""
+        self._add_terms(normalize_term(kw) for kw in jd_keywords)
+        n = self._n
+        if not jd_keywords:
+            return np.zeros(n)
+        matched_w = np.zeros(n)
+        matched_n = np.zeros(n)
+        total_w = 0.0
+        for kw in jd_keywords:
+            weight = 1.0 if not weights else float(weights.get(kw, 1.0))
+            total_w += weight
+            norm = normalize_term(kw)
+            if norm:
+                matched_w += weight * self._hits[norm]
+                matched_n += self._hits[norm]
+        if total_w:
+            return np.round(matched_w / total_w * 100, 2)
+        return np.round(matched_n / len(jd_keywords) * 100, 2)
+
+    def matched_keywords(self, i: int, jd_keywords: List[str]) -> List[str]:
+        return [kw for kw in jd_keywords
+                if normalize_term(kw) and self._hits[normalize_term(kw)][i]]
+
+    def rank(self, jd_keywords: List[str], weights: Dict[str, float] = None, k: int = None):
+        """(row indices best first, their scores) without building any rows."""
+        scores = self.scores(jd_keywords, weights)
+        idx = np.asarray(top_k_indices(scores, k), dtype=np.intp)
+        return idx, scores[idx]
+
+    def results(self, jd_keywords: List[str], weights: Dict[str, float] = None, k: int = None) -> List[dict]:
+        """Same rows as aggregate_scores_for_jd, from the stored hit state."""
+        idx, scores = self.rank(jd_keywords, weights, k)
+        return [
+            result_entry(self.resumes[i], float(score), self.matched_keywords(i, jd_keywords))
+            for i, score in zip(idx, scores)
+        ]
+
+    def dashboard_stats(self, scores: np.ndarray) -> dict:
+        """compute_dashboard_stats() without re-walking the result rows."""
+        if not len(scores):
+            return {"avg_score": 0, "common_skills": [], "avg_experience": 0}
+        if self._pool_stats is None and hasattr(self.resumes, "common_skills"):
+            # columnar pool: counted from interned skill ids
+            self._pool_stats = (self.resumes.common_skills(10), self.resumes.avg_experience())
+        if self._pool_stats is None:
+            all_skills = [skill for p in self.resumes if p.get("skills") for skill in p["skills"]]
+            self._pool_stats = (
+                Counter(all_skills).most_common(10),
+                round(np.mean([p.get("experience_years") or 0 for p in self.resumes]), 2),
+            )
+        return {
+            "avg_score": round(float(np.mean(scores)), 2),
+            "common_skills": self._pool_stats[0],
+            "avg_experience": self._pool_stats[1],
+        }
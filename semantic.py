@@ -0,0 +1,192 @@
+# semantic.py
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from models import DEFAULT_EMBED_MODEL as DEFAULT_MODEL, get_sentence_model
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "embeddings")
+
+
+def encode(texts: List[str], model_name: str = DEFAULT_MODEL) -> np.ndarray:
+    """Unit-length float32 embeddings, so a dot product is cosine similarity."""
+    model = get_sentence_model(model_name)
+    vectors = model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+class EmbeddingIndex:
+    """
+    On-disk embedding index of resumes.
+
+    - Vectors live in a memory-mapped float32 matrix (embeddings.f32);
+      row metadata lives next to it in index.json.
+    - Each resume gets one row for its full text plus one per section.
+    - Scoring a JD is one matrix-vector product over the mapped rows, so
+      the pool is never re-encoded.
+    - add()/remove() are incremental; removed rows are reused.
+    - One instance may be shared across threads (st.cache_resource);
+      writes and the metadata save hold a lock.
+    """
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR, model_name: str = DEFAULT_MODEL):
+        self.index_dir = index_dir
+        self.model_name = model_name
+        self._meta_path = os.path.join(index_dir, "index.json")
+        self._data_path = os.path.join(index_dir, "embeddings.f32")
+        os.makedirs(index_dir, exist_ok=True)
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["model"] != model_name:
+                raise ValueError(
+                    f"Index at {index_dir} was built with {meta['model']}, not {model_name}"
+                )
+            self.dim = meta["dim"]
+            self.capacity = meta["capacity"]
+            self.rows: List[Optional[str]] = meta["rows"]
+        else:
+            self.dim = None
+            self.capacity = 0
+            self.rows = []
+        # resume_id -> its rows, and the free rows, so lookups skip the scan
+        self._by_id: Dict[str, List[int]] = {}
+        self._free: List[int] = []
+        for i, resume_id in enumerate(self.rows):
+            if resume_id is None:
+                self._free.append(i)
+            else:
+                self._by_id.setdefault(resume_id, []).append(i)
+        self._lock = threading.Lock()
+        self._matrix = self._open() if self.capacity else None
+
+    # ---------- storage ----------
+    def _open(self):
+        return np.memmap(self._data_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+
+    def _grow(self, needed: int):
+        new_capacity = max(needed, self.capacity * 2, 64)
+        old = self._matrix
+        self._matrix = None
+        grown = np.memmap(self._data_path + ".tmp", dtype=np.float32, mode="w+", shape=(new_capacity, self.dim))
+        if old is not None:
+            grown[: self.capacity] = old
+            del old
+        grown.flush()
+        del grown
+        os.replace(self._data_path + ".tmp", self._data_path)
+        self.capacity = new_capacity
+        self._matrix = self._open()
+
+    def _save_meta(self):
+        self._matrix.flush()
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "dim": self.dim,
+                       "capacity": self.capacity, "rows": self.rows}, f)
+        os.replace(tmp, self._meta_path)
+
+    # ---------- public API ----------
+    def __contains__(self, resume_id: str):
+        return resume_id in self._by_id
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, resume_id: str, text: str, sections: Optional[List[str]] = None):
+        """Embeds one resume (and its sections); replaces any previous entry."""
+        self.add_many([(resume_id, text, sections)])
+
+    def add_many(self, items):
+        """
+        items: iterable of (resume_id, text, sections or None). A
+        resume_id given twice keeps only its last entry.
+        """
+        latest = {}
+        for resume_id, text, sections in items:
+            latest.pop(resume_id, None)
+            latest[resume_id] = (text, sections)
+        replaced, ids, texts = list(latest), [], []
+        for resume_id, (text, sections) in latest.items():
+            for chunk in [text] + list(sections or []):
+                if chunk and chunk.strip():
+                    ids.append(resume_id)
+                    texts.append(chunk)
+        # encode outside the lock; it is the slow part
+        vectors = encode(texts, self.model_name) if texts else None
+        with self._lock:
+            for resume_id in replaced:
+                self._remove(resume_id)
+            if vectors is None:
+                if replaced and self._matrix is not None:
+                    self._save_meta()
+                return
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            extra = len(texts) - len(self._free)
+            if extra > 0:
+                if len(self.rows) + extra > self.capacity:
+                    self._grow(len(self.rows) + extra)
+                self._free += range(len(self.rows), len(self.rows) + extra)
+                self.rows.extend([None] * extra)
+            free, self._free = self._free[:len(texts)], self._free[len(texts):]
+            for row, resume_id, vector in zip(free, ids, vectors):
+                self._matrix[row] = vector
+                self.rows[row] = resume_id
+                self._by_id.setdefault(resume_id, []).append(row)
+            self._save_meta()
+
+    def _remove(self, resume_id: str) -> bool:
+        hit = self._by_id.pop(resume_id, None)
+        if not hit:
+            return False
+        for i in hit:
+            self._matrix[i] = 0.0
+            self.rows[i] = None
+        self._free.extend(hit)
+        return True
+
+    def remove(self, resume_id: str, save: bool = True):
+        with self._lock:
+            if self._remove(resume_id) and save:
+                self._save_meta()
+
+    def save(self):
+        with self._lock:
+            if self._matrix is not None:
+                self._save_meta()
+
+    def scores(self, jd_text: str) -> Dict[str, float]:
+        """Best cosine similarity (0-100) of each resume against the JD."""
+        if not self._by_id:
+            return {}
+        query = encode([jd_text], self.model_name)[0]
+        # rows are reused and the matrix regrown by add_many: copy the
+        # vectors out together with the row map they belong to
+        with self._lock:
+            by_id = list(self._by_id.items())
+            if not by_id:
+                return {}
+            counts = np.fromiter((len(rows) for _, rows in by_id), dtype=np.intp, count=len(by_id))
+            flat = np.fromiter((i for _, rows in by_id for i in rows), dtype=np.intp, count=int(counts.sum()))
+            vectors = self._matrix[flat]
+        ids = [resume_id for resume_id, _ in by_id]
+        # each resume's rows are contiguous in flat: best row per resume
+        sims = vectors @ query
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        best = np.maximum.reduceat(sims, starts).astype(np.float64)
+        return dict(zip(ids, np.round(np.maximum(best, 0.0) * 100, 2).tolist()))
+
+    def query(self, jd_text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (resume_id, score) pairs, best first."""
+        ranked = self.scores(jd_text)
+        if not ranked:
+            return []
+        ids = list(ranked)
+        vals = np.fromiter(ranked.values(), dtype=np.float64, count=len(ids))
+        k = min(top_k, len(ids))
+        top = np.argpartition(-vals, k - 1)[:k]
+        top = top[np.argsort(-vals[top], kind="stable")]
+        return [(ids[i], float(vals[i])) for i in top]
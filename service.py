@@ -0,0 +1,466 @@
+# service.py
+"""
+Local scoring service: one process owns the models, the parse cache and
+a worker pool; Streamlit sessions and scripts submit jobs over HTTP.
+
+    python service.py --port 8765 --workers 2 --parse-workers 4 --queue 16
+    RESUME_SERVICE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Endpoints (JSON bodies, resume bytes base64-encoded):
+    POST /parse           {"resumes": [{"filename", "data"}], "skills": [...], "dedup": false}
+    POST /score           {"pool": <parse job id>, "jds": {title: {"text", "keywords"?, "weighted"?}},
+                           "method": "tfidf", "top_n": 15, "top_k": null}
+    POST /keywords        {"text", "method", "top_n"}
+    GET  /jobs/<id>       status, progress and, once done, the result
+    GET  /jobs/<id>/stream?from=N   NDJSON events as they happen
+    GET  /health
+
+Every POST is a queued job (202 + Location). A full queue answers 429
+and a stopping server 503, both with Retry-After, so clients back off
+instead of piling work on the box.
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cache import ParseCache, content_hash
+from dedup import Deduplicator
+from job_profile import JobProfile
+from parser import parse_resumes
+from scoring import IncrementalScorer
+
+MAX_QUEUE = 16
+MAX_BODY_BYTES = 256 * 1024 * 1024
+MAX_JOB_BYTES = 512 * 1024 * 1024  # finished jobs kept for polling / as scoring pools
+JOB_KINDS = ("parse", "score", "keywords")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """
+    One unit of queued work. events is append-only; readers wait on
+    `changed` and resume from an index, so any number of streams can
+    follow a job.
+    """
+
+    def __init__(self, kind: str, payload: dict):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.status = "queued"
+        self.error = None
+        self.result = None
+        self.total = 0
+        self.done = 0
+        self.events = []
+        self.changed = threading.Condition()
+        self.created = time.time()
+        self.finished = None
+        self.nbytes = 0  # rough memory held once finished
+        # parse jobs: profiles with raw text, and a scorer built on demand
+        self.profiles = []
+        self.scorer = None
+        self.scorer_lock = threading.Lock()
+
+    def emit(self, event: dict):
+        with self.changed:
+            self.events.append(event)
+            self.changed.notify_all()
+
+    def set_status(self, status: str, error: str = None):
+        with self.changed:
+            self.status = status
+            self.error = error
+            self.events.append({"type": "status", "status": status, **({"error": error} if error else {})})
+            if status in ("done", "failed"):
+                self.finished = time.time()
+            self.changed.notify_all()
+
+    def summary(self, with_result: bool = True) -> dict:
+        out = {"id": self.id, "kind": self.kind, "status": self.status,
+               "progress": {"done": self.done, "total": self.total}}
+        if self.error:
+            out["error"] = self.error
+        if with_result and self.status == "done":
+            out["result"] = self.result
+        return out
+
+    def measure(self) -> int:
+        """Resume text plus serialized events and result: what a finished job holds on to."""
+        text = sum(len(p.get("raw_text") or "") for p in self.profiles)
+        with self.changed:
+            events = len(json.dumps(self.events))
+        self.nbytes = text + events + len(json.dumps(self.result))
+        return self.nbytes
+
+
+def _public_profile(profile: dict) -> dict:
+    return {k: v for k, v in profile.items() if k != "raw_text"}
+
+
+class ScoringService:
+    """
+    - `workers` job runner threads take jobs from a bounded queue;
+      submit() raises QueueFull instead of growing it.
+    - Parsing goes to one long-lived process pool (parse_workers), so
+      each worker loads spaCy once for the life of the service; cached
+      profiles are served from the shared ParseCache.
+    - A finished parse job is the pool that score jobs reference; its
+      IncrementalScorer is reused, so rescoring the same uploads with
+      edited keywords only scans for the new terms.
+    - Finished jobs are kept while they fit in max_job_bytes (resume
+      text, events and results); past that the least recently used are
+      dropped, never the one that just finished. Scoring a pool counts
+      as a use.
+    """
+
+    def __init__(self, workers: int = 2, parse_workers: int = None, max_queue: int = MAX_QUEUE,
+                 cache: ParseCache = None, max_job_bytes: int = MAX_JOB_BYTES):
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.cache = cache or ParseCache()
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self.max_job_bytes = max_job_bytes
+        self._job_bytes = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopping = False
+        self._job_seconds = 1.0  # running mean, for Retry-After
+        self._pool = ProcessPoolExecutor(self.parse_workers) if self.parse_workers > 1 else None
+        self._threads = [threading.Thread(target=self._run, daemon=True, name=f"job-runner-{i}")
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    # ---------- queue ----------
+    def submit(self, kind: str, payload: dict) -> Job:
+        if self._stopping:
+            raise RuntimeError("service is shutting down")
+        job = Job(kind, payload)
+        # registered first, so a runner that finishes it at once can account for it
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                del self.jobs[job.id]
+            raise QueueFull()
+        return job
+
+    def _keep(self, job: Job):
+        """Adds a finishing job to the kept total and drops the least recently used past the cap."""
+        nbytes = job.measure()
+        with self._jobs_lock:
+            if job.id not in self.jobs:
+                return
+            self._job_bytes += nbytes
+            for old in list(self.jobs.values()):
+                if self._job_bytes <= self.max_job_bytes:
+                    break
+                if old.finished and old is not job:
+                    del self.jobs[old.id]
+                    self._job_bytes -= old.nbytes
+
+    def get(self, job_id: str):
+        with self._jobs_lock:
+            return self.jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely free."""
+        waiting = self._queue.qsize() + 1
+        return max(1, math.ceil(waiting * self._job_seconds / max(1, len(self._threads))))
+
+    def health(self) -> dict:
+        return {"status": "stopping" if self._stopping else "ok",
+                "queued": self._queue.qsize(), "max_queue": self._queue.maxsize,
+                "workers": len(self._threads), "parse_workers": self.parse_workers,
+                "jobs": len(self.jobs), "job_bytes": self._job_bytes, "max_job_bytes": self.max_job_bytes}
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            start = time.perf_counter()
+            job.set_status("running")
+            try:
+                if job.kind == "parse":
+                    self._parse(job)
+                elif job.kind == "keywords":
+                    self._keywords(job)
+                else:
+                    self._score(job)
+                status, error = "done", None
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            # accounted before it reports done, so polling clients see the new total
+            self._keep(job)
+            job.set_status(status, error)
+            self._job_seconds = 0.8 * self._job_seconds + 0.2 * (time.perf_counter() - start)
+
+    # ---------- jobs ----------
+    def _parse(self, job: Job):
+        skills_list = job.payload.get("skills") or None
+        dedup = bool(job.payload.get("dedup"))
+        # the base64 upload is not needed once decoded
+        resumes = [(r["filename"], base64.b64decode(r["data"])) for r in job.payload.pop("resumes", [])]
+        job.total = len(resumes)
+        # keys carry the upload index, so repeated filenames stay apart
+        keys = [f"{i}/{name}" for i, (name, _) in enumerate(resumes)]
+        names = {key: name for key, (name, _) in zip(keys, resumes)}
+        cached, to_parse = {}, []
+        for i, (name, data) in enumerate(resumes):
+            digest = content_hash(data)
+            profile = self.cache.get_profile(digest, skills_list)
+            if profile is None or profile.get("duplicate_of"):
+                to_parse.append((name, data, digest, i))
+                continue
+            profile["orig_filename"] = name
+            profile["content_hash"] = digest
+            cached[i] = profile
+
+        # cache hits first, then new uploads, each in upload order; a copy
+        # carries its original's fields, so it is never cached
+        deduplicator = Deduplicator() if dedup else None
+        if deduplicator is not None:
+            found = deduplicator.check_profiles((keys[i], cached[i]) for i in sorted(cached))
+            for i, profile in cached.items():
+                if keys[i] in found:
+                    orig_key, sim = found[keys[i]]
+                    profile.update(duplicate_of=names[orig_key], similarity=round(sim, 3))
+        by_index = {i: self._parsed(job, profile) for i, profile in sorted(cached.items())}
+
+        order = {keys[i]: (name, digest, i) for name, _, digest, i in to_parse}
+        items = [(keys[i], data) for name, data, _, i in to_parse]
+        for key, profile, error in parse_resumes(items, skills_list, workers=self.parse_workers, pool=self._pool,
+                                                 dedup=deduplicator):
+            name, digest, i = order[key]
+            if error:
+                job.done += 1
+                job.emit({"type": "error", "filename": name, "error": error})
+                continue
+            profile["file_path"] = name
+            if profile.get("duplicate_of"):
+                profile["duplicate_of"] = names[profile["duplicate_of"]]
+            else:
+                self.cache.put_profile(digest, profile, skills_list)
+            profile["orig_filename"] = name
+            profile["content_hash"] = digest
+            by_index[i] = self._parsed(job, profile)
+        # upload order, whatever finished first; duplicates are not scored
+        job.profiles = [by_index[i] for i in sorted(by_index)]
+        job.result = {"profiles": [_public_profile(p) for p in job.profiles]}
+
+    def _parsed(self, job: Job, profile: dict) -> dict:
+        job.done += 1
+        job.emit({"type": "profile", "profile": _public_profile(profile)})
+        return profile
+
+    def _score(self, job: Job):
+        pool = self.get(job.payload.get("pool", ""))
+        if pool is None or pool.kind != "parse":
+            raise KeyError("unknown pool job; resubmit the resumes")
+        if pool.status != "done":
+            raise RuntimeError(f"pool job is {pool.status}")
+        with self._jobs_lock:
+            if pool.id in self.jobs:
+                self.jobs.move_to_end(pool.id)
+        jds = job.payload.get("jds") or {}
+        job.total = len(jds)
+        method = job.payload.get("method", "tfidf")
+        top_n = int(job.payload.get("top_n", 15))
+        top_k = job.payload.get("top_k")
+        result = {"keywords": {}, "weights": {}, "results": {}}
+        with pool.scorer_lock:
+            if pool.scorer is None:
+                pool.scorer = IncrementalScorer([p for p in pool.profiles if not p.get("duplicate_of")])
+            scorer = pool.scorer
+            for title, jd in jds.items():
+                profile = JobProfile.from_text(jd["text"], method=method, top_n=top_n, cache=self.cache)
+                if jd.get("keywords") is not None:
+                    profile = profile.with_keywords(jd["keywords"])
+                weights = (jd.get("weights") or profile.weights) if jd.get("weighted") else None
+                results = scorer.results(profile.keywords, weights, top_k)
+                result["keywords"][title] = profile.keywords
+                result["weights"][title] = profile.weights
+                result["results"][title] = results
+                job.done += 1
+                job.emit({"type": "results", "jd": title, "keywords": profile.keywords,
+                          "weights": profile.weights, "results": results})
+        result["stats"] = {
+            title: scorer.dashboard_stats([r["score"] for r in rows]) for title, rows in result["results"].items()
+        }
+        job.result = result
+
+    def _keywords(self, job: Job):
+        job.total = 1
+        profile = JobProfile.from_text(job.payload["text"], method=job.payload.get("method", "tfidf"),
+                                       top_n=int(job.payload.get("top_n", 15)), cache=self.cache)
+        job.result = {"keywords": profile.keywords, "weights": profile.weights}
+        job.done = 1
+
+    def shutdown(self):
+        self._stopping = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join(timeout=5)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+
+class Handler(BaseHTTPRequestHandler):
+    service: ScoringService = None  # set by make_server()
+    quiet = True
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+    def _send(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": f"body over {MAX_BODY_BYTES} bytes"})
+            return None
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return None
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        payload = self._read_json()
+        if payload is None:
+            return
+        if path.strip("/") not in JOB_KINDS:
+            return self._send(404, {"error": "not found"})
+        if path == "/keywords" and not isinstance(payload.get("text"), str):
+            return self._send(400, {"error": "text is required"})
+        try:
+            job = self.service.submit(path.strip("/"), payload)
+        except QueueFull:
+            return self._send(429, {"error": "queue full"}, {"Retry-After": self.service.retry_after()})
+        except RuntimeError as e:
+            return self._send(503, {"error": str(e)}, {"Retry-After": 5})
+        self._send(202, job.summary(), {"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts == ["health"]:
+            return self._send(200, self.service.health())
+        if len(parts) < 2 or parts[0] != "jobs":
+            return self._send(404, {"error": "not found"})
+        job = self.service.get(parts[1])
+        if job is None:
+            return self._send(404, {"error": "unknown job"})
+        if len(parts) == 2:
+            return self._send(200, job.summary())
+        if parts[2] == "stream":
+            start = int(parse_qs(url.query).get("from", ["0"])[0])
+            return self._stream(job, start)
+        self._send(404, {"error": "not found"})
+
+    def _stream(self, job: Job, start: int):
+        """NDJSON, one event per line, until the job finishes; then the connection closes."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.close_connection = True
+        i = start
+        while True:
+            with job.changed:
+                if i >= len(job.events) and not job.finished:
+                    job.changed.wait(timeout=15)
+                batch = job.events[i:]
+                finished = job.finished is not None
+            # a heartbeat line keeps idle connections from being dropped
+            lines = batch if batch or finished else [{"type": "heartbeat"}]
+            try:
+                for event in lines:
+                    self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            i += len(batch)
+            if finished:
+                return
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, **service_kwargs) -> ThreadingHTTPServer:
+    service = ScoringService(**service_kwargs)
+    handler = type("BoundHandler", (Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    server.url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **service_kwargs) -> ThreadingHTTPServer:
+    """
+    Runs a service in a background thread, e.g. on a free port for
+    tests. Stop it with stop_server(server).
+    """
+    server = make_server(host, port, **service_kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True, name="service-http").start()
+    return server
+
+
+def stop_server(server: ThreadingHTTPServer):
+    server.service.shutdown()
+    server.shutdown()
+    server.server_close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local resume scoring service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=2, help="jobs run concurrently")
+    ap.add_argument("--parse-workers", type=int, default=None, help="parser processes (default: all cores)")
+    ap.add_argument("--queue", type=int, default=MAX_QUEUE, help="queued jobs before answering 429")
+    ap.add_argument("--job-memory-mb", type=int, default=MAX_JOB_BYTES // (1024 * 1024),
+                    help="memory kept for finished jobs before the least recently used are dropped")
+    ap.add_argument("--verbose", action="store_true", help="log every request")
+    args = ap.parse_args()
+
+    Handler.quiet = not args.verbose
+    server = make_server(args.host, args.port, workers=args.workers,
+                         parse_workers=args.parse_workers, max_queue=args.queue,
+                         max_job_bytes=args.job_memory_mb * 1024 * 1024)
+    print(f"[service] listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_server(server)
+
+
+if __name__ == "__main__":
+    main()
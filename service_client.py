@@ -0,0 +1,99 @@
+# service_client.py
+import base64
+import json
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class ServiceClient:
+    """
+    Client for service.py over plain urllib.
+
+    - 429 (queue full) and 503 (stopping) are retried after the server's
+      Retry-After, up to `retries` times; other errors raise ServiceError.
+    - stream() follows a job's NDJSON events; wait() polls until it ends.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60, retries: int = 5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+
+    def _request(self, method: str, path: str, body: dict = None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        for attempt in range(self.retries + 1):
+            req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    return json.loads(resp.read() or b"{}")
+            except urllib.error.HTTPError as e:
+                if e.code in (429, 503) and attempt < self.retries:
+                    time.sleep(float(e.headers.get("Retry-After") or 1))
+                    continue
+                try:
+                    message = json.loads(e.read()).get("error", e.reason)
+                except ValueError:
+                    message = e.reason
+                raise ServiceError(e.code, message)
+
+    # ---------- jobs ----------
+    def submit_parse(self, resumes: Iterable[Tuple[str, bytes]], skills_list: Optional[List[str]] = None,
+                     dedup: bool = False) -> str:
+        """dedup: collapse near-duplicate resumes (marked "duplicate_of", left out of scoring)."""
+        body = {
+            "resumes": [{"filename": name, "data": base64.b64encode(bytes(data)).decode("ascii")}
+                        for name, data in resumes],
+            "skills": skills_list,
+            "dedup": dedup,
+        }
+        return self._request("POST", "/parse", body)["id"]
+
+    def submit_score(self, pool: str, jds: Dict[str, dict], method: str = "tfidf", top_n: int = 15,
+                     top_k: Optional[int] = None) -> str:
+        """jds: title -> {"text", optional "keywords", optional "weighted": bool}."""
+        body = {"pool": pool, "jds": jds, "method": method, "top_n": top_n, "top_k": top_k}
+        return self._request("POST", "/score", body)["id"]
+
+    def keywords(self, text: str, method: str = "tfidf", top_n: int = 15) -> Tuple[List[str], Dict[str, float]]:
+        """Queued like any job, so a busy service pushes back here too."""
+        job_id = self._request("POST", "/keywords", {"text": text, "method": method, "top_n": top_n})["id"]
+        out = self.wait(job_id, poll_interval=0.05)["result"]
+        return out["keywords"], out["weights"]
+
+    def job(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    def stream(self, job_id: str, start: int = 0):
+        """Yields the job's events (dicts) until it is done or failed."""
+        req = urllib.request.Request(f"{self.base_url}/jobs/{job_id}/stream?from={start}")
+        try:
+            resp = urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raise ServiceError(e.code, e.reason)
+        with resp:
+            for line in resp:
+                event = json.loads(line)
+                if event.get("type") != "heartbeat":
+                    yield event
+
+    def wait(self, job_id: str, poll_interval: float = 0.2) -> dict:
+        """Polls until the job ends; raises ServiceError if it failed."""
+        while True:
+            job = self.job(job_id)
+            if job["status"] == "done":
+                return job
+            if job["status"] == "failed":
+                raise ServiceError(500, job.get("error", "job failed"))
+            time.sleep(poll_interval)
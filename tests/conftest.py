@@ -0,0 +1,18 @@
+# tests/conftest.py
+import os
+import sys
+
+# The modules live at the repo root, next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def blank_nlp(monkeypatch):
+    """A blank spaCy pipeline in place of en_core_web_sm: no download, no entities."""
+    spacy = pytest.importorskip("spacy")
+    import parser
+    nlp = spacy.blank("en")
+    monkeypatch.setattr(parser, "get_nlp", lambda: nlp)
+    return nlp
@@ -0,0 +1,58 @@
+# tests/test_cache.py
+import itertools
+
+import cache
+from cache import ParseCache, content_hash
+
+
+def _cache(tmp_path, **kwargs):
+    return ParseCache(str(tmp_path / "cache.sqlite"), **kwargs)
+
+
+def test_hits_by_content_not_name(tmp_path):
+    pc = _cache(tmp_path)
+    data = b"Alice\nalice@example.com\n"
+    pc.put_profile(content_hash(data), {"name": "Alice"}, ["python"])
+    # same bytes from another buffer type (e.g. a renamed re-upload's memoryview)
+    assert pc.get_profile(content_hash(memoryview(bytearray(data))), ["PYTHON"]) == {"name": "Alice"}
+    assert pc.get_profile(content_hash(data + b" "), ["python"]) is None
+    # a different skills list is a different profile
+    assert pc.get_profile(content_hash(data), ["java"]) is None
+    pc.put_text(content_hash(data), data.decode())
+    assert pc.get_text(content_hash(data)) == data.decode()
+    assert (pc.hits, pc.misses) == (2, 2)
+
+
+def test_evicts_least_recently_used_at_the_cap(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+    pc = _cache(tmp_path, max_bytes=30)
+    for key in "abc":
+        pc.put_text(key, "x" * 10)
+    assert pc.get_text("a") == "x" * 10  # now b is the oldest
+    pc.put_text("d", "x" * 10)
+    assert pc.get_text("b") is None
+    assert all(pc.get_text(k) for k in "acd")
+    assert pc.stats()["entries"] == 3 and pc.stats()["bytes"] == 30
+
+    pc.put_text("big", "x" * 25)
+    assert pc.stats()["bytes"] <= 30 and pc.get_text("big")
+
+
+def test_parser_version_change_invalidates(tmp_path, monkeypatch):
+    pc = _cache(tmp_path)
+    pc.put_profile("h", {"name": "Alice"})
+    pc.put_json("jd", {"keywords": ["python"]})
+    monkeypatch.setattr(cache, "PARSER_VERSION", "next")
+    assert pc.get_profile("h") is None and pc.get_json("jd") is None
+    # and the old entries survive a reopen, unread
+    reopened = _cache(tmp_path)
+    assert reopened.get_profile("h") is None and reopened.stats()["entries"] == 2
+
+
+def test_put_profile_drops_duplicate_marks(tmp_path):
+    pc = _cache(tmp_path)
+    profile = {"name": "Alice", "duplicate_of": "a.txt", "similarity": 0.93}
+    pc.put_profile("h", profile)
+    assert pc.get_profile("h") == {"name": "Alice"}
+    assert profile["duplicate_of"] == "a.txt"  # the caller's dict is untouched
@@ -0,0 +1,73 @@
+# tests/test_candidate_store.py
+import gc
+import os
+
+from candidate_store import CandidateStore
+from scoring import IncrementalScorer
+
+PROFILES = [
+    {"orig_filename": "a.pdf", "email": "a@x.io", "skills": ["python", "sql"], "experience_years": 4,
+     "education": ["BSc"], "raw_text": "Python and SQL.", "parsed_at": "2024-01-02T03:04:05", "content_hash": "a"},
+    {"orig_filename": "b.pdf", "email": None, "skills": ["java", "sql"], "experience_years": 2,
+     "education": [], "raw_text": "Java, SQL.", "parsed_at": None, "content_hash": "b"},
+]
+
+
+def test_views_read_back_profiles():
+    store = CandidateStore.from_profiles(PROFILES)
+    try:
+        for view, profile in zip(store, PROFILES):
+            for key, value in profile.items():
+                assert view[key] == value
+        assert store.common_skills(1) == [("sql", 2)]
+        assert store.avg_experience() == 3.0
+    finally:
+        store.close()
+
+
+def test_scorer_over_store_matches_profiles():
+    store = CandidateStore.from_profiles(PROFILES)
+    try:
+        over_store = IncrementalScorer(store, texts=store.iter_texts).results(["python", "sql"])
+        assert over_store == IncrementalScorer(PROFILES).results(["python", "sql"])
+    finally:
+        store.close()
+
+
+def test_temp_dir_removed_on_close_and_on_collection():
+    store = CandidateStore.from_profiles(PROFILES)
+    path = store.path
+    store.close()
+    store.close()
+    assert not os.path.exists(path)
+
+    store = CandidateStore.from_profiles(PROFILES)
+    path = store.path
+    del store
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_named_store_is_kept_and_reloads(tmp_path):
+    path = str(tmp_path / "pool")
+    store = CandidateStore.from_profiles(PROFILES, path)
+    store.save()
+    store.close()
+    assert os.path.exists(os.path.join(path, "texts.bin"))
+    loaded = CandidateStore.load(path)
+    assert loaded.text(1) == "Java, SQL." and loaded[0]["skills"] == ["python", "sql"]
+    loaded.close()
+
+
+def test_rebuild_over_an_existing_store(tmp_path):
+    path = str(tmp_path / "pool")
+    old = CandidateStore.from_profiles([{"raw_text": "hello world", "content_hash": "old"}], path)
+    old.save()
+    old.close()
+    store = CandidateStore.from_profiles([{"raw_text": "second text", "content_hash": "new"}], path)
+    assert store.text(0) == "second text" and list(store.iter_texts()) == ["second text"]
+    store.save()
+    store.close()
+    loaded = CandidateStore.load(path)
+    assert len(loaded) == 1 and loaded.text(0) == "second text" and loaded[0]["content_hash"] == "new"
+    loaded.close()
@@ -0,0 +1,46 @@
+# tests/test_db.py
+from db import ResumeDB
+from job_profile import JobProfile
+
+
+def _profile(content_hash, email, **extra):
+    return {"content_hash": content_hash, "email": email, "orig_filename": f"{content_hash}.pdf",
+            "skills": ["python"], "experience_years": 3, "education": [], **extra}
+
+
+def _row(content_hash, score):
+    return {"content_hash": content_hash, "score": score, "matched_keywords": ["python"]}
+
+
+def test_same_email_different_files_keep_their_own_scores(tmp_path):
+    db = ResumeDB(str(tmp_path / "r.sqlite"))
+    ids = db.insert_resumes([_profile("a", "Jo@x.io"), _profile("b", "jo@x.io")])
+    assert ids[0] != ids[1]
+    assert db.insert_resume(_profile("a", "jo@x.io", experience_years=5)) == ids[0]
+
+    jd_id = db.save_job_profile("Backend", JobProfile("Python backend", ["python"]))
+    db.save_scores(jd_id, [_row("a", 80.0), _row("b", 60.0), _row("unsaved", 99.0)])
+    top = db.top_candidates(jd_id)
+    assert [(r["content_hash"], r["score"]) for r in top] == [("a", 80.0), ("b", 60.0)]
+    assert top[0]["experience_years"] == 5
+    assert db.stats() == {"candidates": 2, "job_profiles": 1, "scores": 2}
+    db.close()
+
+
+def test_duplicate_flagged_profiles_are_not_saved(tmp_path):
+    db = ResumeDB(str(tmp_path / "r.sqlite"))
+    ids = db.insert_resumes([_profile("a", "a@x.io"), _profile("c", "a@x.io", duplicate_of="a.pdf")])
+    assert ids[0] is not None and ids[1] is None
+    assert db.get_profile("c") is None
+    assert db.stats()["candidates"] == 1
+    db.close()
+
+
+def test_save_scores_in_chunks(tmp_path):
+    db = ResumeDB(str(tmp_path / "r.sqlite"), batch_size=3)
+    db.insert_resumes([_profile(str(i), None) for i in range(10)])
+    jd_id = db.save_job_profile("Any", JobProfile("Python", ["python"]))
+    db.save_scores(jd_id, [_row(str(i), float(i)) for i in range(10)])
+    assert [r["content_hash"] for r in db.top_candidates(jd_id, n=3)] == ["9", "8", "7"]
+    assert db.stats()["scores"] == 10
+    db.close()
@@ -0,0 +1,98 @@
+# tests/test_dedup.py
+import base64
+import random
+import threading
+
+import parser
+from cache import ParseCache, content_hash
+from dedup import Deduplicator, duplicate_groups
+from service import ScoringService
+
+_rng = random.Random(0)
+BODY = " ".join(_rng.choice(["python", "sql", "docker", "built", "services", "team", "data", "led", "api",
+                             "cloud", "shipped", "tests", "pipelines", "for", "the", "and"]) for _ in range(300))
+ORIGINAL = f"Alice\nalice@example.com\n5 years experience\n{BODY}\n"
+COPY = f"Alice\nalice.new@example.com\n5 years experience\n{BODY}\nReferences on request.\n"
+
+
+def test_originals_follow_item_order_not_completion_order(blank_nlp, monkeypatch):
+    extract = parser._extract
+    copy_done = threading.Event()
+
+    def copy_first(source, filename=None):
+        # the first item's extraction finishes only after the second's
+        if filename == "a.txt":
+            copy_done.wait(5)
+        text = extract(source, filename)
+        if filename == "b.txt":
+            copy_done.set()
+        return text
+
+    monkeypatch.setattr(parser, "_extract", copy_first)
+    items = [("a.txt", ORIGINAL.encode()), ("b.txt", COPY.encode())]
+    out = {key: profile for key, profile, error in
+           parser.parse_resumes(items, workers=2, executor="thread", batch_size=1, dedup=Deduplicator())}
+    assert copy_done.is_set()
+    assert not out["a.txt"].get("duplicate_of") and out["a.txt"]["email"] == "alice@example.com"
+    assert out["b.txt"]["duplicate_of"] == "a.txt"
+    # a copy carries its original's parsed fields, but its own contact details
+    assert out["b.txt"]["email"] == "alice.new@example.com"
+    assert out["b.txt"]["experience_years"] == out["a.txt"]["experience_years"]
+
+
+def test_check_profiles_seeds_originals_for_new_files(blank_nlp):
+    dedup = Deduplicator()
+    found = dedup.check_profiles([("0/a.txt", {"raw_text": ORIGINAL, "email": "alice@example.com"}),
+                                  ("1/c.txt", {"raw_text": COPY, "email": "alice.new@example.com"})])
+    assert list(found) == ["1/c.txt"] and found["1/c.txt"][0] == "0/a.txt"
+    assert "raw_text" not in dedup.profiles["0/a.txt"]
+    (key, profile, _), = parser.parse_resumes([("2/b.txt", COPY.encode())], workers=1, dedup=dedup)
+    assert profile["duplicate_of"] == "0/a.txt" and profile["email"] == "alice.new@example.com"
+
+
+def test_copy_keeps_its_own_email_phone_and_name():
+    original = {"name": "Alice", "email": "alice@example.com", "phone": "9876543210", "skills": ["python"],
+                "raw_text": ORIGINAL}
+    moved = "Bob\nbob@example.org\n+44 1234567890\n" + BODY
+    profile = parser._duplicate_profile(original, "a.txt", "b.txt", moved, 0.91)
+    assert (profile["name"], profile["email"], profile["phone"]) == (None, "bob@example.org", "+44 1234567890")
+    assert profile["skills"] == ["python"] and profile["raw_text"] == moved and profile["file_path"] == "b.txt"
+    # only contact details the copy actually has
+    same = parser._duplicate_profile(original, "a.txt", "c.txt", "Alice\n" + BODY, 0.97)
+    assert (same["name"], same["email"], same["phone"]) == ("Alice", None, None)
+    assert original["email"] == "alice@example.com"
+
+
+def test_duplicate_groups_put_the_original_first():
+    profiles = [{"orig_filename": "b.txt", "duplicate_of": "a.txt"}, {"orig_filename": "c.txt"},
+                {"orig_filename": "a.txt"}]
+    assert [[p["orig_filename"] for p in g] for g in duplicate_groups(profiles)] == [["a.txt", "b.txt"], ["c.txt"]]
+
+
+def _parse(service, resumes):
+    job = service.submit("parse", {"resumes": [{"filename": name, "data": base64.b64encode(data).decode()}
+                                               for name, data in resumes], "dedup": True})
+    with job.changed:
+        assert job.changed.wait_for(lambda: job.finished, timeout=10)
+    assert job.status == "done", job.error
+    return job.result["profiles"]
+
+
+def test_service_never_caches_a_copy(tmp_path, blank_nlp):
+    cache = ParseCache(str(tmp_path / "cache.sqlite"))
+    service = ScoringService(workers=1, parse_workers=1, cache=cache)
+    try:
+        original, copy = ORIGINAL.encode(), COPY.encode()
+        first = _parse(service, [("a.txt", original), ("b.txt", copy)])
+        assert [p.get("duplicate_of") for p in first] == [None, "a.txt"]
+        assert cache.get_profile(content_hash(copy), None) is None
+
+        # the original now comes from the cache and still collects its copy
+        again = _parse(service, [("a.txt", original), ("b.txt", copy)])
+        assert [p.get("duplicate_of") for p in again] == [None, "a.txt"]
+
+        # on its own the copy is parsed for real, with its own fields
+        (alone,) = _parse(service, [("b.txt", copy)])
+        assert not alone.get("duplicate_of") and alone["email"] == "alice.new@example.com"
+    finally:
+        service.shutdown()
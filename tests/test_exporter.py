@@ -0,0 +1,90 @@
+# tests/test_exporter.py
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from exporter import (CSVExporter, export_bytes, export_results, iter_combined, results_to_dataframe,
+                      write_csv)
+
+
+def _rows(n, seed=0, experience=True):
+    rng = random.Random(seed)
+    skills = ["python", "sql", "c++", "go", "machine learning"]
+    rows = []
+    for i in range(n):
+        rows.append({
+            "name": rng.choice([f"cand_{i}", f'Doe, "J" {i}', f"line\nbreak {i}", f"naïve {i}"]),
+            "email": rng.choice([None, f"c{i}@x.io"]),
+            "phone": rng.choice([None, "+91-9876543210"]),
+            "education": rng.sample(["BSc, CS", "MBA"], rng.randint(0, 2)),
+            "experience_years": rng.randint(0, 30) if experience else rng.choice([None, 3]),
+            "skills": rng.sample(skills, rng.randint(0, 3)),
+            "score": round(rng.uniform(0, 100), 2),
+            "matched_keywords": rng.sample(skills, rng.randint(0, 2)),
+            "file_path": f"f{i}.pdf",
+            "content_hash": f"h{i}",
+            "semantic_score": rng.choice([0.0, round(rng.random(), 4)]),
+        })
+    return rows
+
+
+def test_chunked_csv_matches_pandas():
+    for n, chunk_size in ((0, 3), (1, 3), (7, 3), (50, 7), (300, 5000)):
+        rows = _rows(n, seed=n)
+        out = io.StringIO()
+        write_csv(rows, out, chunk_size=chunk_size)
+        assert out.getvalue() == results_to_dataframe(rows).to_csv(index=False)
+
+
+def test_mixed_int_column_keeps_ints():
+    rows = _rows(30, seed=2, experience=False)
+    out = io.StringIO()
+    write_csv(rows, out, chunk_size=4)
+    expected = results_to_dataframe(rows)
+    expected["experience_years"] = expected["experience_years"].astype("Int64")
+    assert out.getvalue() == expected.to_csv(index=False)
+
+
+def test_csv_bytes_and_combined_match_pandas(tmp_path):
+    rows = _rows(40)
+    assert export_bytes(iter(rows), "csv") == results_to_dataframe(rows).to_csv(index=False).encode("utf-8")
+
+    all_results = {"Backend": rows[:25], "Data": rows[25:]}
+    path = tmp_path / "all.csv"
+    export_results(iter_combined(all_results), str(path))
+    frames = [results_to_dataframe(r) for r in all_results.values()]
+    expected = pd.concat([f.assign(jd=jd) for f, jd in zip(frames, all_results)])[["jd"] + list(frames[0].columns)]
+    assert path.read_text(encoding="utf-8") == expected.to_csv(index=False)
+
+
+def test_parquet_round_trips_to_the_dataframe():
+    pytest.importorskip("pyarrow")
+    rows = _rows(60, seed=3)
+    got = pd.read_parquet(io.BytesIO(export_bytes(rows, "parquet")))
+    expected = results_to_dataframe(rows)
+    assert list(got.columns) == list(expected.columns)
+    for col in expected.columns:
+        assert [list(v) if hasattr(v, "tolist") else v for v in got[col]] == expected[col].tolist()
+
+
+def test_excel_cells():
+    openpyxl = pytest.importorskip("openpyxl")
+    rows = _rows(20, seed=4)
+    ws = openpyxl.load_workbook(io.BytesIO(export_bytes(rows, "xlsx"))).active
+    values = list(ws.values)
+    expected = results_to_dataframe(rows)
+    assert list(values[0]) == list(expected.columns)
+    for got, (_, row) in zip(values[1:], expected.iterrows()):
+        # pandas reads a missing value as NaN; openpyxl reads an empty cell as None
+        want = [", ".join(v) or None if isinstance(v, list) else None if pd.isna(v) else v for v in row.tolist()]
+        assert list(got) == want
+
+
+def test_legacy_csv_exporter_sorts_by_score(tmp_path):
+    rows = [{"Name": "a", "Score": 10}, {"Name": "b", "Score": 90}]
+    path = tmp_path / "legacy.csv"
+    CSVExporter().export_to_csv(rows, str(path))
+    expected = pd.DataFrame(rows).sort_values(by="Score", ascending=False).to_csv(index=False)
+    assert path.read_text(encoding="utf-8") == expected
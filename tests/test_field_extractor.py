@@ -0,0 +1,70 @@
+# tests/test_field_extractor.py
+import random
+import re
+
+from field_extractor import EDU_KEYWORDS, EMAIL_RE, PHONE_RE, YEARS_RE, extract_fields
+from parser import extract_education, extract_email, extract_experience_years, extract_phone
+
+# Pieces that sit on the edges of each pattern: partial emails, digit runs
+# of every length, "+"/separators before numbers, "year" with and without
+# a number, education keywords in any case, and characters whose
+# lowercase form is longer or that \d reads as digits.
+PIECES = [
+    "a", "x.y", "_", "%", "+", "-", ".", "@", "@@", "mail@host", "j.doe@example.com", "a@b.c", "a@b.io",
+    "bob@", "@ex.org", "0123456789", "12345678901234", "987654321", "+91", "+1-", "+44 ", "(555)",
+    "5 years", "10+ year", "3 Years", "100 years", "year", "yearly", "12  \n years", "7+\tyear",
+    "Bachelor", "MASTER", "phd", "B.Tech", "m.tech", "BSc", "msc", "MBA", "degree", "Diploma",
+    " ", "  ", "\n", "\n\n", "\t", "İ", "ß", "١٢٣٤٥٦٧٨٩٠", "é",
+]
+
+
+def finditer_fields(text):
+    """Every match of the per-field patterns, as the old passes found them."""
+    lower = text.lower()
+    return (
+        tuple(m.group(0) for m in EMAIL_RE.finditer(text)),
+        tuple(m.group(0) for m in PHONE_RE.finditer(text)),
+        tuple(int(m.group(1)) for m in YEARS_RE.finditer(lower)),
+        tuple(line.strip() for line in text.split("\n") if any(k in line.lower() for k in EDU_KEYWORDS)),
+    )
+
+
+def legacy_fields(text):
+    """parser.extract_email/phone/education/experience_years before field_extractor."""
+    email = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
+    phone = re.search(r"(\+?\d{1,3}[-.\s]?)?\d{10}", text)
+    education = [line.strip() for line in text.split("\n")
+                 if any(k in line.lower() for k in ["bachelor", "master", "phd", "b.tech", "m.tech",
+                                                     "bsc", "msc", "mba", "degree", "diploma"])]
+    years = max(map(int, re.findall(r"(\d{1,2})\+?\s*year", text.lower())), default=0)
+    return email.group(0) if email else None, phone.group(0) if phone else None, education, years
+
+
+def _texts(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        pieces = rng.choices(PIECES, k=rng.randint(0, 40))
+        yield "".join(p + rng.choice(["", "", " ", "\n"]) for p in pieces)
+
+
+def test_single_scan_matches_finditer():
+    for text in _texts(3000):
+        assert tuple(extract_fields.__wrapped__(text)) == finditer_fields(text), repr(text)
+
+
+def test_parser_fields_match_legacy_regexes():
+    for text in _texts(1000, seed=1):
+        got = (extract_email(text), extract_phone(text), extract_education(text), extract_experience_years(text))
+        assert got == legacy_fields(text), repr(text)
+
+
+def test_long_gaps_before_triggers():
+    # local parts and whitespace runs longer than the scan windows
+    for text in ["x" * 300 + "@example.com", "12" + " " * 100 + "years", "12" + " " * 63 + "years",
+                 "123" + " " * 62 + "years", "4 years 12" + "\n" * 63 + "year", "a" * 260 + ".b@c.de and 9 years",
+                 "+91-" + "9" * 10 + "\n" + "y" * 70 + " 4 years"]:
+        assert tuple(extract_fields.__wrapped__(text)) == finditer_fields(text)
+
+
+def test_years_window_does_not_split_a_number():
+    assert extract_fields.__wrapped__("12" + " " * 63 + "years").years == (12,)
@@ -0,0 +1,77 @@
+# tests/test_instrumentation.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def metrics_off():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+@instrumentation.timed("work")
+def work(path):
+    with instrumentation.file_context(path):
+        instrumentation.count("chars", 10)
+
+
+def test_off_records_nothing():
+    work("a.txt")
+    assert not instrumentation.is_enabled()
+    assert instrumentation.report()["stages"] == {}
+
+
+def test_threads_have_separate_collectors():
+    """Each thread (a Streamlit session's run) resets and disables only its own metrics."""
+    barrier = threading.Barrier(2)
+    reports = {}
+
+    def session(name, calls, disable_after):
+        instrumentation.enable()
+        instrumentation.reset()
+        barrier.wait()
+        for _ in range(calls):
+            work(f"{name}.txt")
+        barrier.wait()
+        if disable_after:
+            instrumentation.disable()
+        barrier.wait()
+        reports[name] = instrumentation.report()
+
+    threads = [threading.Thread(target=session, args=("a", 3, False)),
+               threading.Thread(target=session, args=("b", 5, True))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert reports["a"]["stages"]["work"]["count"] == 3
+    assert reports["a"]["counters"] == {"chars": 30}
+    assert reports["b"]["stages"] == {}
+
+
+def test_bound_pool_threads_share_one_locked_collector():
+    collector = instrumentation.enable()
+    task = instrumentation.bind(lambda i: [work(f"{i % 4}.txt") for _ in range(200)])
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(task, range(16)))
+    report = collector.report()
+    assert report["stages"]["work"]["count"] == 3200
+    assert report["counters"]["chars"] == 32000
+    assert sum(f["chars"] for f in report["files"]) == 32000
+
+
+def test_snapshot_merge():
+    instrumentation.enable()
+    work("a.txt")
+    snap = instrumentation.snapshot()
+    instrumentation.reset()
+    work("a.txt")
+    instrumentation.merge(snap)
+    report = instrumentation.report()
+    assert report["stages"]["work"]["count"] == 2
+    assert report["files"][0]["chars"] == 20
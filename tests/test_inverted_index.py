@@ -0,0 +1,63 @@
+# tests/test_inverted_index.py
+import random
+
+import pytest
+
+from inverted_index import InvertedIndex
+from matcher import compute_keyword_match_score
+
+TEXTS = {
+    "a": "Worked on AI/ML pipelines in Python and C++; machine learning at scale.",
+    "b": "Machine vision, deep learning. Python, pandas, SQL.",
+    "c": "Node.js, React and C# developer; some aiml research.",
+    "d": "Senior data engineer: Spark, SQL, Airflow, large scale machine learning systems.",
+    "e": "",
+}
+KEYWORDS = ["python", "ai/ml", "machine learning", "c++", "sql", "large scale machine learning systems",
+            "node.js", "react", "!!!", "Python", "go"]
+
+
+def expected(keywords, weights=None):
+    rows = {}
+    for doc_id, text in TEXTS.items():
+        result = compute_keyword_match_score(text, keywords, weights)
+        if result["matched"]:
+            rows[doc_id] = (result["score"], result["matched"])
+    return rows
+
+
+@pytest.fixture
+def index():
+    index = InvertedIndex()
+    for doc_id, text in TEXTS.items():
+        index.add(doc_id, text)
+    return index
+
+
+@pytest.mark.parametrize("weights", [None, {"python": 3.0, "sql": 0.5}, {kw: 0.0 for kw in KEYWORDS}])
+def test_query_matches_compute_keyword_match_score(index, weights):
+    got = {doc_id: (pytest.approx(score), matched) for doc_id, score, matched in index.query(KEYWORDS, weights)}
+    assert got == expected(KEYWORDS, weights)
+
+
+def test_random_keyword_sets_agree(index):
+    rng = random.Random(3)
+    for _ in range(100):
+        keywords = rng.sample(KEYWORDS, rng.randint(1, 6))
+        got = {doc_id: matched for doc_id, _, matched in index.query(keywords)}
+        assert got == {doc_id: m for doc_id, (_, m) in expected(keywords).items()}
+
+
+def test_remove_compact_and_persist(index, tmp_path):
+    index.remove("a")
+    index.add("b", TEXTS["a"])
+    assert "a" not in index and len(index) == 4
+    before = index.query(KEYWORDS)
+    assert "a" not in {doc_id for doc_id, _, _ in before}
+    index.compact()
+    assert index.query(KEYWORDS) == before
+    path = str(tmp_path / "pool.npz")
+    index.save(path)
+    loaded = InvertedIndex.load(path)
+    assert loaded.query(KEYWORDS, top_k=2) == before[:2]
+    assert loaded.text("b") == TEXTS["a"]
@@ -0,0 +1,78 @@
+# tests/test_job_profile.py
+import os
+import random
+
+import numpy as np
+import pytest
+
+import job_profile
+from cache import ParseCache
+from jd_parser import clean_text, extract_keywords
+from job_profile import CorpusIDF, JobProfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ["python", "sql", "docker", "aws", "team", "data", "pipelines", "the", "and", "we", "are", "c++",
+         "node.js", "machine", "learning", "senior", "engineer", "apis", "x", "7", "years", "ci/cd"]
+
+
+def _jds(n, seed=0):
+    rng = random.Random(seed)
+    with open(os.path.join(ROOT, "job_description.txt"), "r", encoding="utf-8") as f:
+        yield f.read()
+    for _ in range(n):
+        yield " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 80)))
+
+
+def tfidf_vectorizer_keywords(jd_text, top_n=15):
+    """extract_keywords before job_profile: a TfidfVectorizer fitted on the one JD."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(stop_words="english")
+    tfidf_matrix = vectorizer.fit_transform([clean_text(jd_text)])
+    scores = zip(vectorizer.get_feature_names_out(), tfidf_matrix.toarray()[0])
+    return sorted(scores, key=lambda x: x[1], reverse=True)[:top_n]
+
+
+def test_keywords_without_idf_match_tfidf_vectorizer():
+    pytest.importorskip("sklearn")
+    for jd in _jds(200):
+        try:
+            expected = tfidf_vectorizer_keywords(jd)
+        except ValueError:
+            # only stop words: both raise the same error
+            with pytest.raises(ValueError, match="empty vocabulary"):
+                extract_keywords(jd)
+            continue
+        got = extract_keywords(jd, with_scores=True)
+        assert [kw for kw, _ in got] == [kw for kw, _ in expected], jd
+        # the vectorizer's scores are the same counts, l2-normalized
+        assert np.allclose([s / got[0][1] for _, s in got], [s / expected[0][1] for _, s in expected])
+
+def test_corpus_idf_matches_sklearn_and_reweights():
+    sklearn_text = pytest.importorskip("sklearn.feature_extraction.text")
+    corpus = ["python developer with sql", "python and docker", "python team lead", "rust compiler work"]
+    idf = CorpusIDF.fit(corpus)
+    vectorizer = sklearn_text.TfidfVectorizer(stop_words="english").fit([clean_text(t) for t in corpus])
+    for term, value in zip(vectorizer.get_feature_names_out(), vectorizer.idf_):
+        assert idf[term] == pytest.approx(value)
+    assert idf["kotlin"] == idf.default > idf["rust"] > idf["python"]
+
+    jd = "python python python rust rust"
+    assert extract_keywords(jd, top_n=1) == ["python"]
+    # python is in 3 of 4 documents, so rust's IDF outweighs its extra count
+    assert extract_keywords(jd, top_n=1, idf=idf) == ["rust"]
+
+
+def test_profiles_are_cached_in_memory_and_on_disk(tmp_path, monkeypatch):
+    pc = ParseCache(str(tmp_path / "cache.sqlite"))
+    jd = "Senior Python engineer: Python, SQL and Docker."
+    first = JobProfile.from_text(jd, cache=pc)
+    assert JobProfile.from_text(jd, cache=pc) is first
+    assert first.weights[first.keywords[0]] == 1.0
+    idf = CorpusIDF.fit(["python everywhere", "sql"])
+    assert JobProfile.from_text(jd, idf=idf, cache=pc) is not first
+
+    # a fresh process: nothing in memory, keywords come from the disk cache
+    monkeypatch.setattr(job_profile, "_PROFILES", type(job_profile._PROFILES)())
+    monkeypatch.setattr(job_profile, "extract_keywords", None)
+    again = JobProfile.from_text(jd, cache=pc)
+    assert again is not first and (again.keywords, again.weights) == (first.keywords, first.weights)
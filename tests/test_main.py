@@ -0,0 +1,84 @@
+# tests/test_main.py
+import csv
+import os
+
+import pytest
+
+import main
+from inverted_index import InvertedIndex
+
+RESUMES = {
+    "alice.txt": "Alice\nalice@example.com\nPython, SQL and machine learning. 5 years experience.",
+    "bob.txt": "Bob\nbob@example.com\nJava and Spring developer, some SQL. 3 years experience.",
+    "carol.txt": "Carol\ncarol@example.com\nReact and node.js frontend engineer.",
+}
+JD = "Backend engineer. Python, SQL, machine learning, Java. Python and SQL daily."
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch, blank_nlp):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("resumes")
+    for name, text in RESUMES.items():
+        with open(os.path.join("resumes", name), "w", encoding="utf-8") as f:
+            f.write(text)
+    with open("jd.txt", "w", encoding="utf-8") as f:
+        f.write(JD)
+    return tmp_path
+
+
+def ranked(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["name"] for row in csv.DictReader(f)]
+
+
+def test_index_holds_every_scored_resume(workdir):
+    main.main(["resumes", "--jd", "jd.txt", "--workers", "1", "--index", "pool.npz", "--out", "out"])
+    index = InvertedIndex.load("pool.npz")
+    assert len(index) == 3
+    keywords = main.JobProfile.from_text(JD, top_n=15).keywords
+    assert [os.path.basename(d) for d, _, _ in index.query(keywords)][0] == "alice.txt"
+    assert ranked("out/ranked_candidates.csv")[0] == "alice"
+
+
+def test_resumed_run_indexes_files_scored_before_the_crash(workdir, monkeypatch):
+    real = main.parse_resumes
+
+    def crash_after_one(*args, **kwargs):
+        gen = real(*args, **kwargs)
+        yield next(gen)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(main, "parse_resumes", crash_after_one)
+    with pytest.raises(KeyboardInterrupt):
+        main.main(["resumes", "--jd", "jd.txt", "--workers", "1", "--index", "pool.npz", "--out", "out"])
+    assert not os.path.exists("pool.npz")
+    monkeypatch.setattr(main, "parse_resumes", real)
+    main.main(["resumes", "--jd", "jd.txt", "--workers", "1", "--index", "pool.npz", "--out", "out"])
+    assert len(InvertedIndex.load("pool.npz")) == 3
+    assert sorted(ranked("out/ranked_candidates.csv")) == ["alice", "bob", "carol"]
+
+
+def test_checkpoint_key_covers_dedup_and_skill_ner():
+    keys = {main.default_checkpoint({"jd": ["python"]}, None, dedup, ner)
+            for dedup in (False, True) for ner in (False, True)}
+    assert len(keys) == 4
+
+
+def test_resumed_dedup_run_still_catches_copies(workdir, monkeypatch):
+    with open(os.path.join("resumes", "alice_v2.txt"), "w", encoding="utf-8") as f:
+        f.write(RESUMES["alice.txt"] + " Python")
+    real = main.parse_resumes
+
+    def crash_after_one(*args, **kwargs):
+        gen = real(*args, **kwargs)
+        yield next(gen)
+        raise KeyboardInterrupt
+
+    args = ["resumes", "--jd", "jd.txt", "--workers", "1", "--batch-size", "1", "--dedup", "--out", "out"]
+    monkeypatch.setattr(main, "parse_resumes", crash_after_one)
+    with pytest.raises(KeyboardInterrupt):
+        main.main(args)
+    monkeypatch.setattr(main, "parse_resumes", real)
+    main.main(args)
+    assert sorted(ranked("out/ranked_candidates.csv")) == ["alice", "bob", "carol"]
@@ -0,0 +1,120 @@
+# tests/test_parser.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import parser
+
+RESUMES = {
+    "a.txt": "Alice Smith\nalice@example.com\n+91 9876543210\n5 years experience\nBSc Computer Science\nPython, SQL",
+    "b.txt": "Bob\nbob@example.com\n2 years in Java and Docker\nMBA",
+    "c.txt": "Carol\n12+ years of C++ and machine learning\nPhD Physics",
+    "d.txt": "Dan\ndan@example.org\nReact, node.js\nDiploma in Web Design",
+}
+SKILLS = ["python", "sql", "java", "docker", "c++", "machine learning", "react", "node.js"]
+
+
+def _items(tmp_path):
+    paths = []
+    for name, text in RESUMES.items():
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    # unreadable: the extension has no extractor
+    bad = tmp_path / "e.xyz"
+    bad.write_text("whatever", encoding="utf-8")
+    paths.insert(2, str(bad))
+    return paths
+
+
+def _comparable(results):
+    return [(key, {k: v for k, v in profile.items() if k != "parsed_at"} if profile else None, error)
+            for key, profile, error in results]
+
+
+def test_pools_match_the_serial_path(tmp_path, blank_nlp, monkeypatch):
+    paths = _items(tmp_path)
+    serial = _comparable(parser.parse_resumes(paths, SKILLS, workers=1))
+    assert [key for key, _, _ in serial] == paths
+    errors = {key: error for key, profile, error in serial if error}
+    assert list(errors) == [paths[2]] and errors[paths[2]].startswith("ValueError: Unsupported file format")
+    assert serial[0][1]["email"] == "alice@example.com" and serial[0][1]["skills"]
+
+    inline = parser.parse_resumes(paths, SKILLS, workers=2, batch_size=2, pool=parser._InlineExecutor())
+    assert _comparable(inline) == serial
+
+    # the first batch finishes last; results still come back in item order
+    extract = parser._extract
+    last_done = threading.Event()
+
+    def first_last(source, filename=None):
+        if source == paths[0]:
+            last_done.wait(5)
+        text = extract(source, filename)
+        if source == paths[-1]:
+            last_done.set()
+        return text
+
+    monkeypatch.setattr(parser, "_extract", first_last)
+    threaded = list(parser.parse_resumes(paths, SKILLS, workers=3, batch_size=1, executor="thread"))
+    assert last_done.is_set()
+    assert _comparable(threaded) == serial
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        reused = parser.parse_resumes(iter(paths), SKILLS, workers=2, batch_size=2, max_pending=2, pool=pool)
+        assert _comparable(reused) == serial
+
+
+def _ruler(nlp):
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": [{"LOWER": "alice"}, {"LOWER": "smith"}]},
+                        {"label": "PERSON", "pattern": "Bob"},
+                        {"label": "PRODUCT", "pattern": "Docker"}])
+    return nlp
+
+
+def _ner_texts():
+    pad = "filler text " * 60  # pushes what follows past NAME_WINDOW
+    return [("a.txt", "Alice Smith\nPython developer, Docker"),
+            ("b.txt", "Resume of Bob\nJava"),
+            ("c.txt", pad + "Alice Smith\n" + "Docker " * 5),
+            ("d.txt", "no names here, Docker"),
+            ("e.txt", "Bob\n" + pad * 30 + "Docker")]
+
+
+def test_batched_ner_matches_per_document_calls(blank_nlp):
+    _ruler(blank_nlp)
+    items = [(name, text.encode()) for name, text in _ner_texts()]
+    for skill_ner in (False, True):
+        batched = {key: profile for key, profile, _ in
+                   parser.parse_resumes(items, workers=1, batch_size=5, skill_ner=skill_ner)}
+        for name, text in _ner_texts():
+            single = parser.parse_resume(text.encode(), filename=name, skill_ner=skill_ner)
+            assert batched[name]["name"] == single["name"] == parser.extract_name(text)
+            assert batched[name]["skills"] == single["skills"]
+    # names are only looked for in the first NAME_WINDOW characters
+    assert [batched[name]["name"] for name, _ in _ner_texts()] == ["Alice Smith", "Bob", None, None, "Bob"]
+    # skill NER reads up to NER_MAX_CHARS, names alone only NAME_WINDOW
+    long_text = _ner_texts()[4][1]
+    assert len(long_text) > parser.NER_MAX_CHARS
+    assert len(parser.ner_window(long_text, skill_ner=True)) == parser.NER_MAX_CHARS
+    assert len(parser.ner_window(long_text, ["sql"], skill_ner=True)) == parser.NAME_WINDOW
+
+
+def test_failed_batch_falls_back_to_one_call_per_text(blank_nlp, monkeypatch):
+    from spacy.language import Language
+
+    @Language.component("fail_on_boom")
+    def fail_on_boom(doc):
+        if "boom" in doc.text:
+            raise RuntimeError("boom")
+        return doc
+
+    _ruler(blank_nlp).add_pipe("fail_on_boom")
+    items = [("a.txt", b"Alice Smith\nPython"), ("x.txt", b"boom"), ("b.txt", b"Bob\nSQL")]
+    pipe_calls = []
+    pipe = blank_nlp.pipe
+    monkeypatch.setattr(blank_nlp, "pipe", lambda texts, **kw: pipe_calls.append(kw) or pipe(texts, **kw))
+    results = list(parser.parse_resumes(items, workers=1, batch_size=3))
+    assert len(pipe_calls) == 1
+    assert [(key, profile and profile["name"], error) for key, profile, error in results] == [
+        ("a.txt", "Alice Smith", None), ("x.txt", None, "RuntimeError: boom"), ("b.txt", "Bob", None)]
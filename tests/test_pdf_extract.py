@@ -0,0 +1,93 @@
+# tests/test_pdf_extract.py
+import io
+import time
+
+import pytest
+
+import pdf_extract
+from pdf_extract import PDFTimeout, extract_pdf_text, iter_pdf_pages
+
+
+def fake_backend(pages, fail_at=None, slow_at=None):
+    def backend(source):
+        for i, text in enumerate(pages):
+            if i == fail_at:
+                raise ValueError("broken xref")
+            if i == slow_at:
+                time.sleep(1.0)
+            yield text
+    return backend
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    registry = dict(pdf_extract._BACKENDS)
+    monkeypatch.setattr(pdf_extract, "_BACKENDS", registry)
+    return registry
+
+
+def test_page_cap_and_fallback(backends):
+    backends["bad"] = fake_backend(["x"], fail_at=0)
+    backends["good"] = fake_backend(["p1", "p2", "p3"])
+    assert list(iter_pdf_pages(b"", ("bad", "good"), max_pages=2)) == ["p1", "p2"]
+    assert extract_pdf_text(b"", ("bad", "good"), timeout=None) == "p1\np2\np3"
+
+
+def test_slow_page_is_bounded_and_earlier_pages_kept(backends):
+    backends["slow"] = fake_backend(["p1", "p2", "p3"], slow_at=2)
+    started = time.monotonic()
+    assert extract_pdf_text(b"", ("slow",), timeout=0.2) == "p1\np2"
+    assert time.monotonic() - started < 0.8
+    with pytest.raises(PDFTimeout):
+        list(iter_pdf_pages(b"", ("slow",), timeout=0.2))
+
+
+def test_backend_error_keeps_pages_read(backends):
+    backends["flaky"] = fake_backend(["p1", "p2", "p3"], fail_at=2)
+    assert extract_pdf_text(b"", ("flaky",)) == "p1\np2"
+    assert extract_pdf_text(b"", ("flaky",), timeout=None) == "p1\np2"
+    backends["dead"] = fake_backend(["p1"], fail_at=0)
+    with pytest.raises(ValueError):
+        extract_pdf_text(b"", ("dead",))
+
+
+def test_char_cap(backends):
+    backends["big"] = fake_backend(["a" * 60, "b" * 60, "c" * 60])
+    assert extract_pdf_text(b"", ("big",), max_chars=100) == "a" * 60 + "\n" + "b" * 39
+
+
+def _pdf(pages):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.mark.parametrize("backend", ["pymupdf", "pdfminer"])
+def test_in_memory_sources(backend, tmp_path):
+    pytest.importorskip("fitz" if backend == "pymupdf" else "pdfminer")
+    data = _pdf(["Alice Smith", "Python and SQL"])
+    path = tmp_path / "r.pdf"
+    path.write_bytes(data)
+    sources = {"bytes": data, "memoryview": memoryview(bytearray(data)), "file": io.BytesIO(data),
+               "path": str(path)}
+    for kind, source in sources.items():
+        pages = [p.strip() for p in iter_pdf_pages(source, (backend,))]
+        assert pages == ["Alice Smith", "Python and SQL"], kind
+
+
+def test_default_caps_on_a_real_pdf():
+    pytest.importorskip("fitz")
+    data = _pdf([f"page {i}" for i in range(pdf_extract.MAX_PAGES + 5)])
+    pages = list(iter_pdf_pages(data, ("pymupdf",)))
+    assert len(pages) == pdf_extract.MAX_PAGES and pages[-1].strip() == f"page {pdf_extract.MAX_PAGES - 1}"
+    assert extract_pdf_text(data, ("pymupdf",)).count("page") == pdf_extract.MAX_PAGES
+
+    # ~4.5k chars a page; enough pages to pass MAX_CHARS
+    lines = "\n".join("x" * 90 for _ in range(50))
+    data = _pdf([lines] * (pdf_extract.MAX_CHARS // len(lines) + 2))
+    text = extract_pdf_text(data, ("pymupdf",), max_pages=None)
+    assert len(text) == pdf_extract.MAX_CHARS
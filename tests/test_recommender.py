@@ -0,0 +1,68 @@
+# tests/test_recommender.py
+import json
+import os
+import random
+
+from recommender import Recommender, load_job_profiles
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "job_profiles.json")
+
+
+def loop_recommend(job_profiles, resume_skills):
+    """recommend_job as it was before Recommender: one set intersection per title."""
+    if not job_profiles:
+        return {"best_match": "No job profiles found.", "score": 0}
+    best_match_job, highest_score = None, -1
+    resume_skills_set = set(s.lower() for s in resume_skills)
+    for job_title, required_skills in job_profiles.items():
+        required_skills_set = set(s.lower() for s in required_skills)
+        matching = resume_skills_set.intersection(required_skills_set)
+        score = len(matching) / len(required_skills_set) * 100 if required_skills_set else 0
+        if score > highest_score:
+            highest_score, best_match_job = score, job_title
+    return {"best_match": best_match_job, "score": round(highest_score, 2)}
+
+
+def _skill_sets(job_profiles, n, seed=0):
+    rng = random.Random(seed)
+    vocab = sorted({s for skills in job_profiles.values() for s in skills}) + ["cobol", "excel"]
+    sets = []
+    for _ in range(n):
+        skills = rng.sample(vocab, rng.randint(0, min(12, len(vocab))))
+        sets.append([s.upper() if rng.random() < 0.2 else s for s in skills])
+    return sets
+
+
+def test_batch_matches_loop_on_shipped_profiles():
+    job_profiles = load_job_profiles(PROFILES_PATH)
+    rec = Recommender(PROFILES_PATH)
+    skill_sets = _skill_sets(job_profiles, 500)
+    batch = rec.recommend_batch(skill_sets, k=len(job_profiles))
+    for skills, ranked in zip(skill_sets, batch):
+        expected = loop_recommend(job_profiles, skills)
+        assert rec.recommend(skills) == expected
+        assert ranked[0] == (expected["best_match"], expected["score"])
+        # every title's score is the loop's percentage for that title alone
+        for title, score in ranked:
+            assert score == loop_recommend({title: job_profiles[title]}, skills)["score"]
+
+
+def test_ties_empty_titles_and_reload(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    profiles = {"Empty": [], "A": ["Python", "SQL"], "B": ["sql", "python"], "C": ["go"]}
+    with open(path, "w") as f:
+        json.dump(profiles, f)
+    rec = Recommender(path)
+    for skills in (["python"], ["SQL", "python"], [], ["go", "rust"]):
+        assert rec.recommend(skills) == loop_recommend(profiles, skills)
+    assert rec.recommend_batch([["python"]], k=2) == [[("A", 50.0), ("B", 50.0)]]
+
+    profiles = {"Rust": ["rust"]}
+    with open(path, "w") as f:
+        json.dump(profiles, f)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert rec.recommend(["rust"]) == {"best_match": "Rust", "score": 100.0}
+
+    os.remove(path)
+    assert rec.recommend(["rust"]) == loop_recommend({}, ["rust"])
+    assert rec.recommend_batch([["rust"], []]) == [[], []]
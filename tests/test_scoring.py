@@ -0,0 +1,58 @@
+# tests/test_scoring.py
+import numpy as np
+import pytest
+
+from matcher import aggregate_scores_for_jd, compute_keyword_match_score
+from scoring import IncrementalScorer, results_from_matrix, score_matrix, top_k_indices
+
+RESUMES = [
+    {"orig_filename": "a.pdf", "raw_text": "Python and SQL developer, some Docker.", "content_hash": "a"},
+    {"orig_filename": "b.pdf", "raw_text": "Java, Spring, SQL, machine learning.", "content_hash": "b"},
+    {"orig_filename": "c.pdf", "raw_text": "React, node.js and C++ engineer.", "content_hash": "c"},
+    {"orig_filename": "d.pdf", "raw_text": "", "content_hash": "d"},
+]
+JDS = [
+    ["python", "sql", "docker", "kubernetes"],
+    ["Machine Learning", "java", "SQL", "sql", "!!!"],
+    ["c++", "node.js", "react"],
+    [],
+]
+WEIGHTS = {"python": 3.0, "sql": 0.5, "java": 2.0, "react": 0.0}
+
+
+@pytest.mark.parametrize("weights", [None, WEIGHTS, {"python": 0.0, "sql": 0.0, "docker": 0.0, "kubernetes": 0.0}])
+def test_score_matrix_matches_compute_keyword_match_score(weights):
+    texts = [r["raw_text"] for r in RESUMES]
+    sm = score_matrix(texts, JDS, weights)
+    for i, text in enumerate(texts):
+        for j, kws in enumerate(JDS):
+            expected = compute_keyword_match_score(text, kws, weights)
+            assert sm.scores[i, j] == pytest.approx(expected["score"])
+            if kws:
+                assert sm.matched_keywords(i, j) == expected["matched"]
+
+
+def test_results_from_matrix_matches_aggregate_scores_for_jd():
+    sm = score_matrix([r["raw_text"] for r in RESUMES], JDS)
+    for j, kws in enumerate(JDS[:3]):
+        expected = aggregate_scores_for_jd(RESUMES, kws)
+        assert results_from_matrix(RESUMES, sm, j) == expected
+
+
+def test_incremental_scorer_matches_after_edits():
+    scorer = IncrementalScorer(RESUMES)
+    scorer.sync(JDS)
+    edited = ["python", "spring", "docker"]
+    scorer.sync([edited])
+    assert scorer.terms and "kubernetes" not in scorer.terms
+    assert scorer.results(edited, WEIGHTS) == aggregate_scores_for_jd(RESUMES, edited, WEIGHTS)
+
+
+def test_top_k_indices():
+    scores = np.array([5.0, 9.0, 5.0, 1.0, 9.0])
+    assert top_k_indices(scores) == [1, 4, 0, 2, 3]
+    assert top_k_indices(scores, 3) == [1, 4, 0]
+    assert top_k_indices(scores, 10) == [1, 4, 0, 2, 3]
+    assert top_k_indices(scores, 0) == []
+    assert top_k_indices(scores, -1) == []
+    assert top_k_indices(np.array([]), 3) == []
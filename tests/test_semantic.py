@@ -0,0 +1,86 @@
+# tests/test_semantic.py
+import threading
+
+import numpy as np
+import pytest
+
+import semantic
+from semantic import EmbeddingIndex
+
+VOCAB = ["python", "sql", "java", "react", "docker"]
+
+
+def fake_encode(texts, model_name=None):
+    vectors = np.array([[t.lower().count(w) for w in VOCAB] for t in texts], dtype=np.float32) + 0.01
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic, "encode", fake_encode)
+    return EmbeddingIndex(str(tmp_path / "emb"))
+
+
+def test_scores_take_best_row_per_resume(index):
+    index.add_many([("a", "python sql", ["java"]), ("b", "react", None)])
+    assert "a" in index and "b" in index and len(index) == 2
+    scores = index.scores("java")
+    expected = float(np.round(fake_encode(["java"])[0] @ fake_encode(["java"])[0] * 100, 2))
+    assert scores["a"] == pytest.approx(expected, abs=0.01)
+    assert scores["b"] < scores["a"]
+    assert [rid for rid, _ in index.query("java", top_k=1)] == ["a"]
+
+
+def test_readd_and_remove_reuse_rows(index):
+    index.add_many([("a", "python", ["sql", "java"]), ("b", "react", None)])
+    rows = len(index.rows)
+    index.add("a", "docker")
+    index.remove("b")
+    assert "b" not in index and len(index) == 1
+    assert len(index.rows) == rows
+    index.add_many([("c", "java", ["sql"])])
+    assert len(index.rows) == rows
+    assert set(index.scores("java")) == {"a", "c"}
+
+
+def test_reopen_restores_lookup(index, tmp_path):
+    index.add_many([("a", "python", ["sql"]), ("b", "react", None)])
+    index.remove("a")
+    reopened = EmbeddingIndex(str(tmp_path / "emb"))
+    assert "a" not in reopened and "b" in reopened
+    assert reopened.scores("react") == index.scores("react")
+
+
+def test_concurrent_adds(index):
+    threads = [threading.Thread(target=index.add_many, args=([(f"r{t}-{i}", "python sql", ["java"]) for i in range(20)],))
+               for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(index) == 80
+    assert sum(r is not None for r in index.rows) == 160
+
+
+def test_same_id_twice_in_one_batch_keeps_the_last(index):
+    index.add_many([("a", "python", ["sql"]), ("b", "react", None), ("a", "java", None)])
+    assert len(index) == 2 and len(index._by_id["a"]) == 1
+    scores = index.scores("java")
+    assert scores["a"] > 99 and scores["b"] < 50
+    assert index.scores("python")["a"] < 50
+
+
+def test_scores_read_vectors_and_rows_together(index, monkeypatch):
+    index.add_many([("a", "python", ["sql"]), ("b", "react", None)])
+
+    def encode_while_rows_move(texts, model_name=None):
+        # a writer swaps a for c (reusing a's rows) while the JD is encoded
+        monkeypatch.setattr(semantic, "encode", fake_encode)
+        index.remove("a")
+        index.add_many([("c", "java", ["docker"])])
+        return fake_encode(texts)
+
+    monkeypatch.setattr(semantic, "encode", encode_while_rows_move)
+    scores = index.scores("python")
+    assert set(scores) == {"b", "c"}
+    assert scores == index.scores("python")
@@ -0,0 +1,100 @@
+# tests/test_service.py
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from cache import ParseCache
+from service import ScoringService, start_server, stop_server
+from service_client import ServiceClient, ServiceError
+
+JD = "We need a Python developer with Docker and SQL experience. Python and AWS."
+RESUMES = [
+    ("alice.txt", b"Alice\nalice@example.com\nPython, Docker and SQL. 5 years experience.\nBSc Computer Science"),
+    ("bob.txt", b"Bob\nbob@example.com\nJava developer, 2 years.\n"),
+]
+
+
+@pytest.fixture
+def server(tmp_path, blank_nlp):
+    server = start_server(port=0, workers=1, parse_workers=1, max_queue=2,
+                          cache=ParseCache(str(tmp_path / "cache.sqlite")))
+    yield server
+    stop_server(server)
+
+
+def test_parse_score_and_keywords_over_http(server):
+    client = ServiceClient(server.url, timeout=10)
+    pool = client.submit_parse(RESUMES, ["python", "docker", "sql", "java"])
+    events = list(client.stream(pool))
+    assert [e["profile"]["orig_filename"] for e in events if e["type"] == "profile"] == ["alice.txt", "bob.txt"]
+    assert events[-1] == {"type": "status", "status": "done"}
+    profiles = client.job(pool)["result"]["profiles"]
+    assert profiles[0]["email"] == "alice@example.com" and "raw_text" not in profiles[0]
+    # the base64 upload is dropped once decoded
+    assert "resumes" not in server.service.get(pool).payload
+
+    keywords, weights = client.keywords(JD)
+    assert "python" in keywords and set(weights) == set(keywords)
+    result = client.wait(client.submit_score(pool, {"Backend": {"text": JD, "keywords": ["python", "sql"]}}))["result"]
+    ranked = result["results"]["Backend"]
+    assert [r["name"] for r in ranked] == ["alice", "bob"]
+    assert ranked[0]["score"] == 100.0 and ranked[0]["matched_keywords"] == ["python", "sql"]
+    assert client.health()["status"] == "ok"
+
+
+def test_keywords_are_queued_with_backpressure(server, monkeypatch):
+    release = threading.Event()
+    keywords = server.service._keywords
+
+    def slow_keywords(job):
+        release.wait(10)
+        keywords(job)
+
+    monkeypatch.setattr(server.service, "_keywords", slow_keywords)
+    client = ServiceClient(server.url, timeout=10, retries=0)
+    running = client._request("POST", "/keywords", {"text": JD})
+    job = server.service.get(running["id"])
+    with job.changed:
+        assert job.changed.wait_for(lambda: job.status == "running", timeout=10)
+    queued = [client._request("POST", "/keywords", {"text": JD}) for _ in range(2)]
+    assert running["status"] == "queued" and all(j["status"] == "queued" for j in queued)
+    with pytest.raises(ServiceError) as e:
+        client.keywords(JD)
+    assert e.value.status == 429
+
+    req = urllib.request.Request(server.url + "/keywords", data=json.dumps({"text": JD}).encode(), method="POST")
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(req, timeout=10)
+    assert e.value.code == 429 and int(e.value.headers["Retry-After"]) >= 1
+
+    release.set()
+    for job in [running] + queued:
+        assert "python" in client.wait(job["id"])["result"]["keywords"]
+    with pytest.raises(ServiceError) as e:
+        client._request("POST", "/keywords", {"method": "tfidf"})
+    assert e.value.status == 400
+
+
+def test_finished_jobs_are_capped_by_memory(tmp_path):
+    service = ScoringService(workers=1, parse_workers=1, cache=ParseCache(str(tmp_path / "cache.sqlite")),
+                             max_job_bytes=1)
+    try:
+        jobs = []
+        for text in ("Python developer", "SQL analyst", "Docker operator"):
+            jobs.append(service.submit("keywords", {"text": text}))
+            with jobs[-1].changed:
+                assert jobs[-1].changed.wait_for(lambda: jobs[-1].finished, timeout=10)
+            # only the job that just finished is kept when it alone is over the cap
+            assert list(service.jobs) == [jobs[-1].id]
+            assert service.health()["job_bytes"] == jobs[-1].nbytes > 0
+
+        service.max_job_bytes = 10 ** 9
+        jobs.append(service.submit("keywords", {"text": "Java engineer"}))
+        with jobs[-1].changed:
+            assert jobs[-1].changed.wait_for(lambda: jobs[-1].finished, timeout=10)
+        assert list(service.jobs) == [jobs[-2].id, jobs[-1].id]
+    finally:
+        service.shutdown()
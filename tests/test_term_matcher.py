@@ -0,0 +1,50 @@
+# tests/test_term_matcher.py
+import random
+
+import term_matcher
+from term_matcher import FEW_BOUNDED_TERMS, FEW_TERMS, TermMatcher, compile_terms
+
+TEXT = "Senior Python developer: machine learning, C++, node.js, SQL; email me. React/Redux."
+
+
+def automaton_find(matcher, text):
+    return {t for _, _, key in matcher.iter_matches(text) for t in matcher.originals[key]}
+
+
+def test_word_boundaries():
+    found = TermMatcher(["python", "r", "ai", "c++", "node.js", "machine learning", "SQL"]).find(TEXT)
+    assert found == {"python", "c++", "node.js", "machine learning", "SQL"}
+
+
+def test_small_set_scan_matches_automaton():
+    rng = random.Random(7)
+    words = TEXT.lower().replace(",", " ").replace(".", " ").split() + ["learning", "ma", "e", "++"]
+    for _ in range(200):
+        terms = rng.sample(words, rng.randint(1, 10))
+        matcher = TermMatcher(terms)
+        assert len(matcher) <= FEW_TERMS
+        assert matcher.find(TEXT) == automaton_find(matcher, TEXT)
+
+
+def test_large_unbounded_set_uses_automaton(monkeypatch):
+    monkeypatch.setattr(term_matcher, "FEW_TERMS", 2)
+    matcher = TermMatcher(["python", "sql", "react", "ai"], word_boundaries=False)
+    monkeypatch.setattr(matcher, "_scan", None)
+    assert matcher.find(TEXT) == {"python", "sql", "react", "ai"}
+
+
+def test_large_bounded_lookup_matches_automaton():
+    # terms with word and non-word edges, phrases, and prefixes of each other
+    pieces = ["c", "c++", "c#", ".net", "asp.net", "node", "node.js", "js", "machine", "machine learning",
+              "learning", "ci/cd", "ci", "#ml", "ml", "_x", "x_", "ß", "straße", "a b", "a", "b", "go", "++"]
+    rng = random.Random(3)
+    for _ in range(300):
+        terms = rng.sample(pieces, rng.randint(1, len(pieces)))
+        terms += [f"term{i}" for i in range(FEW_BOUNDED_TERMS)]
+        matcher = TermMatcher(terms + [t.upper() for t in rng.sample(terms, 3)])
+        text = "".join(rng.choice(pieces + [" ", "  ", "\n", ",", ".", "x", "9", "İ", "term7"]) for _ in range(60))
+        assert matcher.find(text) == automaton_find(matcher, text), (terms, text)
+
+
+def test_compile_terms_is_cached():
+    assert compile_terms(("a", "b")) is compile_terms(("a", "b"))